@@ -0,0 +1,297 @@
+# ============================================
+# Fix-Price ETL Pipeline - Adaptive Concurrency
+# ============================================
+"""
+Адаптивный лимит параллельных запросов (AIMD).
+
+Фиксированный CONCURRENCY_LIMIT либо слишком осторожен для быстрого
+сервера, либо слишком агрессивен, когда сервер начинает отвечать 429/5xx.
+Лимитер подбирает его сам, как TCP congestion control:
+
+    успешный запрос, задержка и ошибки в норме -> limit += 1 / limit
+        (около +1 за каждые `limit` успешных запросов; ответ 429/5xx,
+        переданный в observe(), успехом слота не считается)
+    429 / 503 / 504 / таймаут                  -> limit *= 0.5
+        (не чаще одного раза за время ответа)
+    Retry-After                                -> новые запросы ждут указанное время
+
+Для каждой стороны свой лимитер: сайт-источник, а в APIClient - отдельные
+бюджеты скачивания с CDN, загрузки изображений и запросов товаров. Текущий
+лимит и время ожидания слота в очереди доступны в `snapshot()` для
+статистики и метрик.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional, Union
+
+from loguru import logger
+
+from metrics import METRICS
+from tracing import TRACER
+
+
+# Статусы перегрузки: лимит снижается
+OVERLOAD_STATUSES = {429, 503, 504}
+# Дольше этого Retry-After не ждем (секунд)
+MAX_RETRY_AFTER = 120.0
+# Сглаживание EWMA задержки и доли ошибок
+EWMA_ALPHA = 0.1
+# Выше этой доли ошибок лимит не увеличивается
+MAX_HEALTHY_ERROR_RATE = 0.1
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After в секундах (число секунд или HTTP дата)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return min(max(0.0, (moment - datetime.now(timezone.utc)).total_seconds()), MAX_RETRY_AFTER)
+
+
+class SlotOutcome:
+    """Результат запроса в слоте: observe() отмечает перегрузку и 5xx."""
+
+    def __init__(self, limiter: 'AdaptiveLimiter'):
+        self.limiter = limiter
+        self.failed = False
+
+
+# Слот текущей задачи: observe() вызывается внутри slot() той же задачи
+_current_slot: ContextVar[Optional[SlotOutcome]] = ContextVar('limiter_slot', default=None)
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Таймаут httpx, asyncio или Playwright (по имени класса - без импорта библиотек)."""
+    return isinstance(error, TimeoutError) or 'Timeout' in type(error).__name__
+
+
+class AdaptiveLimiter:
+    """Семафор с лимитом, который меняется по сигналам перегрузки (AIMD)."""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        max_limit: int,
+        min_limit: int = 1,
+        adaptive: bool = True,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5
+    ):
+        """
+        Args:
+            name: Имя для логов и метрик (source, download, upload, create)
+            initial: Начальный лимит
+            max_limit: Верхняя граница лимита
+            min_limit: Нижняя граница лимита
+            adaptive: False - фиксированный лимит `initial` (обычный семафор)
+            latency_tolerance: Во сколько раз задержка может превысить
+                минимальную, чтобы лимит еще увеличивался
+            backoff: Множитель лимита при перегрузке
+        """
+        self.name = name
+        self.adaptive = adaptive
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(max_limit, initial) if adaptive else initial
+        self.limit = float(max(self.min_limit, initial))
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+        self._blocked_until = 0.0
+        self._last_cut = 0.0
+        self._latency: Optional[float] = None
+        self._base_latency: Optional[float] = None
+        self._error_rate = 0.0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        self.stats: Dict[str, Union[int, float]] = {
+            'increases': 0,
+            'cuts': 0,
+            'retry_after': 0,
+            'peak_limit': int(self.limit),
+            'lowest_limit': int(self.limit),
+            'acquired': 0,
+            'queued': 0,
+        }
+
+    @property
+    def current(self) -> int:
+        """Текущий лимит одновременных запросов."""
+        return int(self.limit)
+
+    # ========================================
+    # Slots
+    # ========================================
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator['AdaptiveLimiter']:
+        """
+        Слот на один запрос.
+
+        Внутри слота результат запроса передается в observe(); таймауты и
+        ошибки, вылетевшие из блока, учитываются автоматически. Успехом
+        (рост лимита, задержка) считается слот без исключения и без ответа
+        429/5xx.
+        """
+        queued = time.monotonic()
+        await self._acquire()
+        started = time.monotonic()
+        self._record_wait(started - queued)
+        TRACER.record_wait('slot_wait', queued, started, limiter=self.name)
+        outcome = SlotOutcome(self)
+        token = _current_slot.set(outcome)
+        ok = False
+        try:
+            yield self
+            ok = not outcome.failed
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                self.observe_exception(e)
+            raise
+        finally:
+            _current_slot.reset(token)
+            await self._release(started if ok else None)
+
+    async def _acquire(self):
+        async with self._cond:
+            while True:
+                delay = self._blocked_until - time.monotonic()
+                if delay > 0:
+                    # Retry-After: ждем, но просыпаемся и раньше, если ожидание сократят
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < self.current:
+                    break
+                await self._cond.wait()
+            self.in_flight += 1
+            self._publish()
+
+    async def _release(self, started: Optional[float]):
+        async with self._cond:
+            self.in_flight -= 1
+            if started is not None:
+                self._on_success(started)
+            self._publish()
+            self._cond.notify_all()
+
+    def _record_wait(self, waited: float):
+        """Учитывает время ожидания слота (лимит занят или Retry-After)."""
+        self.stats['acquired'] += 1
+        if waited > 0.001:
+            self.stats['queued'] += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        METRICS.observe('slot_wait_seconds', waited, limiter=self.name)
+
+    def _publish(self):
+        """Занятые слоты и текущий лимит - в gauges метрик."""
+        METRICS.set_gauge('limiter_in_flight', self.in_flight, limiter=self.name)
+        METRICS.set_gauge('limiter_limit', self.current, limiter=self.name)
+
+    # ========================================
+    # Feedback
+    # ========================================
+
+    def observe(self, status: int, retry_after: Optional[str] = None):
+        """Учитывает HTTP статус ответа (и заголовок Retry-After)."""
+        if status in OVERLOAD_STATUSES or status >= 500:
+            outcome = _current_slot.get()
+            if outcome is not None and outcome.limiter is self:
+                outcome.failed = True
+
+        if status in OVERLOAD_STATUSES:
+            self._overload(f"HTTP {status}", parse_retry_after(retry_after))
+        elif status >= 500:
+            self._record_error(True)
+        else:
+            self._record_error(False)
+
+    def observe_exception(self, error: BaseException):
+        """Учитывает исключение при запросе: таймаут - перегрузка, прочее - ошибка."""
+        if is_timeout(error):
+            self._overload(type(error).__name__, None)
+        else:
+            self._record_error(True)
+
+    def _record_error(self, failed: bool):
+        self._error_rate += EWMA_ALPHA * (float(failed) - self._error_rate)
+
+    def _on_success(self, started: float):
+        now = time.monotonic()
+        latency = now - started
+        self._latency = latency if self._latency is None else (
+            self._latency + EWMA_ALPHA * (latency - self._latency)
+        )
+        if self._base_latency is None or self._latency < self._base_latency:
+            self._base_latency = self._latency
+
+        if not self.adaptive or started < self._last_cut:
+            # Запрос начался до снижения лимита - его успех ничего не говорит
+            return
+        if self._error_rate > MAX_HEALTHY_ERROR_RATE:
+            return
+        if self._latency > self._base_latency * self.latency_tolerance:
+            return
+
+        before = self.current
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        if self.current > before:
+            self.stats['increases'] += 1
+            self.stats['peak_limit'] = max(self.stats['peak_limit'], self.current)
+            logger.debug(f"📈 Лимит {self.name}: {before} → {self.current}")
+
+    def _overload(self, reason: str, retry_after: Optional[float]):
+        self._record_error(True)
+        now = time.monotonic()
+
+        if retry_after:
+            self.stats['retry_after'] += 1
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            logger.warning(f"⏸️  {self.name}: Retry-After {retry_after:.0f}с ({reason})")
+
+        if not self.adaptive:
+            return
+        # Одно снижение за время ответа: ответы запросов, отправленных до
+        # снижения, относятся к той же перегрузке
+        if now - self._last_cut < (self._latency or 1.0):
+            return
+
+        before = self.current
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self._last_cut = now
+        self.stats['cuts'] += 1
+        self.stats['lowest_limit'] = min(self.stats['lowest_limit'], self.current)
+        logger.warning(f"📉 Лимит {self.name}: {before} → {self.current} ({reason})")
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        """Состояние лимитера для статистики и метрик (с ожиданием слота в очереди)."""
+        return {
+            'limit': self.current,
+            'in_flight': self.in_flight,
+            'latency_ms': round((self._latency or 0.0) * 1000, 1),
+            'error_rate': round(self._error_rate, 3),
+            'wait_total_s': round(self._wait_total, 2),
+            'wait_avg_ms': round(self._wait_total / self.stats['acquired'] * 1000, 1)
+            if self.stats['acquired'] else 0.0,
+            'wait_max_ms': round(self._wait_max * 1000, 1),
+            **self.stats,
+        }
@@ -7,22 +7,34 @@
 """
 
 import asyncio
-from typing import Optional, List, Dict, Any, BinaryIO
+import json
+import tempfile
+import time
+import uuid
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager
+from typing import Optional, List, Dict, Any, BinaryIO, Callable, AsyncIterator, Iterator, Tuple
 from io import BytesIO
+from urllib.parse import urlparse
 import mimetypes
 
 import httpx
 from tenacity import (
-    retry, 
-    stop_after_attempt, 
-    wait_exponential, 
-    retry_if_exception_type,
-    before_sleep_log
+    retry,
+    wait_exponential,
+    wait_random,
+    RetryCallState
 )
 from loguru import logger
 
 from models import Product, ProductImage, APIResponse
 from config import Config
+from image_cache import ImageCache, content_hasher
+from adaptive_concurrency import AdaptiveLimiter
+from rate_limit import HostRateLimits, host_key
+from metrics import METRICS
+from tracing import TRACER
+from circuit_breaker import CircuitBreaker, RetryBudget, TRANSPORT_ERRORS
+from response_archive import ResponseArchive, KIND_IMAGE
 
 
 
@@ -43,27 +55,104 @@ class ImageDownloadError(Exception):
     pass
 
 
+class BulkRejectedError(APIError):
+    """Сервер не принял пакет целиком (нет эндпоинта, слишком большой, не тот формат)."""
+    pass
+
+
+class ImageTooLargeError(ImageDownloadError):
+    """Изображение больше IMAGE_MAX_MB."""
+    pass
+
+
 # ========================================
 # Retry Configuration
 # ========================================
 
+# Временные ошибки, которые имеет смысл повторить (транспорт - как у breaker)
+RETRYABLE_ERRORS = (
+    httpx.HTTPStatusError,
+    *TRANSPORT_ERRORS,
+    APIError
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Временная ли ошибка: транспорта, 5xx/408/429 или ошибка ответа API."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        # 4xx повторять бесполезно - запрос не станет правильнее
+        return status >= 500 or status in (408, 429)
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def retry_cause(error: BaseException) -> str:
+    """Причина повтора для метрик: http_503, timeout, connect, network, protocol, transport, api."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"http_{error.response.status_code}"
+    if isinstance(error, httpx.TimeoutException):
+        return 'timeout'
+    if isinstance(error, httpx.ConnectError):
+        return 'connect'
+    if isinstance(error, httpx.NetworkError):
+        return 'network'
+    if isinstance(error, httpx.ProtocolError):
+        return 'protocol'
+    if isinstance(error, httpx.TransportError):
+        return 'transport'
+    return 'api'
+
+
+def _retry_allowed(retry_state: RetryCallState) -> bool:
+    """
+    Повторять ли вызов метода APIClient.
+    
+    Повтор нужен, если ошибка временная, попытки (MAX_RETRIES) не кончились
+    и в общем бюджете повторов есть место.
+    """
+    error = retry_state.outcome.exception()
+    if error is None or not is_retryable(error):
+        return False
+    client = retry_state.args[0]
+    if retry_state.attempt_number >= client.config.MAX_RETRIES:
+        return False
+    operation = retry_state.fn.__name__
+    if not client.retry_budget.try_spend():
+        METRICS.inc('retries_denied_total', operation=operation)
+        logger.warning(f"⚠️ Бюджет повторов исчерпан, без повтора: {error}")
+        return False
+    METRICS.inc('retries_total', operation=operation, cause=retry_cause(error))
+    return True
+
+
+def _log_retry(retry_state: RetryCallState):
+    """Лог (и событие в трассе товара) перед повтором."""
+    TRACER.instant(
+        'retry',
+        operation=retry_state.fn.__name__,
+        attempt=retry_state.attempt_number,
+        cause=retry_cause(retry_state.outcome.exception())
+    )
+    logger.warning(
+        f"🔁 {retry_state.fn.__name__}: попытка {retry_state.attempt_number} не удалась "
+        f"({retry_state.outcome.exception()}), повтор через {retry_state.next_action.sleep:.1f}с"
+    )
+
+
 def get_default_retry():
     return retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=2.0, min=2.0, max=10.0),
-        retry=retry_if_exception_type((
-            httpx.HTTPStatusError,
-            httpx.ConnectError,
-            httpx.TimeoutException,
-            httpx.NetworkError,
-            APIError
-        )),
-        before_sleep=before_sleep_log(logger, 'warning'),
+        retry=_retry_allowed,
+        # Случайная добавка разводит повторы задач во времени
+        wait=wait_exponential(multiplier=2.0, min=2.0, max=10.0) + wait_random(0, 1),
+        before_sleep=_log_retry,
         reraise=True
     )
 
 RETRY_DECORATOR = get_default_retry()
 
+# Статусы, при которых пакет отправляется по одному товару, а не повторяется
+BULK_REJECT_STATUSES = {400, 404, 405, 413, 415, 422, 501}
+
 
 class APIClient:
     """
@@ -71,14 +160,22 @@ class APIClient:
     Поддерживает retry логику, загрузку изображений и создание товаров.
     """
     
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        rate_limits: Optional[HostRateLimits] = None,
+        archive: Optional[ResponseArchive] = None
+    ):
+        """
+        Args:
+            config: Конфигурация
+            rate_limits: Общий бюджет запросов по хостам (по умолчанию из config)
+            archive: Архив ответов: запись скачанных изображений или повтор из него
+        """
         self.config = config
-        
-        # HTTP клиент с настройками
-        limits = httpx.Limits(
-            max_keepalive_connections=20,
-            max_connections=50
-        )
+        self.archive = archive
+        # Бюджет запросов по хостам (CDN, ваш API) - токен до слота лимитера
+        self.rate_limits = rate_limits or HostRateLimits.from_config(config)
         
         timeout = httpx.Timeout(
             connect=10.0,
@@ -87,22 +184,79 @@ class APIClient:
             pool=10.0
         )
         
-        self.client = httpx.AsyncClient(
-            limits=limits,
-            timeout=timeout,
-            http2=True,
-            follow_redirects=True
-        )
+        # Бюджеты операций: скачивание с CDN, загрузка изображений и запросы
+        # товаров (создание, PATCH, деактивация). У каждого свой адаптивный
+        # лимит (AIMD) и свой пул соединений по его верхней границе, поэтому
+        # медленные скачивания не занимают слоты и соединения создания товаров
+        # и наоборот
+        self.download_limiter = self._limiter('download', config.IMAGE_CONCURRENCY)
+        self.upload_limiter = self._limiter('upload', config.UPLOAD_CONCURRENCY)
+        self.create_limiter = self._limiter('create', config.CREATE_CONCURRENCY)
+        self.download_client = self._http_client(self.download_limiter, timeout)
+        self.upload_client = self._http_client(self.upload_limiter, timeout)
+        self.client = self._http_client(self.create_limiter, timeout)
+        
+        # Breaker на каждый эндпоинт API и общий бюджет повторов: при падении
+        # API запросы ждут в очереди, а не повторяются всеми задачами сразу
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_budget = RetryBudget(config.RETRY_BUDGET_PERCENT, config.RETRY_BUDGET_RESERVE)
         
-        # Семафор для ограничения concurrency
-        self.semaphore = asyncio.Semaphore(config.CONCURRENCY_LIMIT)
+        # Контентно-адресуемый кэш: одинаковые картинки скачиваются и загружаются один раз
+        self.image_cache: Optional[ImageCache] = None
+        if config.IMAGE_CACHE_ENABLED:
+            self.image_cache = ImageCache(
+                config.IMAGE_CACHE_DIR,
+                config.IMAGE_CACHE_MAX_MB * 1024 * 1024
+            ).open()
+        # Один hash загружается одной корутиной, остальные ждут ее результат:
+        # hash -> (lock, число ожидающих), запись удаляется за последним
+        self._upload_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self.max_image_bytes = config.IMAGE_MAX_MB * 1024 * 1024
+        # Сбрасывается, если сервер не знает пакетного эндпоинта
+        self.bulk_supported = config.BULK_CREATE_ENABLED
         
         logger.info("🌐 API Client инициализирован")
         logger.info(f"   Base URL: {config.MY_API_URL}")
     
+    def _limiter(self, name: str, initial: int) -> AdaptiveLimiter:
+        """Адаптивный лимит бюджета операции."""
+        return AdaptiveLimiter(
+            name,
+            initial=initial,
+            max_limit=max(self.config.max_concurrency, initial),
+            adaptive=self.config.ADAPTIVE_CONCURRENCY,
+            latency_tolerance=self.config.ADAPTIVE_LATENCY_TOLERANCE
+        )
+    
+    @staticmethod
+    def _http_client(limiter: AdaptiveLimiter, timeout: httpx.Timeout) -> httpx.AsyncClient:
+        """Пул соединений бюджета: соединений не больше верхней границы его лимита."""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=limiter.current,
+                max_connections=limiter.max_limit
+            ),
+            timeout=timeout,
+            http2=True,
+            follow_redirects=True
+        )
+    
+    @property
+    def limiters(self) -> List[AdaptiveLimiter]:
+        """Лимиты бюджетов: скачивание, загрузка изображений, запросы товаров."""
+        return [self.download_limiter, self.upload_limiter, self.create_limiter]
+    
     async def close(self):
-        """Закрывает HTTP клиент."""
-        await self.client.aclose()
+        """Закрывает HTTP клиенты."""
+        for client in (self.download_client, self.upload_client, self.client):
+            await client.aclose()
+        for limiter in self.limiters:
+            logger.info(f"🎚️  Лимит {limiter.name}: {limiter.snapshot()}")
+        for breaker in self.breakers.values():
+            logger.info(f"🔌 Breaker {breaker.name}: {breaker.snapshot()}")
+        logger.info(f"🔁 Бюджет повторов: {self.retry_budget.snapshot()}")
+        if self.image_cache:
+            self.image_cache.close()
         logger.info("🔒 API Client закрыт")
     
     async def __aenter__(self):
@@ -139,37 +293,180 @@ class APIClient:
         try:
             logger.debug(f"📥 Скачивание изображения: {image_url[:60]}...")
             
-            async with self.semaphore:
-                response = await self.client.get(
-                    image_url,
-                    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                )
-                response.raise_for_status()
-                
-                content = response.content
-                content_type = response.headers.get('content-type', 'image/jpeg')
-                
-                # Определяем MIME-тип
-                if not content_type or content_type == 'application/octet-stream':
-                    content_type, _ = mimetypes.guess_type(image_url)
-                    content_type = content_type or 'image/jpeg'
-                
-                image_buffer = BytesIO(content)
-                size_bytes = len(content)
-                
-                logger.debug(f"✅ Изображение скачано: {size_bytes} bytes, {content_type}")
-                
-                return image_buffer, content_type, size_bytes
+            with TRACER.span('download_image'):
+                async with self._open_image(image_url) as response:
+                    response.raise_for_status()
+                    
+                    content = await self._read_image(response, image_url)
+                    content_type = self._image_content_type(response, image_url)
+                    
+                    image_buffer = BytesIO(content)
+                    size_bytes = len(content)
+                    
+                    logger.debug(f"✅ Изображение скачано: {size_bytes} bytes, {content_type}")
+                    
+                    return image_buffer, content_type, size_bytes
                 
+        except ImageDownloadError:
+            raise
         except httpx.HTTPStatusError as e:
             raise ImageDownloadError(f"HTTP {e.response.status_code} при скачивании {image_url}")
         except Exception as e:
             raise ImageDownloadError(f"Ошибка скачивания {image_url}: {str(e)}")
     
+    @asynccontextmanager
+    async def _open_image(
+        self,
+        image_url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Потоковый GET изображения с источника (дополнительные заголовки - для
+        условного запроса) в бюджете скачивания. Тело не читается, пока его
+        не запросят.
+        
+        С архивом ответов при повторе изображение берется из архива без сети,
+        при записи тело дописывается в архив после чтения (_iter_image).
+        """
+        if self.archive and self.archive.replaying:
+            yield self._replay_image(image_url)
+            return
+        if self.archive and self.archive.recording:
+            # В архив нужно тело, а не 304
+            headers = None
+        
+        await self.rate_limits.acquire(image_url)
+        async with self.download_limiter.slot(), AsyncExitStack() as stack:
+            # Метрика image_download - до заголовков ответа: тело при потоковой
+            # передаче читается одновременно с загрузкой на ваш сервер
+            with METRICS.track('image_download', host_key(image_url)):
+                response = await stack.enter_async_context(self.download_client.stream(
+                    'GET',
+                    image_url,
+                    headers={
+                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                        **(headers or {})
+                    }
+                ))
+            self.download_limiter.observe(response.status_code, response.headers.get('retry-after'))
+            yield response
+    
+    def _replay_image(self, image_url: str) -> httpx.Response:
+        """Ответ с изображением из архива (ArchiveMiss, если его нет)."""
+        record = self.archive.replay(image_url)
+        return httpx.Response(
+            200,
+            headers={'content-type': record.content_type, 'content-length': str(len(record.body))},
+            content=record.body,
+            request=httpx.Request('GET', image_url)
+        )
+    
+    async def _api_request(
+        self,
+        method: str,
+        url: str,
+        upload: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Запрос к вашему API: токен бюджета хоста, затем слот бюджета операции.
+        
+        Args:
+            upload: Загрузка изображения (бюджет upload), иначе - запрос товаров (create)
+        """
+        limiter, client = (
+            (self.upload_limiter, self.upload_client) if upload else (self.create_limiter, self.client)
+        )
+        breaker = self.breaker(url)
+        host = host_key(url)
+        # Пока breaker эндпоинта разомкнут, запрос ждет без токена и слота
+        async with breaker.guard() as outcome:
+            await self.rate_limits.acquire(url)
+            async with limiter.slot():
+                self.retry_budget.record_request()
+                with METRICS.track('image_upload' if upload else f"api_{breaker.name}", host):
+                    response = await client.request(method, url, **kwargs)
+                limiter.observe(response.status_code, response.headers.get('retry-after'))
+            outcome.record(response.status_code)
+        
+        # Тело загрузки изображения считается в upload_image/_pipe_image
+        if not upload:
+            METRICS.inc('bytes_total', len(response.request.content), direction='out', host=host)
+        METRICS.inc('bytes_total', len(response.content), direction='in', host=host)
+        return response
+    
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Breaker эндпоинта API, к которому относится URL."""
+        endpoints = (
+            ('media', self.config.media_upload_url),
+            ('bulk', self.config.products_bulk_url),
+            ('deactivate', self.config.products_deactivate_url),
+            ('products', self.config.products_api_url),
+        )
+        name = next((name for name, prefix in endpoints if url.startswith(prefix)), urlparse(url).path)
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=self.config.CIRCUIT_FAILURE_THRESHOLD,
+                recovery_timeout=self.config.CIRCUIT_RECOVERY_SECONDS,
+                max_wait=self.config.CIRCUIT_MAX_WAIT_SECONDS
+            )
+        return self.breakers[name]
+    
+    async def _iter_image(self, response: httpx.Response, image_url: str) -> AsyncIterator[bytes]:
+        """
+        Чанки тела изображения с проверкой IMAGE_MAX_MB.
+        
+        При записи архива прочитанное тело целиком дописывается в архив.
+        
+        Raises:
+            ImageTooLargeError: По Content-Length - до чтения тела, иначе на превышающем чанке
+        """
+        declared = response.headers.get('content-length')
+        if declared and declared.isdigit() and int(declared) > self.max_image_bytes:
+            raise ImageTooLargeError(
+                f"Изображение {image_url} больше {self.config.IMAGE_MAX_MB} MB ({declared} bytes)"
+            )
+        
+        host = host_key(image_url)
+        received = 0
+        recorded = bytearray() if self.archive and self.archive.recording else None
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > self.max_image_bytes:
+                raise ImageTooLargeError(
+                    f"Изображение {image_url} больше {self.config.IMAGE_MAX_MB} MB"
+                )
+            METRICS.inc('bytes_total', len(chunk), direction='in', host=host)
+            if recorded is not None:
+                recorded.extend(chunk)
+            yield chunk
+        
+        if recorded is not None and response.is_success:
+            await self.archive.record(
+                image_url, KIND_IMAGE, bytes(recorded), self._image_content_type(response, image_url)
+            )
+    
+    async def _read_image(self, response: httpx.Response, image_url: str) -> bytes:
+        """Тело изображения целиком (с проверкой IMAGE_MAX_MB)."""
+        buffer = bytearray()
+        async for chunk in self._iter_image(response, image_url):
+            buffer.extend(chunk)
+        return bytes(buffer)
+    
+    @staticmethod
+    def _image_content_type(response: httpx.Response, image_url: str) -> str:
+        """MIME-тип изображения из ответа или по расширению URL."""
+        content_type = response.headers.get('content-type', 'image/jpeg')
+        if not content_type or content_type == 'application/octet-stream':
+            content_type, _ = mimetypes.guess_type(image_url)
+            content_type = content_type or 'image/jpeg'
+        return content_type
+    
     @RETRY_DECORATOR
     async def upload_image(
         self, 
-        image_buffer: BytesIO, 
+        image_buffer: BinaryIO, 
         filename: str,
         content_type: str
     ) -> str:
@@ -177,7 +474,7 @@ class APIClient:
         Загружает изображение на ваш сервер через multipart/form-data.
         
         Args:
-            image_buffer: BytesIO с данными изображения
+            image_buffer: BytesIO или файл с данными изображения
             filename: Имя файла
             content_type: MIME-тип
             
@@ -186,7 +483,8 @@ class APIClient:
         """
         logger.debug(f"📤 Загрузка изображения: {filename}")
         
-        # Сбрасываем позицию буфера
+        # Размер для метрик и сброс позиции буфера
+        size_bytes = image_buffer.seek(0, 2)
         image_buffer.seek(0)
         
         # Формируем multipart данные
@@ -194,51 +492,179 @@ class APIClient:
             'file': (filename, image_buffer, content_type)
         }
         
-        async with self.semaphore:
-            response = await self.client.post(
+        with TRACER.span('upload_image', size_bytes=size_bytes):
+            response = await self._api_request(
+                'POST',
                 self.config.media_upload_url,
+                upload=True,
                 headers=self.config.api_headers_multipart,
                 files=files
             )
+        METRICS.inc('bytes_total', size_bytes, direction='out', host=host_key(self.config.media_upload_url))
+        
+        return self._uploaded_url(response)
+    
+    @staticmethod
+    def _uploaded_url(response: httpx.Response) -> str:
+        """URL загруженного изображения из ответа API."""
+        response.raise_for_status()
+        
+        result = response.json()
+        
+        # Пытаемся извлечь URL из разных форматов ответа
+        uploaded_url = (
+            result.get('url') or 
+            result.get('file_url') or 
+            result.get('data', {}).get('url') or
+            result.get('image_url') or
+            result.get('path')
+        )
+        
+        if not uploaded_url:
+            raise APIError(
+                f"Не удалось получить URL из ответа API: {result}",
+                response.status_code,
+                response.text
+            )
+        
+        logger.debug(f"✅ Изображение загружено: {uploaded_url[:60]}...")
+        return uploaded_url
+    
+    # ========================================
+    # Streaming transfer
+    # ========================================
+    
+    async def transfer_image(self, image_url: str, filename: str) -> tuple[str, str, str, int]:
+        """
+        Передает изображение с источника на ваш сервер без буферизации в памяти.
+        
+        Тело ответа источника по чанкам уходит в multipart запрос загрузки.
+        Байты не сохраняются: если передача не удалась, изображение
+        скачивается заново во временный файл, и загрузка повторяется
+        из него с обычным retry.
+        
+        Args:
+            image_url: URL изображения на источнике
+            filename: Имя файла без расширения (расширение - по MIME-типу)
             
-            response.raise_for_status()
+        Returns:
+            Кортеж (URL на вашем сервере, имя файла, MIME-тип, размер в байтах)
+        """
+        try:
+            with TRACER.span('transfer_image'):
+                return await self._pipe_image(image_url, filename)
+        except ImageTooLargeError:
+            raise
+        except (httpx.HTTPError, APIError, ImageDownloadError) as e:
+            logger.warning(f"⚠️ Потоковая передача {image_url[:60]} не удалась ({e}), повтор через временный файл")
+        
+        with tempfile.TemporaryFile() as spool:
+            content_type, size_bytes = await self._download_to_file(image_url, spool)
+            filename = f"{filename}{mimetypes.guess_extension(content_type) or '.jpg'}"
+            uploaded_url = await self.upload_image(spool, filename, content_type)
+        return uploaded_url, filename, content_type, size_bytes
+    
+    async def _pipe_image(self, image_url: str, filename: str) -> tuple[str, str, str, int]:
+        """Одна попытка потоковой передачи источник -> multipart загрузка."""
+        async with self._open_image(image_url) as source:
+            try:
+                source.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                raise ImageDownloadError(f"HTTP {e.response.status_code} при скачивании {image_url}")
             
-            result = response.json()
+            content_type = self._image_content_type(source, image_url)
+            filename = f"{filename}{mimetypes.guess_extension(content_type) or '.jpg'}"
+            boundary = uuid.uuid4().hex
+            sent = [0]
             
-            # Пытаемся извлечь URL из разных форматов ответа
-            uploaded_url = (
-                result.get('url') or 
-                result.get('file_url') or 
-                result.get('data', {}).get('url') or
-                result.get('image_url') or
-                result.get('path')
-            )
+            async def body() -> AsyncIterator[bytes]:
+                yield (
+                    f'--{boundary}\r\n'
+                    f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                    f'Content-Type: {content_type}\r\n\r\n'
+                ).encode('utf-8')
+                async for chunk in self._iter_image(source, image_url):
+                    sent[0] += len(chunk)
+                    yield chunk
+                yield f'\r\n--{boundary}--\r\n'.encode('utf-8')
             
-            if not uploaded_url:
-                raise APIError(
-                    f"Не удалось получить URL из ответа API: {result}",
-                    response.status_code,
-                    response.text
-                )
-            
-            logger.debug(f"✅ Изображение загружено: {uploaded_url[:60]}...")
-            return uploaded_url
+            logger.debug(f"📤 Потоковая загрузка изображения: {filename}")
+            response = await self._api_request(
+                'POST',
+                self.config.media_upload_url,
+                upload=True,
+                headers={
+                    **self.config.api_headers_multipart,
+                    'Content-Type': f'multipart/form-data; boundary={boundary}'
+                },
+                content=body()
+            )
+            METRICS.inc('bytes_total', sent[0], direction='out', host=host_key(self.config.media_upload_url))
+            return self._uploaded_url(response), filename, content_type, sent[0]
+    
+    async def _download_to_file(self, image_url: str, file: BinaryIO) -> tuple[str, int]:
+        """Скачивает изображение во временный файл (для повторных попыток загрузки)."""
+        try:
+            async with self._open_image(image_url) as response:
+                response.raise_for_status()
+                size_bytes = 0
+                async for chunk in self._iter_image(response, image_url):
+                    file.write(chunk)
+                    size_bytes += len(chunk)
+                content_type = self._image_content_type(response, image_url)
+        except ImageDownloadError:
+            raise
+        except httpx.HTTPStatusError as e:
+            raise ImageDownloadError(f"HTTP {e.response.status_code} при скачивании {image_url}")
+        except Exception as e:
+            raise ImageDownloadError(f"Ошибка скачивания {image_url}: {str(e)}")
+        file.seek(0)
+        return content_type, size_bytes
     
     async def process_product_images(self, product: Product) -> List[str]:
         """
-        Скачивает и загружает все изображения товара.
+        Скачивает и загружает все изображения товара параллельно.
         
         Args:
             product: Объект товара
             
         Returns:
-            Список URL загруженных изображений
+            Список URL загруженных изображений (в порядке изображений товара)
+        """
+        with TRACER.product(product.source_url, 'upload_images'):
+            tasks = self._start_image_tasks(product)
+            results = await asyncio.gather(*tasks)
+        return [url for url in results if url]
+    
+    def _start_image_tasks(self, product: Product) -> List[asyncio.Task]:
+        """Запускает обработку всех изображений товара (параллельность - бюджеты download/upload)."""
+        return [
+            asyncio.create_task(self._process_image(product, idx, image))
+            for idx, image in enumerate(product.images)
+        ]
+    
+    async def _process_image(self, product: Product, idx: int, image: ProductImage) -> Optional[str]:
         """
-        uploaded_urls = []
-        errors = []
+        Скачивает и загружает одно изображение.
         
-        for idx, image in enumerate(product.images):
+        Returns:
+            URL на вашем сервере или None при ошибке (ошибка пишется в product.errors)
+        """
+        with TRACER.lane(f"image {idx}"):
             try:
+                if self.image_cache:
+                    return await self._process_image_cached(image)
+                
+                if self.config.IMAGE_STREAMING:
+                    uploaded_url, filename, content_type, size_bytes = await self.transfer_image(
+                        image.original_url, f"{product.source_id or 'product'}_{idx}"
+                    )
+                    image.uploaded_url = uploaded_url
+                    image.filename = filename
+                    image.mime_type = content_type
+                    image.size_bytes = size_bytes
+                    return uploaded_url
+                
                 # Скачиваем изображение
                 image_buffer, content_type, size_bytes = await self.download_image(image.original_url)
                 
@@ -255,78 +681,447 @@ class APIClient:
                 image.mime_type = content_type
                 image.size_bytes = size_bytes
                 
-                uploaded_urls.append(uploaded_url)
-                
-                # Небольшая задержка между загрузками
-                await asyncio.sleep(0.2)
+                return uploaded_url
                 
             except Exception as e:
                 error_msg = f"Ошибка обработки изображения {image.original_url}: {str(e)}"
                 logger.warning(f"⚠️ {error_msg}")
-                errors.append(error_msg)
-                # Продолжаем с другими изображениями
+                product.errors.append(error_msg)
+                return None
+    
+    async def _process_image_cached(self, image: ProductImage) -> str:
+        """
+        Загружает изображение через контентно-адресуемый кэш.
+        
+        Известный URL не скачивается повторно (или проверяется условным GET
+        при IMAGE_CACHE_REVALIDATE), известный hash не загружается повторно.
+        Файл на API называется по hash, а не по товару. Тело скачивается во
+        временный файл с подсчетом hash по чанкам и загружается из файла -
+        память не растет с размером изображений.
+        
+        Returns:
+            URL изображения на вашем сервере
+        """
+        cache = self.image_cache
+        # При записи в архив нужны байты каждой картинки; загрузка на API - по-прежнему по hash
+        recording = self.archive is not None and self.archive.recording
+        entry = None if recording else cache.lookup_url(image.original_url)
+        
+        with ExitStack() as files:
+            body: Optional[BinaryIO] = None
+            
+            if entry and self.config.IMAGE_CACHE_REVALIDATE:
+                validators = {}
+                if entry['etag']:
+                    validators['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    validators['If-Modified-Since'] = entry['last_modified']
+                if validators:
+                    spool = files.enter_context(tempfile.TemporaryFile())
+                    downloaded = await self._download_to_cache(image.original_url, spool, validators)
+                    if downloaded:
+                        # Картинка по этому URL изменилась
+                        body, entry = spool, None
+                        content_type, digest, size_bytes = downloaded
+            
+            if entry:
+                cache.stats['url_hits'] += 1
+                digest = entry['hash']
+                content_type = entry['mime_type'] or 'image/jpeg'
+                size_bytes = entry['size_bytes']
+            elif body is None:
+                body = files.enter_context(tempfile.TemporaryFile())
+                content_type, digest, size_bytes = await self._download_to_cache(image.original_url, body)
+            
+            ext = mimetypes.guess_extension(content_type) or '.jpg'
+            filename = f"{digest[:16]}{ext}"
+            
+            async with self._upload_lock(digest):
+                uploaded_url = cache.uploaded_url(digest)
+                if uploaded_url:
+                    cache.stats['upload_hits'] += 1
+                else:
+                    if body is None:
+                        body = cache.open_blob(digest)
+                        if body is not None:
+                            files.enter_context(body)
+                    if body is None:
+                        # Байты вытеснены с диска, а загрузка не удалась в прошлый раз
+                        body = files.enter_context(tempfile.TemporaryFile())
+                        content_type, _, _ = await self._download_to_cache(image.original_url, body)
+                    uploaded_url = await self.upload_image(body, filename, content_type)
+                    cache.set_uploaded(digest, uploaded_url)
+                    cache.stats['uploads'] += 1
+        
+        image.uploaded_url = uploaded_url
+        image.filename = filename
+        image.mime_type = content_type
+        image.size_bytes = size_bytes
+        return uploaded_url
+    
+    @asynccontextmanager
+    async def _upload_lock(self, digest: str) -> AsyncIterator[None]:
+        """Lock загрузки hash; запись удаляется, когда hash больше никто не ждет."""
+        lock, waiting = self._upload_locks.get(digest) or (asyncio.Lock(), 0)
+        self._upload_locks[digest] = (lock, waiting + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, waiting = self._upload_locks[digest]
+            if waiting > 1:
+                self._upload_locks[digest] = (lock, waiting - 1)
+            else:
+                del self._upload_locks[digest]
+    
+    async def _download_to_cache(
+        self,
+        image_url: str,
+        file: BinaryIO,
+        validators: Optional[Dict[str, str]] = None
+    ) -> Optional[tuple[str, str, int]]:
+        """
+        Скачивает изображение в файл, считая hash по чанкам, и сохраняет в кэш.
         
-        if errors:
-            product.errors.extend(errors)
+        Returns:
+            Кортеж (MIME-тип, hash, размер в байтах) или None, если условный GET
+            вернул 304. Позиция файла - в начале.
+        """
+        hasher = content_hasher()
+        size_bytes = 0
+        try:
+            with TRACER.span('download_image'):
+                async with self._open_image(image_url, validators) as response:
+                    if response.status_code == 304:
+                        return None
+                    response.raise_for_status()
+                    async for chunk in self._iter_image(response, image_url):
+                        hasher.update(chunk)
+                        file.write(chunk)
+                        size_bytes += len(chunk)
+        except ImageDownloadError:
+            raise
+        except httpx.HTTPStatusError as e:
+            raise ImageDownloadError(f"HTTP {e.response.status_code} при скачивании {image_url}")
+        except Exception as e:
+            raise ImageDownloadError(f"Ошибка скачивания {image_url}: {str(e)}")
         
-        return uploaded_urls
+        content_type = self._image_content_type(response, image_url)
+        digest = hasher.hexdigest()
+        self.image_cache.store(
+            image_url,
+            file,
+            digest,
+            size_bytes,
+            content_type,
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified')
+        )
+        self.image_cache.stats['downloads'] += 1
+        return content_type, digest, size_bytes
     
     # ========================================
     # Product Operations
     # ========================================
     
     @RETRY_DECORATOR
-    async def create_product(self, product: Product) -> APIResponse:
+    async def create_product(
+        self,
+        product: Product,
+        images: Optional[List[ProductImage]] = None
+    ) -> APIResponse:
         """
         Создает товар на вашем сервере через POST запрос.
         
         Args:
             product: Объект товара с заполненными данными
+            images: Изображения для payload (по умолчанию все)
             
         Returns:
             Ответ API
         """
-        payload = product.to_api_payload()
+        payload = product.to_api_payload(images)
         
         logger.debug(f"📤 Создание товара: {product.title[:50]}...")
         
-        async with self.semaphore:
-            response = await self.client.post(
+        with TRACER.span('create_product'):
+            response = await self._api_request(
+                'POST',
                 self.config.products_api_url,
                 headers=self.config.api_headers,
                 json=payload
             )
             
             response.raise_for_status()
+        
+        return self._apply_create_result(product, response.json())
+    
+    @staticmethod
+    def _apply_create_result(product: Product, result: Dict[str, Any]) -> APIResponse:
+        """Разбирает ответ API на создание товара и отмечает товар загруженным."""
+        api_response = APIResponse(
+            success=result.get('success', True),
+            product_id=(
+                result.get('id') or 
+                result.get('product_id') or 
+                (result.get('data') or {}).get('id')
+            ),
+            message=result.get('message'),
+            errors=result.get('errors')
+        )
+        
+        if api_response.success and api_response.product_id:
+            product.api_product_id = str(api_response.product_id)
+            product.uploaded_to_api = True
+            logger.info(f"✅ Товар создан: ID={api_response.product_id}")
+        else:
+            logger.warning(f"⚠️ Товар создан с предупреждениями: {api_response.message}")
+        
+        return api_response
+    
+    # ========================================
+    # Bulk Create
+    # ========================================
+    
+    def _bulk_batches(self, products: List[Product]) -> Iterator[tuple[List[Product], List[bytes]]]:
+        """
+        Делит товары на пакеты не больше BULK_BATCH_SIZE штук и BULK_BATCH_MAX_KB.
+        
+        Товар, который один больше лимита по размеру, уходит отдельным пакетом.
+        """
+        max_bytes = self.config.BULK_BATCH_MAX_KB * 1024
+        batch: List[Product] = []
+        bodies: List[bytes] = []
+        size = 0
+        
+        for product in products:
+            body = json.dumps(
+                product.to_api_payload(), ensure_ascii=False, default=str
+            ).encode('utf-8')
+            if batch and (len(batch) >= self.config.BULK_BATCH_SIZE or size + len(body) > max_bytes):
+                yield batch, bodies
+                batch, bodies, size = [], [], 0
+            batch.append(product)
+            bodies.append(body)
+            size += len(body) + 1
+        
+        if batch:
+            yield batch, bodies
+    
+    async def _post_bulk(self, bodies: List[bytes]) -> List[Dict[str, Any]]:
+        """
+        Отправляет пакет payload'ов (JSON массив или NDJSON).
+        
+        Returns:
+            Результаты по товарам в порядке отправки
             
-            result = response.json()
-            
-            # Парсим ответ
-            api_response = APIResponse(
-                success=result.get('success', True),
-                product_id=(
-                    result.get('id') or 
-                    result.get('product_id') or 
-                    result.get('data', {}).get('id')
-                ),
-                message=result.get('message'),
-                errors=result.get('errors')
+        Raises:
+            BulkRejectedError: Сервер не принял пакет - повтор бесполезен
+        """
+        if self.config.BULK_FORMAT == 'ndjson':
+            content = b'\n'.join(bodies) + b'\n'
+            content_type = 'application/x-ndjson'
+        else:
+            content = b'[' + b','.join(bodies) + b']'
+            content_type = 'application/json'
+        
+        response = await self._send_bulk(content, content_type)
+        
+        if response.status_code in BULK_REJECT_STATUSES:
+            raise BulkRejectedError(
+                f"Пакет отклонен: HTTP {response.status_code}",
+                response.status_code,
+                response.text
             )
-            
-            if api_response.success and api_response.product_id:
-                product.api_product_id = api_response.product_id
-                product.uploaded_to_api = True
-                logger.info(f"✅ Товар создан: ID={api_response.product_id}")
+        response.raise_for_status()
+        
+        result = response.json()
+        items = result if isinstance(result, list) else (
+            result.get('results') or result.get('items') or result.get('data')
+        )
+        if not isinstance(items, list) or len(items) != len(bodies):
+            raise BulkRejectedError(
+                f"Ответ не сопоставляется с пакетом из {len(bodies)} товаров",
+                response.status_code,
+                response.text[:500]
+            )
+        return items
+    
+    @RETRY_DECORATOR
+    async def _send_bulk(self, content: bytes, content_type: str) -> httpx.Response:
+        """POST пакета с retry только на сетевые ошибки и 5xx."""
+        response = await self._api_request(
+            'POST',
+            self.config.products_bulk_url,
+            headers={**self.config.api_headers, 'Content-Type': content_type},
+            content=content
+        )
+        if response.status_code >= 500 and response.status_code not in BULK_REJECT_STATUSES:
+            response.raise_for_status()
+        return response
+    
+    async def create_products_bulk(self, products: List[Product]) -> List[APIResponse]:
+        """
+        Создает товары пакетами через пакетный эндпоинт.
+        
+        Результаты сопоставляются с товарами по external_id (если сервер его
+        вернул) или по порядку. Если сервер не принимает пакет, товары
+        создаются по одному обычным POST. Если пакет не удалось отправить
+        (сеть, 5xx после повторов, не-JSON ответ), все его товары считаются
+        неудачными - без исключения.
+        
+        Returns:
+            Ответы API в порядке товаров
+        """
+        responses: List[APIResponse] = []
+        for batch, bodies in self._bulk_batches(products):
+            responses.extend(await self._create_batch(batch, bodies))
+        return responses
+    
+    async def _create_batch(self, batch: List[Product], bodies: List[bytes]) -> List[APIResponse]:
+        """Один пакет с откатом на одиночные запросы."""
+        if self.bulk_supported:
+            try:
+                items = await self._post_bulk(bodies)
+                logger.debug(f"📦 Пакет создан: {len(batch)} товаров")
+                return self._map_bulk_results(batch, items)
+            except BulkRejectedError as e:
+                if e.status_code in (404, 405, 501):
+                    logger.warning("⚠️ Пакетный эндпоинт не поддерживается, товары создаются по одному")
+                    self.bulk_supported = False
+                else:
+                    logger.warning(f"⚠️ {e}, товары пакета создаются по одному")
+            except Exception as e:
+                # Сеть, 5xx после повторов, открытый breaker, не-JSON ответ: пакет мог
+                # быть частично принят, одиночные POST создали бы дубли
+                error_msg = f"Ошибка пакетного создания: {e}"
+                logger.error(f"❌ {error_msg}")
+                return [APIResponse(success=False, message=error_msg) for _ in batch]
+        
+        responses = []
+        for product in batch:
+            try:
+                responses.append(await self.create_product(product))
+            except Exception as e:
+                responses.append(APIResponse(success=False, message=str(e)))
+        return responses
+    
+    def _map_bulk_results(self, batch: List[Product], items: List[Any]) -> List[APIResponse]:
+        """
+        Сопоставляет результаты пакета с товарами.
+        
+        Результат с external_id товара относится к нему, где бы ни стоял.
+        Остальные результаты (без external_id или с незнакомым) по порядку
+        достаются товарам, для которых своего результата нет.
+        """
+        source_ids = {product.source_id for product in batch if product.source_id}
+        by_external_id: Dict[str, Any] = {}
+        positional = []
+        for item in items:
+            external_id = item.get('external_id') if isinstance(item, dict) else None
+            if external_id is not None and str(external_id) in source_ids:
+                by_external_id.setdefault(str(external_id), item)
             else:
-                logger.warning(f"⚠️ Товар создан с предупреждениями: {api_response.message}")
+                positional.append(item)
+        positional_items = iter(positional)
+        
+        responses = []
+        for product in batch:
+            item = by_external_id.get(product.source_id) if product.source_id else None
+            if item is None:
+                item = next(positional_items, {'success': False, 'message': "Нет результата для товара"})
+            if not isinstance(item, dict):
+                item = {'success': False, 'message': f"Неожиданный результат: {item}"}
+            responses.append(self._apply_create_result(product, item))
+        return responses
+    
+    @RETRY_DECORATOR
+    async def update_product_fields(self, api_product_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        Частично обновляет товар на вашем сервере через PATCH запрос.
+        
+        Args:
+            api_product_id: ID товара на вашем API
+            fields: Только измененные поля (price, old_price, in_stock)
             
-            return api_response
+        Returns:
+            True если API подтвердило обновление
+        """
+        logger.debug(f"📤 Обновление товара {api_product_id}: {fields}")
+        
+        response = await self._api_request(
+            'PATCH',
+            self.config.product_api_url(api_product_id),
+            headers=self.config.api_headers,
+            json=fields
+        )
+        
+        response.raise_for_status()
+        
+        result = response.json() if response.content else {}
+        return bool(result.get('success', True))
+    
+    async def deactivate_products(self, api_product_ids: List[str]) -> List[str]:
+        """
+        Деактивирует товары на API пакетами по BULK_BATCH_SIZE.
+        
+        Если сервер не поддерживает пакетную деактивацию, товары
+        деактивируются по одному через PATCH {"active": false}.
+        
+        Returns:
+            ID товаров, деактивацию которых подтвердило API
+        """
+        done: List[str] = []
+        batch_size = self.config.BULK_BATCH_SIZE
+        batch_supported = True
+        
+        for i in range(0, len(api_product_ids), batch_size):
+            batch = api_product_ids[i:i + batch_size]
+            
+            if batch_supported:
+                try:
+                    response = await self._send_deactivate(batch)
+                    if response.status_code not in BULK_REJECT_STATUSES:
+                        response.raise_for_status()
+                        done.extend(batch)
+                        continue
+                    logger.warning(
+                        f"⚠️ Пакетная деактивация отклонена (HTTP {response.status_code}), "
+                        f"товары деактивируются по одному"
+                    )
+                    batch_supported = False
+                except Exception as e:
+                    logger.error(f"❌ Ошибка деактивации пакета из {len(batch)} товаров: {e}")
+                    continue
+            
+            for api_product_id in batch:
+                try:
+                    if await self.update_product_fields(api_product_id, {"active": False}):
+                        done.append(api_product_id)
+                except Exception as e:
+                    logger.error(f"❌ Ошибка деактивации товара {api_product_id}: {e}")
+        
+        return done
+    
+    @RETRY_DECORATOR
+    async def _send_deactivate(self, api_product_ids: List[str]) -> httpx.Response:
+        """POST пакета ID на деактивацию (retry только на сетевые ошибки и 5xx)."""
+        response = await self._api_request(
+            'POST',
+            self.config.products_deactivate_url,
+            headers=self.config.api_headers,
+            json={"ids": api_product_ids}
+        )
+        if response.status_code >= 500 and response.status_code not in BULK_REJECT_STATUSES:
+            response.raise_for_status()
+        return response
     
     async def process_product(self, product: Product) -> bool:
         """
         Полный цикл обработки товара:
-        1. Загрузка изображений
-        2. Создание товара на сервере
+        1. Параллельная загрузка изображений
+        2. Создание товара на сервере - сразу после главного изображения
+           (DEFER_SECONDARY_IMAGES), остальные прикрепляются через PATCH
         
         Args:
             product: Объект товара
@@ -334,39 +1129,75 @@ class APIClient:
         Returns:
             True если успешно, False если ошибка
         """
-        try:
-            logger.info(f"🔄 Обработка товара: {product.title[:50]}...")
-            
-            # Шаг 1: Загружаем изображения
-            if product.images:
-                logger.info(f"   📸 Загрузка {len(product.images)} изображений...")
-                uploaded_urls = await self.process_product_images(product)
+        with TRACER.product(product.source_url, 'upload_product', images=len(product.images)):
+            tasks: List[asyncio.Task] = []
+            try:
+                logger.info(f"🔄 Обработка товара: {product.title[:50]}...")
+                
+                # Шаг 1: Запускаем загрузку всех изображений
+                if product.images:
+                    logger.info(f"   📸 Загрузка {len(product.images)} изображений...")
+                    tasks = self._start_image_tasks(product)
+                
+                defer = self.config.DEFER_SECONDARY_IMAGES and len(tasks) > 1
+                
+                # Шаг 2: Создаем товар (с главным изображением или со всеми)
+                if defer:
+                    primary_idx = product.primary_image_index
+                    await tasks[primary_idx]
+                    api_response = await self.create_product(product, [product.images[primary_idx]])
+                else:
+                    uploaded_urls = [url for url in await asyncio.gather(*tasks) if url]
+                    if tasks and not uploaded_urls:
+                        logger.warning(f"⚠️ Ни одно изображение не загружено для товара")
+                    api_response = await self.create_product(product)
+                
+                if not api_response.success:
+                    error_msg = f"API вернуло ошибку: {api_response.message or api_response.errors}"
+                    product.errors.append(error_msg)
+                    logger.error(f"❌ {error_msg}")
+                    return False
+                
+                # Шаг 3: Прикрепляем остальные изображения
+                if defer:
+                    await self._attach_images(product, tasks)
                 
-                if not uploaded_urls:
-                    logger.warning(f"⚠️ Ни одно изображение не загружено для товара")
-            
-            # Шаг 2: Создаем товар
-            api_response = await self.create_product(product)
-            
-            if api_response.success:
                 logger.info(f"✅ Товар успешно обработан: {product.title[:50]}...")
                 return True
-            else:
-                error_msg = f"API вернуло ошибку: {api_response.message or api_response.errors}"
+                    
+            except Exception as e:
+                error_msg = f"Ошибка обработки товара: {str(e)}"
                 product.errors.append(error_msg)
                 logger.error(f"❌ {error_msg}")
                 return False
-                
+            finally:
+                for task in tasks:
+                    task.cancel()
+    
+    async def _attach_images(self, product: Product, tasks: List[asyncio.Task]):
+        """Дожидается остальных изображений и отправляет полный список через PATCH."""
+        uploaded_urls = [url for url in await asyncio.gather(*tasks) if url]
+        if not uploaded_urls:
+            logger.warning(f"⚠️ Ни одно изображение не загружено для товара")
+        
+        if not product.api_product_id:
+            return
+        
+        try:
+            await self.update_product_fields(
+                product.api_product_id, {"images": product.images_payload()}
+            )
         except Exception as e:
-            error_msg = f"Ошибка обработки товара: {str(e)}"
+            # Товар уже создан с главным изображением - не считаем его ошибкой
+            error_msg = f"Не удалось прикрепить изображения: {str(e)}"
             product.errors.append(error_msg)
-            logger.error(f"❌ {error_msg}")
-            return False
+            logger.warning(f"⚠️ {error_msg}")
     
     async def process_products_batch(
         self, 
         products: List[Product],
-        progress_callback=None
+        progress_callback=None,
+        result_callback: Optional[Callable[[Product, bool], None]] = None
     ) -> tuple[int, int]:
         """
         Обрабатывает батч товаров с ограничением concurrency.
@@ -374,15 +1205,21 @@ class APIClient:
         Args:
             products: Список товаров
             progress_callback: Callback для обновления прогресса
+            result_callback: Callback (товар, успех) сразу после обработки товара
             
         Returns:
             Кортеж (успешно, ошибок)
         """
+        if self.bulk_supported:
+            return await self._process_products_bulk(products, progress_callback, result_callback)
+        
         success_count = 0
         error_count = 0
         
         async def process_with_limit(product: Product) -> bool:
             result = await self.process_product(product)
+            if result_callback:
+                result_callback(product, result)
             if progress_callback:
                 progress_callback()
             return result
@@ -405,6 +1242,90 @@ class APIClient:
         
         return success_count, error_count
     
+    async def _process_products_bulk(
+        self,
+        products: List[Product],
+        progress_callback=None,
+        result_callback: Optional[Callable[[Product, bool], None]] = None
+    ) -> tuple[int, int]:
+        """
+        Пакетный режим: товары идут порциями по BULK_BATCH_SIZE.
+        
+        Пока порция создается пакетом (все изображения - сразу в payload),
+        загружаются изображения следующей. Параллельность загрузок ограничена
+        бюджетами download/upload, в памяти не больше двух порций, а
+        созданные товары сразу уходят в result_callback (хранилище состояния).
+        """
+        if not products:
+            return 0, 0
+        
+        logger.info(f"📦 Пакетное создание: {len(products)} товаров")
+        size = self.config.BULK_BATCH_SIZE
+        chunks = [products[i:i + size] for i in range(0, len(products), size)]
+        
+        async def upload_images(chunk: List[Product]):
+            # Ошибка одного товара не должна срывать изображения всей порции
+            results = await asyncio.gather(
+                *(self.process_product_images(p) for p in chunk), return_exceptions=True
+            )
+            for product, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    error_msg = f"Ошибка загрузки изображений: {result}"
+                    logger.warning(f"⚠️ {error_msg}")
+                    product.errors.append(error_msg)
+        
+        success_count = 0
+        error_count = 0
+        next_images = asyncio.create_task(upload_images(chunks[0]))
+        try:
+            for idx, chunk in enumerate(chunks):
+                await next_images
+                if idx + 1 < len(chunks):
+                    next_images = asyncio.create_task(upload_images(chunks[idx + 1]))
+                
+                succeeded, failed = await self._create_bulk_chunk(chunk, progress_callback, result_callback)
+                success_count += succeeded
+                error_count += failed
+        finally:
+            # Незавершенные загрузки следующей порции отменяем и дожидаемся
+            next_images.cancel()
+            await asyncio.gather(next_images, return_exceptions=True)
+        
+        return success_count, error_count
+    
+    async def _create_bulk_chunk(
+        self,
+        chunk: List[Product],
+        progress_callback=None,
+        result_callback: Optional[Callable[[Product, bool], None]] = None
+    ) -> tuple[int, int]:
+        """Создает порцию товаров с загруженными изображениями."""
+        started = time.monotonic()
+        api_responses = await self.create_products_bulk(chunk)
+        ended = time.monotonic()
+        for product in chunk:
+            TRACER.record_for(product.source_url, 'create_products_bulk', started, ended, batch=len(chunk))
+        
+        success_count = 0
+        error_count = 0
+        for product, api_response in zip(chunk, api_responses):
+            success = api_response.success and product.uploaded_to_api
+            if not success:
+                error_msg = f"API вернуло ошибку: {api_response.message or api_response.errors}"
+                product.errors.append(error_msg)
+                logger.error(f"❌ {error_msg}")
+            
+            if success:
+                success_count += 1
+            else:
+                error_count += 1
+            if result_callback:
+                result_callback(product, success)
+            if progress_callback:
+                progress_callback()
+        
+        return success_count, error_count
+    
     # ========================================
     # Health Check
     # ========================================
@@ -0,0 +1,125 @@
+# ============================================
+# Fix-Price ETL Pipeline - Parser Benchmark
+# ============================================
+"""
+Микро-бенчмарк разбора HTML по бэкендам.
+
+Меряет время на страницу для parse_product / parse_listing на каждом
+доступном бэкенде и проверяет, что результаты совпадают.
+
+Запуск:
+    python bench_parsers.py                          # синтетические страницы
+    python bench_parsers.py page1.html page2.html    # сохраненные страницы товаров
+    python bench_parsers.py --runs 200 --listing listing.html
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import html_parsing
+from extraction_plan import available_backends
+
+
+BASE_URL = 'https://fix-price.com'
+
+
+def synthetic_product_page(specs: int = 40, images: int = 8, filler: int = 300) -> str:
+    """Страница товара без JSON-LD (полный CSS путь) с типичным объемом разметки."""
+    rows = ''.join(
+        f'<tr><td>Характеристика {i}</td><td>Значение {i}</td></tr>' for i in range(specs)
+    )
+    gallery = ''.join(
+        f'<div class="swiper-slide"><img data-src="/resize/600x600/upload/img_{i}.jpg"></div>'
+        for i in range(images)
+    )
+    noise = ''.join(
+        f'<div class="block-{i}"><span>Текст {i}</span><a href="/catalog/cat-{i}/">Ссылка</a></div>'
+        for i in range(filler)
+    )
+    return (
+        '<html><body>'
+        '<div class="breadcrumbs"><a href="/">Главная</a><a href="/catalog/home/">Для дома</a></div>'
+        '<div class="product-detail"><h1>Контейнер пищевой 1 л</h1>'
+        '<div class="price-current">99,00 ₽</div><div class="price-old">129 ₽</div>'
+        '<div class="sku">1234567</div>'
+        '<div class="product-description">Описание товара</div>'
+        f'<div class="product-gallery">{gallery}</div>'
+        '<table class="product-specs">'
+        '<tr><td>Бренд</td><td>FixPrice</td></tr><tr><td>Вес</td><td>150 г</td></tr>'
+        f'{rows}</table></div>{noise}</body></html>'
+    )
+
+
+def synthetic_listing_page(products: int = 24, filler: int = 300) -> str:
+    cards = ''.join(
+        f'<div class="product-card"><a class="product-link" href="/catalog/home/product/p-{i}">'
+        f'<span class="product-title">Товар {i}</span></a><span class="price">{i} ₽</span></div>'
+        for i in range(products)
+    )
+    noise = ''.join(f'<div class="block-{i}"><span>Текст {i}</span></div>' for i in range(filler))
+    return f'<html><body>{cards}<a rel="next" href="?page=2">Далее</a>{noise}</body></html>'
+
+
+def bench(func: Callable[[], object], runs: int) -> Dict[str, float]:
+    """Время одного вызова в миллисекундах (после прогрева)."""
+    func()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'mean_ms': statistics.fmean(timings),
+        'p50_ms': timings[len(timings) // 2],
+        'p99_ms': timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def run(pages: List[str], listing: str, runs: int):
+    backends = available_backends()
+    print(f"Бэкенды: {', '.join(backends)} | прогонов: {runs} | страниц товаров: {len(pages)}\n")
+    print(f"{'бэкенд':<12} {'операция':<16} {'mean, мс':>10} {'p50, мс':>10} {'p99, мс':>10}")
+
+    reference: Dict[str, object] = {}
+    for backend in backends:
+        cases = {
+            'parse_product': lambda: [
+                html_parsing.parse_product(page, f'{BASE_URL}/catalog/p', backend) for page in pages
+            ],
+            'parse_listing': lambda: html_parsing.parse_listing(listing, BASE_URL, backend),
+        }
+        for name, func in cases.items():
+            result = func()
+            if name in reference and reference[name] != result:
+                print(f"⚠️ {backend}: результат {name} отличается от {backends[0]}")
+            reference.setdefault(name, result)
+
+            stats = bench(func, runs)
+            per_page = len(pages) if name == 'parse_product' else 1
+            print(
+                f"{backend:<12} {name:<16} "
+                f"{stats['mean_ms'] / per_page:>10.3f} "
+                f"{stats['p50_ms'] / per_page:>10.3f} "
+                f"{stats['p99_ms'] / per_page:>10.3f}"
+            )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Бенчмарк HTML бэкендов парсинга')
+    parser.add_argument('pages', nargs='*', help='Сохраненные HTML страницы товаров')
+    parser.add_argument('--listing', help='Сохраненная HTML страница листинга')
+    parser.add_argument('--runs', type=int, default=50, help='Количество прогонов')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    product_pages = [Path(p).read_text(encoding='utf-8') for p in args.pages] or [synthetic_product_page()]
+    listing_page = (
+        Path(args.listing).read_text(encoding='utf-8') if args.listing else synthetic_listing_page()
+    )
+    run(product_pages, listing_page, args.runs)
@@ -0,0 +1,546 @@
+# ============================================
+# Fix-Price ETL Pipeline - End-to-End Benchmark
+# ============================================
+"""
+Офлайн бенчмарк pipeline целиком: локальный fake fix-price и fake API.
+
+В отдельном процессе поднимаются два aiohttp сервера с настраиваемой
+задержкой, разбросом и долей ошибок (503):
+
+    сайт    /catalog, /catalog/cat-N?page=K, /catalog/cat-N/product/ID,
+            изображения /upload/... (на хосте localhost - свой бюджет
+            запросов, как у CDN)
+    API     /api/v1/products, /products/bulk, /products/deactivate,
+            PATCH /products/{id}, /media/upload (как server/index.js)
+
+FixPriceETLPipeline запускается против них во временном каталоге (чистые
+state/, кэш изображений и output/), а результат - товаров в секунду,
+p50/p99 по этапам (metrics.py), CPU и пиковый RSS - пишется в JSON, который
+можно сравнивать между коммитами.
+
+Запуск:
+    python bench_pipeline.py                                 # 4 категории x 48 товаров
+    python bench_pipeline.py --categories 10 --products 96 --streaming
+    python bench_pipeline.py --site-latency-ms 120 --site-error-rate 0.02
+    python bench_pipeline.py --product-html saved/*.html     # сохраненные страницы товаров
+    python bench_pipeline.py --compare bench_results/a.json bench_results/b.json
+
+Остальные настройки pipeline берутся из окружения, как обычно
+(PARSE_WORKERS_MODE=thread python bench_pipeline.py ...). По умолчанию
+бенчмарк снимает CRAWL_RATE_LIMIT (0) и выводит только предупреждения;
+URL источника и API, пути state/ и кэша всегда указывают на fake серверы
+и временный каталог. Нужен установленный браузер Playwright.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = PACKAGE_DIR / 'bench_results'
+
+# Товаров на странице листинга fake сайта (pipeline считает страницы по 24)
+PAGE_SIZE = 24
+# Ссылки на реальный сайт и CDN в сохраненных страницах
+REAL_ORIGIN_RE = re.compile(r'https?://(?:[\w-]+\.)*fix-price\.(?:com|ru)')
+
+# Метрики для --compare: путь в результате и "больше - лучше"
+COMPARE_KEYS = (
+    ('throughput.products_per_sec', True),
+    ('throughput.wall_s', False),
+    ('resources.cpu_total_s', False),
+    ('resources.rss_peak_mb', False),
+    ('resources.children_rss_peak_mb', False),
+)
+
+
+@dataclasses.dataclass
+class Conditions:
+    """Условия ответа fake сервера."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+
+@dataclasses.dataclass
+class Scenario:
+    """Параметры fake каталога и серверов."""
+    categories: int = 4
+    products: int = 48
+    images: int = 3
+    image_kb: int = 40
+    browser_share: float = 0.0
+    seed: int = 1
+    site: Conditions = dataclasses.field(default_factory=Conditions)
+    api: Conditions = dataclasses.field(default_factory=Conditions)
+    product_html: List[str] = dataclasses.field(default_factory=list)
+
+
+# ========================================
+# Fake fix-price
+# ========================================
+
+def product_id(category: int, index: int) -> int:
+    return 100000 + category * 10000 + index
+
+
+def catalog_page(scenario: Scenario) -> str:
+    links = ''.join(
+        f'<div class="category-item"><a href="/catalog/cat-{i}">Категория {i}</a></div>'
+        for i in range(scenario.categories)
+    )
+    return f'<html><body><main><div class="catalog-categories">{links}</div></main></body></html>'
+
+
+def listing_page(scenario: Scenario, category: int, page: int) -> str:
+    last_page = max(1, -(-scenario.products // PAGE_SIZE))
+    start = (page - 1) * PAGE_SIZE
+    cards = ''.join(
+        f'<div class="product-card" data-product-id="{product_id(category, i)}">'
+        f'<a class="product-link" href="/catalog/cat-{category}/product/{product_id(category, i)}">'
+        f'<span class="product-title">Товар {product_id(category, i)}</span></a>'
+        f'<span class="price">{99 + i % 50} ₽</span></div>'
+        for i in range(start, min(start + PAGE_SIZE, scenario.products))
+    )
+    pagination = ''.join(f'<a href="?page={n}">{n}</a>' for n in range(1, last_page + 1))
+    next_link = f'<a rel="next" href="?page={page + 1}">Далее</a>' if page < last_page else ''
+    return (
+        f'<html><body><main>{cards}</main>'
+        f'<div class="pagination">{pagination}{next_link}</div></body></html>'
+    )
+
+
+def product_page(scenario: Scenario, category: int, pid: int, image_origin: str) -> str:
+    """Страница товара; доля browser_share рисует цену скриптом (HTTP путь не справится)."""
+    rng = random.Random(pid * 7919 + scenario.seed)
+    price = f'{rng.randint(29, 499)},00 ₽'
+    needs_browser = rng.random() < scenario.browser_share
+    price_html = (
+        '<div class="price-current"></div>'
+        f"<script>document.querySelector('.price-current').textContent = '{price}'</script>"
+        if needs_browser else f'<div class="price-current">{price}</div>'
+    )
+    gallery = ''.join(
+        f'<div class="swiper-slide"><img data-src="{image_origin}/upload/resize/600x600/{pid}_{k}.jpg"></div>'
+        for k in range(scenario.images)
+    )
+    rows = ''.join(
+        f'<tr><td>Характеристика {k}</td><td>Значение {rng.randint(1, 100)}</td></tr>' for k in range(20)
+    )
+    noise = ''.join(f'<div class="block-{k}"><span>Текст {k}</span></div>' for k in range(200))
+    return (
+        '<html><body>'
+        f'<div class="breadcrumbs"><a href="/">Главная</a><a href="/catalog/cat-{category}">Категория {category}</a></div>'
+        f'<div class="product-detail"><h1>Товар {pid}</h1>{price_html}'
+        f'<div class="product-description">Описание товара {pid}</div>'
+        f'<div class="product-gallery">{gallery}</div>'
+        f'<table class="product-specs"><tr><td>Бренд</td><td>FixPrice</td></tr>{rows}</table>'
+        f'</div>{noise}</body></html>'
+    )
+
+
+def image_bytes(name: str, size_kb: int) -> bytes:
+    """Детерминированное "изображение" заданного размера (уникальное для имени)."""
+    seed = name.encode('utf-8')
+    return (seed * (size_kb * 1024 // max(1, len(seed)) + 1))[:size_kb * 1024]
+
+
+async def respond(conditions: Conditions, rng: random.Random) -> Optional[web.Response]:
+    """Задержка ответа; 503 с вероятностью error_rate."""
+    delay = conditions.latency_ms + rng.uniform(-conditions.jitter_ms, conditions.jitter_ms)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if rng.random() < conditions.error_rate:
+        return web.Response(status=503, text='fake outage')
+    return None
+
+
+def build_site_app(scenario: Scenario, image_origin: str) -> web.Application:
+    rng = random.Random(scenario.seed)
+    recorded = [Path(path).read_text(encoding='utf-8') for path in scenario.product_html]
+    recorded = [REAL_ORIGIN_RE.sub(image_origin, html) for html in recorded]
+    cache: Dict[Tuple[int, int], str] = {}
+
+    def html(text: str) -> web.Response:
+        return web.Response(text=text, content_type='text/html')
+
+    async def catalog(request: web.Request) -> web.Response:
+        return await respond(scenario.site, rng) or html(catalog_page(scenario))
+
+    async def listing(request: web.Request) -> web.Response:
+        category = int(request.match_info['category'])
+        page = int(request.query.get('page', '1'))
+        if category >= scenario.categories:
+            raise web.HTTPNotFound()
+        return await respond(scenario.site, rng) or html(listing_page(scenario, category, page))
+
+    async def product(request: web.Request) -> web.Response:
+        error = await respond(scenario.site, rng)
+        if error:
+            return error
+        category, pid = int(request.match_info['category']), int(request.match_info['pid'])
+        if recorded:
+            return html(recorded[pid % len(recorded)])
+        if (category, pid) not in cache:
+            cache[(category, pid)] = product_page(scenario, category, pid, image_origin)
+        return html(cache[(category, pid)])
+
+    async def image(request: web.Request) -> web.Response:
+        return await respond(scenario.site, rng) or web.Response(
+            body=image_bytes(request.path, scenario.image_kb), content_type='image/jpeg'
+        )
+
+    app = web.Application()
+    app.router.add_get('/catalog', catalog)
+    app.router.add_get(r'/catalog/cat-{category:\d+}', listing)
+    app.router.add_get(r'/catalog/cat-{category:\d+}/product/{pid:\d+}', product)
+    app.router.add_get('/upload/{name:.+}', image)
+    return app
+
+
+# ========================================
+# Fake destination API
+# ========================================
+
+def build_api_app(scenario: Scenario) -> web.Application:
+    """Стенд API как в server/index.js (/api/v1), со счетчиками запросов."""
+    rng = random.Random(scenario.seed + 1)
+    stats = {'products': 0, 'bulk_products': 0, 'patches': 0, 'deactivated': 0, 'uploads': 0, 'upload_bytes': 0}
+
+    async def root(request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok', 'version': '1.0'})
+
+    async def create(request: web.Request) -> web.Response:
+        error = await respond(scenario.api, rng)
+        if error:
+            return error
+        product = await request.json()
+        stats['products'] += 1
+        return web.json_response({'success': True, 'id': product.get('external_id') or 'new_id'})
+
+    async def bulk(request: web.Request) -> web.Response:
+        error = await respond(scenario.api, rng)
+        if error:
+            return error
+        body = await request.text()
+        if request.content_type == 'application/x-ndjson':
+            products = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            products = json.loads(body)
+        stats['bulk_products'] += len(products)
+        return web.json_response({
+            'success': True,
+            'results': [
+                {'success': True, 'id': p.get('external_id') or f'new_id_{i}', 'external_id': p.get('external_id')}
+                for i, p in enumerate(products)
+            ],
+        })
+
+    async def deactivate(request: web.Request) -> web.Response:
+        error = await respond(scenario.api, rng)
+        if error:
+            return error
+        ids = (await request.json()).get('ids') or []
+        stats['deactivated'] += len(ids)
+        return web.json_response({'success': True, 'deactivated': len(ids)})
+
+    async def patch(request: web.Request) -> web.Response:
+        error = await respond(scenario.api, rng)
+        if error:
+            return error
+        fields = await request.json()
+        stats['patches'] += 1
+        return web.json_response({
+            'success': True, 'id': request.match_info['id'], 'updated_fields': list(fields),
+        })
+
+    async def upload(request: web.Request) -> web.Response:
+        error = await respond(scenario.api, rng)
+        if error:
+            return error
+        body = await request.read()
+        stats['uploads'] += 1
+        stats['upload_bytes'] += len(body)
+        return web.json_response({'success': True, 'url': f"https://media.test/{stats['uploads']}.jpg"})
+
+    async def bench_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application(client_max_size=64 * 1024 ** 2)
+    app.router.add_get('/api/v1', root)
+    app.router.add_post('/api/v1/products', create)
+    app.router.add_post('/api/v1/products/bulk', bulk)
+    app.router.add_post('/api/v1/products/deactivate', deactivate)
+    app.router.add_patch('/api/v1/products/{id}', patch)
+    app.router.add_post('/api/v1/media/upload', upload)
+    app.router.add_get('/__bench/stats', bench_stats)
+    return app
+
+
+def serve_fakes(scenario: Scenario, ports: 'multiprocessing.Queue'):
+    """Процесс fake серверов: сайт и API на свободных портах."""
+    site_sock = socket.create_server(('127.0.0.1', 0))
+    api_sock = socket.create_server(('127.0.0.1', 0))
+    site_port, api_port = site_sock.getsockname()[1], api_sock.getsockname()[1]
+    # Изображения - на хосте localhost того же сервера, как отдельный CDN
+    image_origin = f'http://localhost:{site_port}'
+
+    async def main():
+        for app, sock in (
+            (build_site_app(scenario, image_origin), site_sock),
+            (build_api_app(scenario), api_sock),
+        ):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            await web.SockSite(runner, sock).start()
+        ports.put((site_port, api_port))
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+# ========================================
+# Pipeline run
+# ========================================
+
+def configure_env(site_url: str, api_url: str, workdir: Path, scenario: Scenario, sample_percent: int, streaming: bool):
+    """Окружение pipeline: fake серверы и временный каталог (остальное - как задано)."""
+    os.environ.update({
+        'FIX_PRICE_BASE_URL': site_url,
+        'FIX_PRICE_CATALOG_URL': f'{site_url}/catalog',
+        'MY_API_URL': api_url,
+        'API_TOKEN': 'bench',
+        'STATE_DB_PATH': str(workdir / 'state' / 'run_state.sqlite'),
+        'CATALOG_INDEX_PATH': str(workdir / 'state' / 'catalog_index.sqlite'),
+        'FETCH_STATS_PATH': str(workdir / 'state' / 'fetch_path_stats.json'),
+        'IMAGE_CACHE_DIR': str(workdir / 'state' / 'image_cache'),
+        'PRODUCT_SAMPLE_PERCENT': str(sample_percent),
+        'STREAMING_MODE': 'true' if streaming else 'false',
+        'METRICS_TEXTFILE': '',
+        'METRICS_PORT': '0',
+        'TRACE_FILE': '',
+    })
+    os.environ.setdefault('CRAWL_RATE_LIMIT', '0')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+
+async def drive_pipeline(scenario: Scenario) -> Tuple[Dict[str, Any], Dict[str, Any], float]:
+    """Прогон FixPriceETLPipeline: (статистика запуска, конфигурация, длительность)."""
+    from config import init_config
+    from pipeline import FixPriceETLPipeline
+
+    config = init_config()
+    started = time.monotonic()
+    async with FixPriceETLPipeline(config) as pipeline:
+        run = pipeline.run_streaming_pipeline if config.STREAMING_MODE else pipeline.run_full_pipeline
+        await run(categories_limit=None, max_products_per_category=scenario.products)
+    wall = time.monotonic() - started
+
+    settings = {key: value for key, value in dataclasses.asdict(config).items() if key != 'API_TOKEN'}
+    return pipeline.stats.model_dump(mode='json'), settings, wall
+
+
+def stage_latencies() -> Dict[str, Dict[str, float]]:
+    """p50/p95/p99 по этапам (все хосты вместе) из метрик процесса."""
+    from metrics import METRICS
+
+    stages = {stage: hist.summary() for stage, hist in METRICS.merged('stage_seconds', 'stage').items()}
+    stages.update({
+        f"slot_wait:{limiter}": hist.summary()
+        for limiter, hist in METRICS.merged('slot_wait_seconds', 'limiter').items()
+    })
+    return dict(sorted(stages.items()))
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ['git', *args], cwd=PACKAGE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {'commit': git('rev-parse', '--short', 'HEAD'), 'dirty': bool(git('status', '--porcelain', '.'))}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+
+
+def run_benchmark(scenario: Scenario, sample_percent: int, streaming: bool, keep: bool) -> Dict[str, Any]:
+    """Поднимает fake серверы, прогоняет pipeline и собирает результат."""
+    context = multiprocessing.get_context('spawn')
+    ports = context.Queue()
+    server = context.Process(target=serve_fakes, args=(scenario, ports), daemon=True)
+    server.start()
+    site_port, api_port = ports.get(timeout=60)
+    api_url = f'http://127.0.0.1:{api_port}/api/v1'
+
+    workdir = Path(tempfile.mkdtemp(prefix='fixprice_bench_'))
+    cwd = os.getcwd()
+    configure_env(f'http://127.0.0.1:{site_port}', api_url, workdir, scenario, sample_percent, streaming)
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+
+    try:
+        # output/etl_results_*.json pipeline пишет в текущий каталог
+        os.chdir(workdir)
+        stats, settings, wall = asyncio.run(drive_pipeline(scenario))
+    finally:
+        os.chdir(cwd)
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # Воркеры парсинга и браузер уже завершены; fake серверы еще работают и не входят
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        with urllib.request.urlopen(f'http://127.0.0.1:{api_port}/__bench/stats', timeout=10) as response:
+            api_stats = json.load(response)
+        server.terminate()
+        server.join()
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    cpu_self = (usage.ru_utime - usage_before.ru_utime) + (usage.ru_stime - usage_before.ru_stime)
+    cpu_children = children.ru_utime + children.ru_stime
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'git': git_revision(),
+        'python': sys.version.split()[0],
+        'scenario': {**dataclasses.asdict(scenario), 'sample_percent': sample_percent, 'streaming': streaming},
+        'throughput': {
+            'wall_s': round(wall, 2),
+            'products_uploaded': stats['products_uploaded'],
+            'products_per_sec': round(stats['products_uploaded'] / wall, 2) if wall else 0.0,
+            'products_parsed_per_sec': round(stats['products_parsed'] / wall, 2) if wall else 0.0,
+        },
+        'stages': stage_latencies(),
+        'resources': {
+            'cpu_self_s': round(cpu_self, 2),
+            'cpu_children_s': round(cpu_children, 2),
+            'cpu_total_s': round(cpu_self + cpu_children, 2),
+            'cpu_utilization': round((cpu_self + cpu_children) / wall, 2) if wall else 0.0,
+            # ru_maxrss в Linux - KB
+            'rss_peak_mb': round(usage.ru_maxrss / 1024, 1),
+            'children_rss_peak_mb': round(children.ru_maxrss / 1024, 1),
+        },
+        'fake_api': api_stats,
+        'stats': stats,
+        'config': settings,
+        'workdir': str(workdir) if keep else None,
+    }
+
+
+# ========================================
+# Report
+# ========================================
+
+def print_report(result: Dict[str, Any]):
+    throughput, resources = result['throughput'], result['resources']
+    print(f"\nКоммит: {result['git']['commit']}{' (есть изменения)' if result['git']['dirty'] else ''}")
+    print(
+        f"Товаров загружено: {throughput['products_uploaded']} за {throughput['wall_s']} с "
+        f"-> {throughput['products_per_sec']} товаров/с"
+    )
+    print(
+        f"CPU: {resources['cpu_total_s']} с (pipeline {resources['cpu_self_s']}, "
+        f"дочерние {resources['cpu_children_s']}), RSS пик: {resources['rss_peak_mb']} MB "
+        f"(дочерние {resources['children_rss_peak_mb']} MB)\n"
+    )
+    print(f"{'этап':<24} {'count':>7} {'p50, мс':>10} {'p99, мс':>10} {'max, мс':>10}")
+    for stage, summary in result['stages'].items():
+        print(
+            f"{stage:<24} {summary['count']:>7} {summary['p50_ms']:>10.1f} "
+            f"{summary['p99_ms']:>10.1f} {summary['max_ms']:>10.1f}"
+        )
+
+
+def lookup(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(base_path: str, new_path: str):
+    """Сравнение двух результатов: ключевые показатели и p99 этапов."""
+    base = json.loads(Path(base_path).read_text(encoding='utf-8'))
+    new = json.loads(Path(new_path).read_text(encoding='utf-8'))
+    print(f"{base['git']['commit']} -> {new['git']['commit']}\n")
+    print(f"{'показатель':<36} {'было':>10} {'стало':>10} {'изменение':>10}")
+
+    rows = [(path, higher_is_better) for path, higher_is_better in COMPARE_KEYS]
+    rows += [(f'stages.{stage}.p99_ms', False) for stage in new.get('stages', {})]
+    for path, higher_is_better in rows:
+        old_value, new_value = lookup(base, path), lookup(new, path)
+        if old_value is None or new_value is None:
+            continue
+        delta = (new_value - old_value) / old_value * 100 if old_value else 0.0
+        better = delta > 0 if higher_is_better else delta < 0
+        mark = '' if abs(delta) < 5 else (' ✅' if better else ' ⚠️')
+        print(f"{path:<36} {old_value:>10} {new_value:>10} {delta:>+9.1f}%{mark}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Офлайн бенчмарк pipeline с fake сайтом и API')
+    parser.add_argument('--categories', type=int, default=4, help='Категорий в каталоге')
+    parser.add_argument('--products', type=int, default=48, help='Товаров в категории')
+    parser.add_argument('--images', type=int, default=3, help='Изображений у товара')
+    parser.add_argument('--image-kb', type=int, default=40, help='Размер изображения (KB)')
+    parser.add_argument('--browser-share', type=float, default=0.0,
+                        help='Доля страниц товаров, где цена рисуется скриптом (нужен браузер)')
+    parser.add_argument('--product-html', nargs='*', default=[],
+                        help='Сохраненные страницы товаров вместо синтетических')
+    parser.add_argument('--sample-percent', type=int, default=100, help='PRODUCT_SAMPLE_PERCENT')
+    parser.add_argument('--streaming', action='store_true', help='Потоковый режим (STREAMING_MODE)')
+    for side in ('site', 'api'):
+        parser.add_argument(f'--{side}-latency-ms', type=float, default=20.0, help=f'Задержка ответа ({side})')
+        parser.add_argument(f'--{side}-jitter-ms', type=float, default=10.0, help=f'Разброс задержки ({side})')
+        parser.add_argument(f'--{side}-error-rate', type=float, default=0.0, help=f'Доля ответов 503 ({side})')
+    parser.add_argument('--seed', type=int, default=1, help='Seed задержек, ошибок и данных')
+    parser.add_argument('--output', help='Файл результата (по умолчанию bench_results/pipeline_<коммит>_<время>.json)')
+    parser.add_argument('--keep', action='store_true', help='Не удалять временный каталог запуска')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='Сравнить два результата')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+
+    scenario = Scenario(
+        categories=args.categories,
+        products=args.products,
+        images=args.images,
+        image_kb=args.image_kb,
+        browser_share=args.browser_share,
+        seed=args.seed,
+        site=Conditions(args.site_latency_ms, args.site_jitter_ms, args.site_error_rate),
+        api=Conditions(args.api_latency_ms, args.api_jitter_ms, args.api_error_rate),
+        product_html=[str(Path(path).resolve()) for path in args.product_html],
+    )
+    result = run_benchmark(scenario, args.sample_percent, args.streaming, args.keep)
+    print_report(result)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"pipeline_{result['git']['commit'] or 'nogit'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\nРезультат: {output}")
@@ -0,0 +1,348 @@
+# ============================================
+# Fix-Price ETL Pipeline - Catalog Index
+# ============================================
+"""
+Персистентный индекс товаров, уже отправленных на API.
+
+В отличие от хранилища состояния запуска (state_store.py), индекс не
+очищается между запусками: он помнит для каждого товара источника
+(source_id) его ID на вашем API и последние отправленные цену и наличие.
+На нем работают режим обновления цен и дельта-синхронизация (SYNC_MODE):
+индекс хранит последний отправленный payload и его hash, изменения
+вычисляются локально, а на API уходят только измененные поля.
+
+Для инкрементального режима по каждому URL товара хранятся валидаторы
+HTTP кэша (ETag / Last-Modified), отпечаток отправленного payload и сам
+товар: страница с ответом 304 не парсится, а товар с прежним отпечатком
+не отправляется на API.
+
+source_id товара - его SKU (если он есть на странице), а в карточках
+листинга известен только URL. Поэтому для каждого товара хранится и ID из
+URL (url_id): по нему обновление цен и синхронизация находят товары индекса.
+"""
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from loguru import logger
+
+from models import Product
+from html_parsing import extract_product_id
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    source_id TEXT PRIMARY KEY,
+    api_product_id TEXT NOT NULL,
+    source_url TEXT,
+    price REAL,
+    old_price REAL,
+    in_stock INTEGER,
+    payload_hash TEXT,
+    payload_json TEXT,
+    image_sources TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    fingerprint TEXT,
+    api_product_id TEXT,
+    product_json TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# Колонки, добавленные после первой версии схемы (для существующих файлов индекса)
+PRODUCT_COLUMNS = {
+    'payload_hash': 'TEXT',
+    'payload_json': 'TEXT',
+    'image_sources': 'TEXT',
+    'active': 'INTEGER NOT NULL DEFAULT 1',
+    'url_id': 'TEXT',
+}
+
+
+class CatalogIndex:
+    """SQLite индекс source_id -> (api_product_id, последние отправленные значения)."""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> 'CatalogIndex':
+        """Открывает (или создает) файл индекса."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_products_url_id ON products(url_id)')
+        self.conn.commit()
+
+        logger.info(f"📇 Индекс каталога: {self.db_path} ({self.count()} товаров)")
+        return self
+
+    def close(self):
+        """Закрывает соединение с базой."""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def _migrate(self):
+        """Добавляет в таблицу products колонки, которых нет в старом файле индекса."""
+        existing = {row[1] for row in self.conn.execute('PRAGMA table_info(products)')}
+        for column, definition in PRODUCT_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f'ALTER TABLE products ADD COLUMN {column} {definition}')
+
+        # url_id для товаров, записанных до появления колонки
+        rows = self.conn.execute(
+            'SELECT source_id, source_url FROM products WHERE url_id IS NULL'
+        ).fetchall()
+        self.conn.executemany(
+            'UPDATE products SET url_id = ? WHERE source_id = ?',
+            [(self.url_id(source_url, source_id), source_id) for source_id, source_url in rows]
+        )
+
+    @staticmethod
+    def url_id(source_url: Optional[str], source_id: str) -> str:
+        """ID товара из URL (ключ карточек листинга), без URL - сам source_id."""
+        return extract_product_id(source_url) if source_url else source_id
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+    def record_product(self, product: Product):
+        """Запоминает товар, успешно созданный или обновленный на API."""
+        if not product.source_id or not product.api_product_id:
+            return
+        payload = self.stable_payload(product)
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO products '
+                '(source_id, api_product_id, source_url, url_id, price, old_price, in_stock, '
+                'payload_hash, payload_json, image_sources, active, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?) '
+                'ON CONFLICT(source_id) DO UPDATE SET '
+                'api_product_id = excluded.api_product_id, source_url = excluded.source_url, '
+                'url_id = excluded.url_id, '
+                'price = excluded.price, old_price = excluded.old_price, '
+                'in_stock = excluded.in_stock, payload_hash = excluded.payload_hash, '
+                'payload_json = excluded.payload_json, image_sources = excluded.image_sources, '
+                'active = 1, updated_at = excluded.updated_at',
+                (
+                    product.source_id,
+                    product.api_product_id,
+                    product.source_url,
+                    self.url_id(product.source_url, product.source_id),
+                    product.price,
+                    product.old_price,
+                    int(product.in_stock),
+                    self.payload_hash(payload),
+                    json.dumps(payload, ensure_ascii=False, default=str),
+                    json.dumps([img.original_url for img in product.images]),
+                    datetime.utcnow().isoformat()
+                )
+            )
+
+    def get(self, source_id: str) -> Optional[Dict[str, Any]]:
+        """Запись индекса по source_id (None, если товар на API не отправлялся)."""
+        row = self.conn.execute(
+            'SELECT source_id, api_product_id, price, old_price, in_stock FROM products '
+            'WHERE source_id = ?',
+            (source_id,)
+        ).fetchone()
+        return self._price_record(row)
+
+    def get_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """Запись индекса по URL товара (карточки листинга не знают SKU)."""
+        row = self.conn.execute(
+            'SELECT source_id, api_product_id, price, old_price, in_stock FROM products '
+            'WHERE url_id = ? ORDER BY updated_at DESC LIMIT 1',
+            (extract_product_id(url),)
+        ).fetchone()
+        return self._price_record(row)
+
+    @staticmethod
+    def _price_record(row: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        source_id, api_product_id, price, old_price, in_stock = row
+        return {
+            'source_id': source_id,
+            'api_product_id': api_product_id,
+            'price': price,
+            'old_price': old_price,
+            'in_stock': None if in_stock is None else bool(in_stock),
+        }
+
+    def record_price_update(self, source_id: str, fields: Dict[str, Any]):
+        """Сохраняет поля, успешно отправленные на API в режиме обновления цен."""
+        columns = {
+            'price': fields.get('price'),
+            'old_price': fields.get('old_price'),
+            'in_stock': None if 'in_stock' not in fields else int(fields['in_stock']),
+        }
+        assignments = [f'{column} = ?' for column in columns if column in fields]
+        if not assignments:
+            return
+        values = [value for column, value in columns.items() if column in fields]
+        
+        # Сохраненный payload тоже обновляем, иначе синхронизация отправит эти поля повторно
+        row = self.conn.execute(
+            'SELECT payload_json FROM products WHERE source_id = ?', (source_id,)
+        ).fetchone()
+        if row and row[0]:
+            payload = json.loads(row[0])
+            for key in ('price', 'old_price', 'in_stock'):
+                if key in fields:
+                    if fields[key] is None:
+                        payload.pop(key, None)
+                    else:
+                        payload[key] = fields[key]
+            assignments += ['payload_json = ?', 'payload_hash = ?']
+            values += [json.dumps(payload, ensure_ascii=False, default=str), self.payload_hash(payload)]
+        
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE products SET {', '.join(assignments)}, updated_at = ? WHERE source_id = ?",
+                (*values, datetime.utcnow().isoformat(), source_id)
+            )
+
+    # ========================================
+    # Delta sync (per source_id)
+    # ========================================
+
+    def get_synced(self, source_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Последний отправленный на API payload товара.
+
+        Returns:
+            Словарь {api_product_id, payload, payload_hash, image_sources, active}
+            или None, если товар не отправлялся (или индекс старше SYNC_MODE)
+        """
+        row = self.conn.execute(
+            'SELECT api_product_id, payload_json, payload_hash, image_sources, active '
+            'FROM products WHERE source_id = ? AND payload_json IS NOT NULL',
+            (source_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        api_product_id, payload_json, payload_hash, image_sources, active = row
+        return {
+            'api_product_id': api_product_id,
+            'payload': json.loads(payload_json),
+            'payload_hash': payload_hash,
+            'image_sources': json.loads(image_sources) if image_sources else [],
+            'active': bool(active),
+        }
+
+    def active_products(self) -> Dict[str, Tuple[str, str]]:
+        """Активные товары индекса: source_id -> (url_id, api_product_id)."""
+        return {
+            source_id: (url_id, api_product_id)
+            for source_id, url_id, api_product_id in self.conn.execute(
+                'SELECT source_id, url_id, api_product_id FROM products WHERE active = 1'
+            )
+        }
+
+    def mark_inactive(self, source_ids: List[str]):
+        """Отмечает товары деактивированными на API."""
+        now = datetime.utcnow().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE products SET active = 0, updated_at = ? WHERE source_id = ?',
+                [(now, source_id) for source_id in source_ids]
+            )
+
+    # ========================================
+    # Incremental crawl (per URL)
+    # ========================================
+
+    @staticmethod
+    def stable_payload(product: Product) -> Dict[str, Any]:
+        """Payload товара для API без времени парсинга (меняется каждый запуск)."""
+        payload = product.to_api_payload()
+        payload.get('metadata', {}).pop('parsed_at', None)
+        return payload
+
+    @staticmethod
+    def payload_hash(payload: Dict[str, Any]) -> str:
+        """SHA-256 канонического JSON payload."""
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def fingerprint(cls, product: Product) -> str:
+        """Отпечаток payload товара для API (без времени парсинга)."""
+        return cls.payload_hash(cls.stable_payload(product))
+
+    def get_validators(self, url: str) -> Dict[str, str]:
+        """
+        Заголовки условного GET для URL.
+
+        Пусто, если для URL нет сохраненного товара: ответ 304 без него
+        бесполезен, страницу все равно пришлось бы загрузить заново.
+        """
+        row = self.conn.execute(
+            'SELECT etag, last_modified FROM pages WHERE url = ? AND product_json IS NOT NULL',
+            (url,)
+        ).fetchone()
+        if row is None:
+            return {}
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def save_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Сохраняет ETag / Last-Modified из ответа 200."""
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO pages (url, etag, last_modified, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, '
+                'last_modified = excluded.last_modified, updated_at = excluded.updated_at',
+                (url, etag, last_modified, datetime.utcnow().isoformat())
+            )
+
+    def load_page_product(self, url: str) -> Optional[Product]:
+        """Товар, сохраненный для URL при последней загрузке на API."""
+        row = self.conn.execute(
+            'SELECT product_json FROM pages WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return Product.model_validate_json(row[0])
+
+    def unchanged_product_id(self, url: str, fingerprint: str) -> Optional[str]:
+        """ID товара на API, если отпечаток payload не изменился с прошлой загрузки."""
+        row = self.conn.execute(
+            'SELECT api_product_id FROM pages WHERE url = ? AND fingerprint = ?',
+            (url, fingerprint)
+        ).fetchone()
+        return row[0] if row else None
+
+    def record_page(self, url: str, fingerprint: str, product_json: str, api_product_id: Optional[str]):
+        """Запоминает отпечаток и товар после успешной загрузки на API."""
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO pages (url, fingerprint, api_product_id, product_json, updated_at) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET fingerprint = excluded.fingerprint, '
+                'api_product_id = excluded.api_product_id, product_json = excluded.product_json, '
+                'updated_at = excluded.updated_at',
+                (url, fingerprint, api_product_id, product_json, datetime.utcnow().isoformat())
+            )
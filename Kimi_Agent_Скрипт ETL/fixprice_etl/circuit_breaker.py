@@ -0,0 +1,236 @@
+# ============================================
+# Fix-Price ETL Pipeline - Circuit Breaker & Retry Budget
+# ============================================
+"""
+Защита от каскада ретраев, когда ваш API недоступен.
+
+Без нее при падении API каждая задача делает свои 3 попытки с backoff:
+тысячи задач одновременно спят и одновременно снова бьют в лежащий сервер.
+
+    CircuitBreaker (на каждый эндпоинт):
+        closed     -> запросы идут; CIRCUIT_FAILURE_THRESHOLD ошибок подряд -> open
+        open       -> новые запросы ждут в очереди (не падают)
+        half-open  -> через CIRCUIT_RECOVERY_SECONDS уходит один пробный запрос:
+                      успех -> closed (очередь продолжает работу), ошибка -> open
+
+    RetryBudget (общий): повторов не больше RETRY_BUDGET_PERCENT от числа
+        запросов (плюс небольшой резерв для редких ошибок)
+
+Ошибкой для breaker считаются ошибки транспорта (соединение, таймауты,
+сброс потока HTTP/2, прокси) и ответы 5xx; 4xx означают, что сервер жив. Простой API обходится во время простоя плюс
+несколько секунд, а не в часы backoff.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Union
+
+import httpx
+from loguru import logger
+
+from metrics import METRICS
+
+
+# Состояния breaker
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half-open'
+
+# Ошибки транспорта, которые говорят о недоступности сервера: соединение,
+# таймауты, обрыв протокола (RemoteProtocolError), прокси. Тот же набор
+# повторяет retry политика APIClient
+TRANSPORT_ERRORS = (httpx.TransportError,)
+
+
+class CircuitOpenError(Exception):
+    """Эндпоинт недоступен дольше CIRCUIT_MAX_WAIT_SECONDS - запрос не отправлен."""
+    pass
+
+
+class CallOutcome:
+    """Результат одного запроса через breaker (заполняется внутри guard())."""
+
+    def __init__(self):
+        self.failed: Optional[bool] = None
+
+    def record(self, status: int):
+        """Учитывает HTTP статус ответа: 5xx - ошибка, остальное - сервер жив."""
+        self.failed = status >= 500
+
+
+class CircuitBreaker:
+    """Breaker одного эндпоинта: closed -> open -> half-open -> closed."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 5.0,
+        max_wait: float = 300.0
+    ):
+        """
+        Args:
+            name: Имя эндпоинта для логов и статистики
+            failure_threshold: Ошибок подряд до размыкания
+            recovery_timeout: Через сколько секунд после размыкания пробовать снова
+            max_wait: Сколько запрос ждет в очереди, прежде чем упасть с CircuitOpenError
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.max_wait = max_wait
+
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._cond = asyncio.Condition()
+
+        self.stats: Dict[str, Union[int, float]] = {
+            'opened': 0,
+            'queued': 0,
+            'rejected': 0,
+            'wait_total_s': 0.0,
+        }
+        METRICS.set_gauge('circuit_open', 0, endpoint=name)
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[CallOutcome]:
+        """
+        Разрешение на один запрос.
+
+        Пока breaker разомкнут, ждет в очереди. Внутри блока статус ответа
+        передается в outcome.record(); ошибки транспорта (TRANSPORT_ERRORS),
+        вылетевшие из блока, считаются ошибкой автоматически.
+
+        Raises:
+            CircuitOpenError: Breaker не замкнулся за max_wait секунд
+        """
+        probe = await self._admit()
+        outcome = CallOutcome()
+        try:
+            yield outcome
+        except TRANSPORT_ERRORS:
+            outcome.failed = True
+            raise
+        finally:
+            await self._complete(probe, outcome.failed)
+
+    async def _admit(self) -> bool:
+        """Ждет разрешения; True - этот запрос пробный (half-open)."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        queued = False
+        probe = False
+
+        async with self._cond:
+            while True:
+                now = time.monotonic()
+                if self.state == STATE_OPEN and now >= self._opened_at + self.recovery_timeout:
+                    self.state = STATE_HALF_OPEN
+                    logger.info(f"🔌 {self.name}: пробный запрос (half-open)")
+
+                if self.state == STATE_CLOSED:
+                    break
+                if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                    self._probe_in_flight = probe = True
+                    break
+
+                if now >= deadline:
+                    self.stats['rejected'] += 1
+                    raise CircuitOpenError(
+                        f"{self.name}: API недоступен дольше {self.max_wait:.0f}с"
+                    )
+                if not queued:
+                    queued = True
+                    self.stats['queued'] += 1
+
+                timeout = deadline - now
+                if self.state == STATE_OPEN:
+                    timeout = min(timeout, self._opened_at + self.recovery_timeout - now)
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            if queued:
+                self.stats['wait_total_s'] += time.monotonic() - started
+            return probe
+
+    async def _complete(self, probe: bool, failed: Optional[bool]):
+        """Учитывает результат запроса (None - отменен или ошибка не про доступность)."""
+        async with self._cond:
+            if probe:
+                self._probe_in_flight = False
+
+            if failed is False:
+                self._failures = 0
+                if self.state != STATE_CLOSED:
+                    self.state = STATE_CLOSED
+                    METRICS.set_gauge('circuit_open', 0, endpoint=self.name)
+                    logger.info(f"🔌 {self.name}: API снова доступен (closed)")
+            elif failed:
+                self._failures += 1
+                reopen = probe and self.state == STATE_HALF_OPEN
+                if reopen or (self.state == STATE_CLOSED and self._failures >= self.failure_threshold):
+                    self._open()
+
+            self._cond.notify_all()
+
+    def _open(self):
+        self.state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self.stats['opened'] += 1
+        METRICS.set_gauge('circuit_open', 1, endpoint=self.name)
+        logger.warning(
+            f"🔌 {self.name}: {self._failures} ошибок подряд, запросы ждут "
+            f"{self.recovery_timeout:.0f}с (open)"
+        )
+
+    def snapshot(self) -> Dict[str, Union[str, int, float]]:
+        """Состояние breaker для статистики и метрик."""
+        return {
+            'state': self.state,
+            **self.stats,
+            'wait_total_s': round(self.stats['wait_total_s'], 2),
+        }
+
+
+class RetryBudget:
+    """
+    Общий бюджет повторов: не больше `percent` % от числа запросов.
+
+    Каждый запрос добавляет в бюджет percent/100 повтора, каждый повтор
+    списывает один. Баланс не больше резерва, поэтому накопить повторы за
+    спокойный период и потратить их разом при падении API нельзя.
+    """
+
+    def __init__(self, percent: float = 10.0, reserve: int = 10):
+        """
+        Args:
+            percent: Доля повторов от числа запросов
+            reserve: Начальный и максимальный баланс повторов
+        """
+        self.ratio = percent / 100.0
+        self.reserve = max(1, reserve)
+        self._balance = float(self.reserve)
+        self.stats: Dict[str, int] = {'requests': 0, 'retries': 0, 'denied': 0}
+
+    def record_request(self):
+        """Учитывает отправленный запрос."""
+        self.stats['requests'] += 1
+        self._balance = min(float(self.reserve), self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Можно ли сделать повтор (списывает его из бюджета)."""
+        if self._balance >= 1.0:
+            self._balance -= 1.0
+            self.stats['retries'] += 1
+            return True
+        self.stats['denied'] += 1
+        return False
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        """Состояние бюджета для статистики и метрик."""
+        return {**self.stats, 'balance': round(self._balance, 2)}
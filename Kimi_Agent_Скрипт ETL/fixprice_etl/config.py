@@ -5,9 +5,12 @@
 Конфигурация скрипта через переменные окружения.
 """
 
+import importlib.util
+import math
 import os
 from dataclasses import dataclass, field
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Tuple, Dict
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -18,6 +21,12 @@ env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
 
+def _env_list(name: str, default: str) -> Tuple[str, ...]:
+    """Читает список значений через запятую из переменной окружения."""
+    raw = os.getenv(name, default)
+    return tuple(item.strip() for item in raw.split(',') if item.strip())
+
+
 @dataclass(frozen=True)
 class Config:
     """Настройки ETL pipeline."""
@@ -47,6 +56,28 @@ class Config:
     API_ENDPOINT_MEDIA_UPLOAD: str = field(
         default_factory=lambda: os.getenv('API_ENDPOINT_MEDIA_UPLOAD', '/media/upload')
     )
+    API_ENDPOINT_PRODUCTS_BULK: str = field(
+        default_factory=lambda: os.getenv('API_ENDPOINT_PRODUCTS_BULK', '/products/bulk')
+    )
+    API_ENDPOINT_PRODUCTS_DEACTIVATE: str = field(
+        default_factory=lambda: os.getenv('API_ENDPOINT_PRODUCTS_DEACTIVATE', '/products/deactivate')
+    )
+    
+    # ========================================
+    # Bulk Create
+    # ========================================
+    BULK_CREATE_ENABLED: bool = field(
+        default_factory=lambda: os.getenv('BULK_CREATE_ENABLED', 'false').lower() == 'true'
+    )
+    BULK_BATCH_SIZE: int = field(
+        default_factory=lambda: int(os.getenv('BULK_BATCH_SIZE', '50'))
+    )
+    BULK_BATCH_MAX_KB: int = field(
+        default_factory=lambda: int(os.getenv('BULK_BATCH_MAX_KB', '512'))
+    )
+    BULK_FORMAT: str = field(
+        default_factory=lambda: os.getenv('BULK_FORMAT', 'json').lower()
+    )
     
     # ========================================
     # Concurrency & Performance
@@ -54,12 +85,66 @@ class Config:
     CONCURRENCY_LIMIT: int = field(
         default_factory=lambda: int(os.getenv('CONCURRENCY_LIMIT', '5'))
     )
-    REQUEST_DELAY: float = field(
-        default_factory=lambda: float(os.getenv('REQUEST_DELAY', '1.0'))
-    )
     HTTP_TIMEOUT: int = field(
         default_factory=lambda: int(os.getenv('HTTP_TIMEOUT', '30'))
     )
+    # Бюджеты APIClient: у загрузки изображений и запросов товаров (создание,
+    # PATCH, деактивация) свой лимит и пул соединений; скачивание с CDN -
+    # IMAGE_CONCURRENCY. По умолчанию - CONCURRENCY_LIMIT
+    UPLOAD_CONCURRENCY: int = field(
+        default_factory=lambda: int(os.getenv('UPLOAD_CONCURRENCY', os.getenv('CONCURRENCY_LIMIT', '5')))
+    )
+    CREATE_CONCURRENCY: int = field(
+        default_factory=lambda: int(os.getenv('CREATE_CONCURRENCY', os.getenv('CONCURRENCY_LIMIT', '5')))
+    )
+    # AIMD: лимиты источника, CDN и API подстраиваются под ответы серверов,
+    # CONCURRENCY_LIMIT / IMAGE_CONCURRENCY / UPLOAD_CONCURRENCY /
+    # CREATE_CONCURRENCY - начальные значения. Потолок может быть выше 20
+    # (предела CONCURRENCY_LIMIT): до него лимит дорастает, только пока серверы
+    # отвечают быстро и без 429/5xx, и вдвое снижается при перегрузке. От него
+    # же зависят пулы соединений и число воркеров, поэтому он не больше 100
+    ADAPTIVE_CONCURRENCY: bool = field(
+        default_factory=lambda: os.getenv('ADAPTIVE_CONCURRENCY', 'true').lower() == 'true'
+    )
+    ADAPTIVE_MAX_CONCURRENCY: int = field(
+        default_factory=lambda: int(os.getenv('ADAPTIVE_MAX_CONCURRENCY', '50'))
+    )
+    ADAPTIVE_LATENCY_TOLERANCE: float = field(
+        default_factory=lambda: float(os.getenv('ADAPTIVE_LATENCY_TOLERANCE', '2.0'))
+    )
+    
+    # ========================================
+    # Category Crawling
+    # ========================================
+    CATEGORY_CONCURRENCY: int = field(
+        default_factory=lambda: int(os.getenv('CATEGORY_CONCURRENCY', '4'))
+    )
+    PAGE_PREFETCH: int = field(
+        default_factory=lambda: int(os.getenv('PAGE_PREFETCH', '3'))
+    )
+    
+    # ========================================
+    # Rate Limiting (token bucket по хостам)
+    # ========================================
+    CRAWL_RATE_LIMIT: float = field(
+        default_factory=lambda: float(os.getenv('CRAWL_RATE_LIMIT', '4.0'))
+    )
+    CRAWL_RATE_BURST: int = field(
+        default_factory=lambda: int(os.getenv('CRAWL_RATE_BURST', '4'))
+    )
+    HOST_RATE_LIMITS: Tuple[str, ...] = field(
+        default_factory=lambda: _env_list('HOST_RATE_LIMITS', '')
+    )
+    
+    # ========================================
+    # Streaming Mode
+    # ========================================
+    STREAMING_MODE: bool = field(
+        default_factory=lambda: os.getenv('STREAMING_MODE', 'false').lower() == 'true'
+    )
+    STREAM_QUEUE_SIZE: int = field(
+        default_factory=lambda: int(os.getenv('STREAM_QUEUE_SIZE', '100'))
+    )
     
     # ========================================
     # Retry Configuration
@@ -70,6 +155,26 @@ class Config:
     RETRY_DELAY: float = field(
         default_factory=lambda: float(os.getenv('RETRY_DELAY', '2.0'))
     )
+    # Повторов не больше этого процента от числа запросов к API
+    RETRY_BUDGET_PERCENT: float = field(
+        default_factory=lambda: float(os.getenv('RETRY_BUDGET_PERCENT', '10'))
+    )
+    RETRY_BUDGET_RESERVE: int = field(
+        default_factory=lambda: int(os.getenv('RETRY_BUDGET_RESERVE', '10'))
+    )
+    
+    # ========================================
+    # Circuit Breaker (эндпоинты вашего API)
+    # ========================================
+    CIRCUIT_FAILURE_THRESHOLD: int = field(
+        default_factory=lambda: int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+    )
+    CIRCUIT_RECOVERY_SECONDS: float = field(
+        default_factory=lambda: float(os.getenv('CIRCUIT_RECOVERY_SECONDS', '5'))
+    )
+    CIRCUIT_MAX_WAIT_SECONDS: float = field(
+        default_factory=lambda: float(os.getenv('CIRCUIT_MAX_WAIT_SECONDS', '600'))
+    )
     
     # ========================================
     # Playwright Configuration
@@ -80,6 +185,122 @@ class Config:
     BROWSER_TYPE: str = field(
         default_factory=lambda: os.getenv('BROWSER_TYPE', 'chromium')
     )
+    PAGE_POOL_MAX_USES: int = field(
+        default_factory=lambda: int(os.getenv('PAGE_POOL_MAX_USES', '50'))
+    )
+    NAVIGATION_WAIT_UNTIL: str = field(
+        default_factory=lambda: os.getenv('NAVIGATION_WAIT_UNTIL', 'domcontentloaded')
+    )
+    
+    # ========================================
+    # Fetch Strategy
+    # ========================================
+    FETCH_MODE: str = field(
+        default_factory=lambda: os.getenv('FETCH_MODE', 'hybrid').lower()
+    )
+    FETCH_STATS_PATH: str = field(
+        default_factory=lambda: os.getenv('FETCH_STATS_PATH', 'state/fetch_path_stats.json')
+    )
+    
+    # ========================================
+    # Parse Workers
+    # ========================================
+    PARSE_WORKERS_MODE: str = field(
+        default_factory=lambda: os.getenv('PARSE_WORKERS_MODE', 'process').lower()
+    )
+    PARSE_WORKERS: int = field(
+        default_factory=lambda: int(os.getenv('PARSE_WORKERS', '0'))
+    )
+    PARSER_BACKEND: str = field(
+        default_factory=lambda: os.getenv('PARSER_BACKEND', 'lxml').lower()
+    )
+    
+    # ========================================
+    # Request Blocking (Playwright)
+    # ========================================
+    BLOCK_RESOURCES: bool = field(
+        default_factory=lambda: os.getenv('BLOCK_RESOURCES', 'true').lower() == 'true'
+    )
+    BLOCKED_RESOURCE_TYPES: Tuple[str, ...] = field(
+        default_factory=lambda: _env_list('BLOCKED_RESOURCE_TYPES', 'image,media,font,stylesheet')
+    )
+    BLOCK_THIRD_PARTY: bool = field(
+        default_factory=lambda: os.getenv('BLOCK_THIRD_PARTY', 'true').lower() == 'true'
+    )
+    BLOCKED_HOSTS: Tuple[str, ...] = field(
+        default_factory=lambda: _env_list(
+            'BLOCKED_HOSTS',
+            'google-analytics.com,googletagmanager.com,doubleclick.net,mc.yandex.ru,'
+            'an.yandex.ru,top-fwz1.mail.ru,vk.com,facebook.net,criteo.com,mindbox.ru,'
+            'jivosite.com,hotjar.com'
+        )
+    )
+    ALLOWED_SCRIPT_HOSTS: Tuple[str, ...] = field(
+        default_factory=lambda: _env_list('ALLOWED_SCRIPT_HOSTS', '')
+    )
+    
+    # ========================================
+    # Checkpoint / Resume
+    # ========================================
+    STATE_DB_PATH: str = field(
+        default_factory=lambda: os.getenv('STATE_DB_PATH', 'state/run_state.sqlite')
+    )
+    # Инкрементальный режим: условные GET и пропуск неизмененных товаров
+    INCREMENTAL_MODE: bool = field(
+        default_factory=lambda: os.getenv('INCREMENTAL_MODE', 'false').lower() == 'true'
+    )
+    # Индекс отправленных на API товаров (не очищается между запусками)
+    CATALOG_INDEX_PATH: str = field(
+        default_factory=lambda: os.getenv('CATALOG_INDEX_PATH', 'state/catalog_index.sqlite')
+    )
+    
+    # ========================================
+    # Delta Sync
+    # ========================================
+    # Известные товары обновляются PATCH только измененных полей вместо POST
+    SYNC_MODE: bool = field(
+        default_factory=lambda: os.getenv('SYNC_MODE', 'false').lower() == 'true'
+    )
+    # Деактивировать товары, пропавшие с источника (только после полного обхода)
+    SYNC_DEACTIVATE_MISSING: bool = field(
+        default_factory=lambda: os.getenv('SYNC_DEACTIVATE_MISSING', 'true').lower() == 'true'
+    )
+    # Предохранитель: не деактивировать, если пропало больше этой доли каталога
+    SYNC_DEACTIVATE_MAX_PERCENT: int = field(
+        default_factory=lambda: int(os.getenv('SYNC_DEACTIVATE_MAX_PERCENT', '20'))
+    )
+    
+    # ========================================
+    # Image Processing
+    # ========================================
+    IMAGE_CONCURRENCY: int = field(
+        default_factory=lambda: int(os.getenv('IMAGE_CONCURRENCY', '8'))
+    )
+    DEFER_SECONDARY_IMAGES: bool = field(
+        default_factory=lambda: os.getenv('DEFER_SECONDARY_IMAGES', 'true').lower() == 'true'
+    )
+    IMAGE_STREAMING: bool = field(
+        default_factory=lambda: os.getenv('IMAGE_STREAMING', 'false').lower() == 'true'
+    )
+    IMAGE_MAX_MB: int = field(
+        default_factory=lambda: int(os.getenv('IMAGE_MAX_MB', '20'))
+    )
+    
+    # ========================================
+    # Image Cache
+    # ========================================
+    IMAGE_CACHE_ENABLED: bool = field(
+        default_factory=lambda: os.getenv('IMAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    )
+    IMAGE_CACHE_DIR: str = field(
+        default_factory=lambda: os.getenv('IMAGE_CACHE_DIR', 'state/image_cache')
+    )
+    IMAGE_CACHE_MAX_MB: int = field(
+        default_factory=lambda: int(os.getenv('IMAGE_CACHE_MAX_MB', '500'))
+    )
+    IMAGE_CACHE_REVALIDATE: bool = field(
+        default_factory=lambda: os.getenv('IMAGE_CACHE_REVALIDATE', 'false').lower() == 'true'
+    )
     
     # ========================================
     # Logging Configuration
@@ -91,12 +312,61 @@ class Config:
         default_factory=lambda: os.getenv('LOG_FILE') or None
     )
     
+    # ========================================
+    # Metrics
+    # ========================================
+    # Файл метрик в формате Prometheus (textfile collector), пусто - не писать
+    METRICS_TEXTFILE: str = field(
+        default_factory=lambda: os.getenv('METRICS_TEXTFILE', '')
+    )
+    # Порт локального HTTP /metrics и /metrics.json, 0 - выключен
+    METRICS_PORT: int = field(
+        default_factory=lambda: int(os.getenv('METRICS_PORT', '0'))
+    )
+    METRICS_INTERVAL: float = field(
+        default_factory=lambda: float(os.getenv('METRICS_INTERVAL', '15'))
+    )
+    
+    # ========================================
+    # Tracing
+    # ========================================
+    # Файл трассы товаров (Chrome trace events JSON), пусто - трассировка выключена
+    TRACE_FILE: str = field(
+        default_factory=lambda: os.getenv('TRACE_FILE', '')
+    )
+    # Процент трассируемых товаров (стабильная выборка по хешу ID)
+    TRACE_SAMPLE_PERCENT: float = field(
+        default_factory=lambda: float(os.getenv('TRACE_SAMPLE_PERCENT', '1'))
+    )
+    TRACE_MAX_EVENTS: int = field(
+        default_factory=lambda: int(os.getenv('TRACE_MAX_EVENTS', '200000'))
+    )
+    
+    # ========================================
+    # Response Archive (record/replay)
+    # ========================================
+    # off, record (сохранять страницы и изображения) или replay (отдавать из архива)
+    ARCHIVE_MODE: str = field(
+        default_factory=lambda: os.getenv('ARCHIVE_MODE', 'off').lower()
+    )
+    ARCHIVE_DIR: str = field(
+        default_factory=lambda: os.getenv('ARCHIVE_DIR', 'state/archive')
+    )
+    # Повторять записи не позже этого момента (ISO, UTC), пусто - самые свежие
+    ARCHIVE_AS_OF: str = field(
+        default_factory=lambda: os.getenv('ARCHIVE_AS_OF', '')
+    )
+    
     # ========================================
     # Data Filtering
     # ========================================
     PRODUCT_SAMPLE_PERCENT: int = field(
         default_factory=lambda: int(os.getenv('PRODUCT_SAMPLE_PERCENT', '50'))
     )
+    # Соль хеша выборки: другая соль - другая (но тоже стабильная) выборка
+    SAMPLE_SEED: str = field(
+        default_factory=lambda: os.getenv('SAMPLE_SEED', '')
+    )
     
     # ========================================
     # Derived Properties
@@ -106,11 +376,48 @@ class Config:
         """Полный URL для создания товаров."""
         return f"{self.MY_API_URL.rstrip('/')}{self.API_ENDPOINT_PRODUCTS}"
     
+    def product_api_url(self, api_product_id: str) -> str:
+        """URL конкретного товара на API (для частичного обновления)."""
+        return f"{self.products_api_url.rstrip('/')}/{api_product_id}"
+    
+    @property
+    def products_bulk_url(self) -> str:
+        """Полный URL для пакетного создания товаров."""
+        return f"{self.MY_API_URL.rstrip('/')}{self.API_ENDPOINT_PRODUCTS_BULK}"
+    
+    @property
+    def products_deactivate_url(self) -> str:
+        """Полный URL для пакетной деактивации товаров."""
+        return f"{self.MY_API_URL.rstrip('/')}{self.API_ENDPOINT_PRODUCTS_DEACTIVATE}"
+    
     @property
     def media_upload_url(self) -> str:
         """Полный URL для загрузки медиа."""
         return f"{self.MY_API_URL.rstrip('/')}{self.API_ENDPOINT_MEDIA_UPLOAD}"
     
+    @property
+    def max_concurrency(self) -> int:
+        """Верхняя граница одновременных запросов (для пулов соединений и воркеров)."""
+        if self.ADAPTIVE_CONCURRENCY:
+            return max(self.ADAPTIVE_MAX_CONCURRENCY, self.CONCURRENCY_LIMIT)
+        return self.CONCURRENCY_LIMIT
+    
+    @property
+    def host_rate_limits(self) -> Dict[str, Tuple[float, int]]:
+        """
+        Правила HOST_RATE_LIMITS: `хост=запросов_в_секунду[:burst]` через запятую.
+
+        Например: `img.fix-price.com=20:40,api.example.com=10,*=5`
+        (burst по умолчанию - округленная вверх частота).
+        """
+        limits = {}
+        for item in self.HOST_RATE_LIMITS:
+            host, _, spec = item.partition('=')
+            rate, _, burst = spec.partition(':')
+            rate = float(rate)
+            limits[host.strip()] = (rate, int(burst) if burst else max(1, math.ceil(rate)))
+        return limits
+    
     @property
     def sample_rate(self) -> float:
         """Коэффициент выборки (0.5 = 50%)."""
@@ -146,6 +453,112 @@ class Config:
         if self.CONCURRENCY_LIMIT < 1 or self.CONCURRENCY_LIMIT > 20:
             errors.append("CONCURRENCY_LIMIT должен быть от 1 до 20.")
         
+        if not self.CONCURRENCY_LIMIT <= self.ADAPTIVE_MAX_CONCURRENCY <= 100:
+            errors.append("ADAPTIVE_MAX_CONCURRENCY должен быть от CONCURRENCY_LIMIT до 100.")
+        
+        if self.ADAPTIVE_LATENCY_TOLERANCE < 1:
+            errors.append("ADAPTIVE_LATENCY_TOLERANCE должен быть не меньше 1.")
+        
+        if self.FETCH_MODE not in ('hybrid', 'http', 'browser'):
+            errors.append("FETCH_MODE должен быть hybrid, http или browser.")
+        
+        if self.PARSE_WORKERS_MODE not in ('process', 'thread', 'inline'):
+            errors.append("PARSE_WORKERS_MODE должен быть process, thread или inline.")
+        
+        if self.PARSE_WORKERS < 0:
+            errors.append("PARSE_WORKERS не может быть отрицательным.")
+        
+        if self.PARSER_BACKEND not in ('lxml', 'selectolax'):
+            errors.append("PARSER_BACKEND должен быть lxml или selectolax.")
+        elif self.PARSER_BACKEND == 'selectolax' and importlib.util.find_spec('selectolax') is None:
+            errors.append("PARSER_BACKEND=selectolax требует пакет selectolax (pip install selectolax).")
+        
+        if self.NAVIGATION_WAIT_UNTIL not in ('commit', 'domcontentloaded', 'load', 'networkidle'):
+            errors.append("NAVIGATION_WAIT_UNTIL: commit, domcontentloaded, load или networkidle.")
+        
+        if self.PAGE_POOL_MAX_USES < 1:
+            errors.append("PAGE_POOL_MAX_USES должен быть больше 0.")
+        
+        if self.CATEGORY_CONCURRENCY < 1:
+            errors.append("CATEGORY_CONCURRENCY должен быть больше 0.")
+        
+        if self.PAGE_PREFETCH < 0:
+            errors.append("PAGE_PREFETCH не может быть отрицательным.")
+        
+        if self.CRAWL_RATE_LIMIT < 0:
+            errors.append("CRAWL_RATE_LIMIT не может быть отрицательным.")
+        
+        if self.CRAWL_RATE_BURST < 1:
+            errors.append("CRAWL_RATE_BURST должен быть больше 0.")
+        
+        try:
+            host_limits = self.host_rate_limits
+        except ValueError:
+            errors.append("HOST_RATE_LIMITS: формат хост=запросов_в_секунду[:burst] через запятую.")
+        else:
+            if any(not host or rate < 0 or burst < 1 for host, (rate, burst) in host_limits.items()):
+                errors.append("HOST_RATE_LIMITS: нужен хост, частота >= 0 и burst >= 1.")
+        
+        if self.IMAGE_CONCURRENCY < 1:
+            errors.append("IMAGE_CONCURRENCY должен быть больше 0.")
+        
+        if self.MAX_RETRIES < 1:
+            errors.append("MAX_RETRIES должен быть больше 0 (1 = без повторов).")
+        
+        if not 0 <= self.RETRY_BUDGET_PERCENT <= 100 or self.RETRY_BUDGET_RESERVE < 1:
+            errors.append("RETRY_BUDGET_PERCENT должен быть от 0 до 100, RETRY_BUDGET_RESERVE - больше 0.")
+        
+        if self.CIRCUIT_FAILURE_THRESHOLD < 1:
+            errors.append("CIRCUIT_FAILURE_THRESHOLD должен быть больше 0.")
+        
+        if self.CIRCUIT_RECOVERY_SECONDS <= 0 or self.CIRCUIT_MAX_WAIT_SECONDS <= 0:
+            errors.append("CIRCUIT_RECOVERY_SECONDS и CIRCUIT_MAX_WAIT_SECONDS должны быть больше 0.")
+        
+        if self.UPLOAD_CONCURRENCY < 1 or self.CREATE_CONCURRENCY < 1:
+            errors.append("UPLOAD_CONCURRENCY и CREATE_CONCURRENCY должны быть больше 0.")
+        
+        if not 0 <= self.METRICS_PORT <= 65535:
+            errors.append("METRICS_PORT должен быть от 0 до 65535 (0 - выключен).")
+        
+        if self.METRICS_INTERVAL <= 0:
+            errors.append("METRICS_INTERVAL должен быть больше 0.")
+        
+        if not 0 < self.TRACE_SAMPLE_PERCENT <= 100:
+            errors.append("TRACE_SAMPLE_PERCENT должен быть больше 0 и не больше 100.")
+        
+        if self.TRACE_MAX_EVENTS < 1:
+            errors.append("TRACE_MAX_EVENTS должен быть больше 0.")
+        
+        if self.ARCHIVE_MODE not in ('off', 'record', 'replay'):
+            errors.append("ARCHIVE_MODE должен быть off, record или replay.")
+        
+        if self.ARCHIVE_AS_OF:
+            try:
+                datetime.fromisoformat(self.ARCHIVE_AS_OF)
+            except ValueError:
+                errors.append("ARCHIVE_AS_OF должен быть датой/временем ISO (например, 2024-05-01T06:00).")
+        
+        if not 0 <= self.SYNC_DEACTIVATE_MAX_PERCENT <= 100:
+            errors.append("SYNC_DEACTIVATE_MAX_PERCENT должен быть от 0 до 100.")
+        
+        if self.BULK_BATCH_SIZE < 1:
+            errors.append("BULK_BATCH_SIZE должен быть больше 0.")
+        
+        if self.BULK_BATCH_MAX_KB < 1:
+            errors.append("BULK_BATCH_MAX_KB должен быть больше 0.")
+        
+        if self.BULK_FORMAT not in ('json', 'ndjson'):
+            errors.append("BULK_FORMAT должен быть json или ndjson.")
+        
+        if self.IMAGE_MAX_MB < 1:
+            errors.append("IMAGE_MAX_MB должен быть больше 0.")
+        
+        if self.IMAGE_CACHE_MAX_MB < 0:
+            errors.append("IMAGE_CACHE_MAX_MB не может быть отрицательным.")
+        
+        if self.STREAM_QUEUE_SIZE < 1:
+            errors.append("STREAM_QUEUE_SIZE должен быть больше 0.")
+        
         if self.PRODUCT_SAMPLE_PERCENT < 1 or self.PRODUCT_SAMPLE_PERCENT > 100:
             errors.append("PRODUCT_SAMPLE_PERCENT должен быть от 1 до 100.")
         
@@ -177,7 +590,50 @@ def init_config() -> Config:
     
     logger.info("✅ Конфигурация загружена успешно")
     logger.info(f"   API URL: {config.MY_API_URL}")
-    logger.info(f"   Concurrency: {config.CONCURRENCY_LIMIT}")
+    logger.info(
+        f"   Concurrency: {config.CONCURRENCY_LIMIT}"
+        + (f" (adaptive, max {config.max_concurrency})" if config.ADAPTIVE_CONCURRENCY else "")
+    )
+    logger.info(
+        f"   Retries: {config.MAX_RETRIES} attempts, budget {config.RETRY_BUDGET_PERCENT:g}%, "
+        f"breaker after {config.CIRCUIT_FAILURE_THRESHOLD} failures"
+    )
+    logger.info(
+        f"   API budgets: download={config.IMAGE_CONCURRENCY}, "
+        f"upload={config.UPLOAD_CONCURRENCY}, create={config.CREATE_CONCURRENCY}"
+    )
+    if config.BULK_CREATE_ENABLED:
+        logger.info(
+            f"   Bulk create: {config.BULK_FORMAT}, "
+            f"batch={config.BULK_BATCH_SIZE}/{config.BULK_BATCH_MAX_KB}KB"
+        )
+    logger.info(
+        f"   Categories: x{config.CATEGORY_CONCURRENCY}, prefetch={config.PAGE_PREFETCH}, "
+        f"rate={config.CRAWL_RATE_LIMIT}/s (burst {config.CRAWL_RATE_BURST})"
+    )
+    if config.HOST_RATE_LIMITS:
+        logger.info(f"   Host rate limits: {', '.join(config.HOST_RATE_LIMITS)}")
     logger.info(f"   Sample Rate: {config.sample_rate * 100}%")
-    
+    if config.STREAMING_MODE:
+        logger.info(f"   Streaming: queue={config.STREAM_QUEUE_SIZE}")
+    if config.INCREMENTAL_MODE:
+        logger.info(f"   Incremental: {config.CATALOG_INDEX_PATH}")
+    if config.SYNC_MODE:
+        logger.info(
+            f"   Sync: {config.CATALOG_INDEX_PATH}, "
+            f"deactivate={'on' if config.SYNC_DEACTIVATE_MISSING else 'off'}"
+        )
+    if config.METRICS_TEXTFILE or config.METRICS_PORT:
+        logger.info(
+            f"   Metrics: file={config.METRICS_TEXTFILE or 'off'}, "
+            f"port={config.METRICS_PORT or 'off'}, interval={config.METRICS_INTERVAL:g}s"
+        )
+    if config.TRACE_FILE:
+        logger.info(f"   Tracing: {config.TRACE_FILE}, {config.TRACE_SAMPLE_PERCENT:g}% товаров")
+    if config.ARCHIVE_MODE != 'off':
+        logger.info(
+            f"   Archive: {config.ARCHIVE_MODE}, {config.ARCHIVE_DIR}"
+            + (f", as of {config.ARCHIVE_AS_OF}" if config.ARCHIVE_AS_OF else '')
+        )
+
     return config
@@ -0,0 +1,158 @@
+# ============================================
+# Fix-Price ETL Pipeline - Compiled Extraction Plan
+# ============================================
+"""
+Скомпилированный план извлечения данных с подключаемым HTML бэкендом.
+
+Селекторы компилируются один раз на процесс (а не на каждый select_one),
+поверх скомпилированных селекторов работает тонкий адаптер документа,
+поэтому логика извлечения в html_parsing.py не зависит от бэкенда.
+
+Бэкенды:
+- lxml       - BeautifulSoup(lxml) + предкомпилированные soupsieve селекторы
+- selectolax - selectolax/lexbor (опционально, `pip install selectolax`),
+               в разы быстрее на больших страницах
+"""
+
+from typing import Any, Dict, List, Optional
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax - опциональная зависимость
+    LexborHTMLParser = None
+
+
+BACKEND_LXML = 'lxml'
+BACKEND_SELECTOLAX = 'selectolax'
+
+
+class Document:
+    """Адаптер разобранного HTML документа."""
+
+    def first(self, key: str, node: Any = None) -> Any:
+        """Первый элемент по ключу селектора (внутри node или всего документа)."""
+        raise NotImplementedError
+
+    def all(self, key: str, node: Any = None) -> List[Any]:
+        """Все элементы по ключу селектора."""
+        raise NotImplementedError
+
+    def text(self, node: Any) -> str:
+        """Текст элемента без пробелов по краям."""
+        raise NotImplementedError
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        """Значение атрибута элемента."""
+        raise NotImplementedError
+
+    def first_text(self, key: str, node: Any = None) -> Optional[str]:
+        elem = self.first(key, node)
+        return self.text(elem) if elem is not None else None
+
+
+class ExtractionPlan:
+    """Набор скомпилированных селекторов для конкретного бэкенда."""
+
+    name = ''
+
+    def __init__(self, selectors: Dict[str, str]):
+        self.selectors = selectors
+
+    def parse(self, html: str) -> Document:
+        raise NotImplementedError
+
+
+# ========================================
+# BeautifulSoup + lxml
+# ========================================
+
+class Bs4Document(Document):
+
+    def __init__(self, soup: BeautifulSoup, compiled: Dict[str, Any]):
+        self.soup = soup
+        self.compiled = compiled
+
+    def first(self, key: str, node: Any = None) -> Any:
+        return self.compiled[key].select_one(node if node is not None else self.soup)
+
+    def all(self, key: str, node: Any = None) -> List[Any]:
+        return self.compiled[key].select(node if node is not None else self.soup)
+
+    def text(self, node: Any) -> str:
+        return node.get_text(strip=True)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+
+class Bs4Plan(ExtractionPlan):
+    name = BACKEND_LXML
+
+    def __init__(self, selectors: Dict[str, str]):
+        super().__init__(selectors)
+        self.compiled = {key: soupsieve.compile(sel) for key, sel in selectors.items()}
+
+    def parse(self, html: str) -> Document:
+        return Bs4Document(BeautifulSoup(html, 'lxml'), self.compiled)
+
+
+# ========================================
+# selectolax / lexbor
+# ========================================
+
+class SelectolaxDocument(Document):
+
+    def __init__(self, tree: Any, selectors: Dict[str, str]):
+        self.tree = tree
+        self.selectors = selectors
+
+    def first(self, key: str, node: Any = None) -> Any:
+        return (node if node is not None else self.tree).css_first(self.selectors[key])
+
+    def all(self, key: str, node: Any = None) -> List[Any]:
+        nodes = (node if node is not None else self.tree).css(self.selectors[key])
+        # lexbor возвращает элемент повторно, если он подходит под несколько
+        # селекторов группы; soupsieve - один раз в порядке документа
+        if ',' in self.selectors[key]:
+            nodes = list({n.mem_id: n for n in nodes}.values())
+        return nodes
+
+    def text(self, node: Any) -> str:
+        return node.text(strip=True)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+
+class SelectolaxPlan(ExtractionPlan):
+    name = BACKEND_SELECTOLAX
+
+    def __init__(self, selectors: Dict[str, str]):
+        if LexborHTMLParser is None:
+            raise ImportError("selectolax не установлен: pip install selectolax")
+        super().__init__(selectors)
+
+    def parse(self, html: str) -> Document:
+        return SelectolaxDocument(LexborHTMLParser(html), self.selectors)
+
+
+PLANS = {
+    BACKEND_LXML: Bs4Plan,
+    BACKEND_SELECTOLAX: SelectolaxPlan,
+}
+
+
+def available_backends() -> List[str]:
+    """Бэкенды, доступные в текущем окружении."""
+    return [name for name in PLANS if name != BACKEND_SELECTOLAX or LexborHTMLParser is not None]
+
+
+def build_plan(backend: str, selectors: Dict[str, str]) -> ExtractionPlan:
+    """Компилирует план для бэкенда."""
+    if backend not in PLANS:
+        raise ValueError(f"Неизвестный HTML бэкенд: {backend}")
+    return PLANS[backend](selectors)
+
@@ -0,0 +1,335 @@
+# ============================================
+# Fix-Price ETL Pipeline - HTML Parsing
+# ============================================
+"""
+Чистые функции разбора HTML страниц fix-price.com.
+
+Функции не зависят от скрапера, браузера и event loop: принимают HTML
+строку и возвращают компактные plain-dict результаты. Поэтому их можно
+выполнять в пуле процессов (см. parse_workers.py), не блокируя asyncio.
+
+Работа с DOM идет через скомпилированный план извлечения (extraction_plan.py),
+бэкенд выбирается параметром `backend`.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+from extraction_plan import BACKEND_LXML, Document, ExtractionPlan, build_plan
+from structured_data import extract_structured_product, original_image_url, classify_spec
+
+
+# Селекторы для парсинга
+SELECTORS = {
+    # Категории
+    'category_links': 'a[href*="/catalog/"]',
+    'category_list': '.catalog-categories a, .category-item a, nav a[href*="/catalog/"]',
+
+    # Товары в списке
+    'product_cards': '.product-card, .catalog-item, [data-product-id], .goods-item',
+    'product_link': 'a[href*="/product/"], a.product-link',
+    'product_title': '.product-title, .product-name, h1, .goods-title',
+    'product_price': '.price-current, .product-price-current, [data-price], .price',
+    'product_old_price': '.price-old, .product-price-old, .old-price',
+
+    # Страница товара
+    'product_page_title': 'h1, .product-detail h1, .product-info h1',
+    'product_page_description': '.product-description, .description, [itemprop="description"]',
+    'product_page_price': '.price-current, .product-price, [data-price]',
+    'product_page_old_price': '.price-old, .old-price, .compare-price',
+    'product_images': '.product-image img, .gallery-image img, .product-gallery img, [data-src]',
+    'product_specs': '.product-specs, .specifications, .product-attributes',
+    'spec_row': '.spec-row, .attribute-row, tr',
+    'spec_name': '.spec-name, .attribute-name, td:first-child',
+    'spec_value': '.spec-value, .attribute-value, td:last-child',
+    'in_stock': '.in-stock, .available, [data-available="true"]',
+    'out_of_stock': '.out-of-stock, .unavailable, [data-available="false"]',
+    'sku': '.sku, .article, [data-sku]',
+}
+
+# Селекторы картинок в порядке приоритета (первая найденная - главная)
+IMAGE_SELECTORS = (
+    '.product-image img',
+    '.gallery-image img',
+    '.product-gallery img',
+    '[data-src]',
+    '.swiper-slide img',
+    '.product-photos img'
+)
+IMAGE_ATTRS = ('data-src', 'data-original', 'src', 'data-lazy')
+IMAGE_KEYS = tuple(f'image_{idx}' for idx in range(len(IMAGE_SELECTORS)))
+
+# Все селекторы, которые компилируются в план извлечения
+PLAN_SELECTORS = {
+    **SELECTORS,
+    'h1': 'h1',
+    'breadcrumbs': '.breadcrumb a, .breadcrumbs a, [itemprop="itemListElement"] a',
+    'next_page': 'a[rel="next"], .next-page',
+    'pagination': '.pagination a, .pager a, [class*="pagination"] a',
+    **dict(zip(IMAGE_KEYS, IMAGE_SELECTORS)),
+}
+
+PRICE_CLEAN_RE = re.compile(r'[^\d.,]')
+PAGE_PARAM_RE = re.compile(r'[?&]page=(\d+)')
+PRODUCT_ID_RE = re.compile(r'/product[s]?/(\d+)')
+
+# Предполагаем 12 товаров на страницу листинга
+LISTING_PAGE_SIZE = 12
+
+
+def parse_price(price_text: Optional[str]) -> Optional[float]:
+    """Парсит цену из текста."""
+    if not price_text:
+        return None
+
+    # Убираем все кроме цифр и запятой/точки
+    cleaned = PRICE_CLEAN_RE.sub('', price_text).replace(',', '.')
+
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_plan(backend: str = BACKEND_LXML) -> ExtractionPlan:
+    """План извлечения для бэкенда, компилируется один раз на процесс."""
+    return build_plan(backend, PLAN_SELECTORS)
+
+
+def extract_product_id(url: str) -> str:
+    """ID товара из URL (или короткий хеш URL, если ID в нем нет)."""
+    match = PRODUCT_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    return hashlib.md5(url.encode()).hexdigest()[:12]
+
+
+def _absolute_url(base_url: str, href: str) -> str:
+    # urljoin заметно дороже простой проверки, а большинство ссылок уже абсолютные
+    if href.startswith(('http://', 'https://')):
+        return href
+    return urljoin(base_url, href)
+
+
+# ========================================
+# Catalog & Listing
+# ========================================
+
+def parse_categories(html: str, base_url: str, backend: str = BACKEND_LXML) -> List[Dict[str, Any]]:
+    """
+    Категории со страницы каталога.
+
+    Returns:
+        Список словарей {name, url, level} без дубликатов по URL
+    """
+    doc = get_plan(backend).parse(html)
+    categories: Dict[str, Dict[str, Any]] = {}
+
+    for link in doc.all('category_links'):
+        href = doc.attr(link, 'href') or ''
+        name = doc.text(link)
+
+        if href and name and '/catalog/' in href:
+            url = _absolute_url(base_url, href)
+            if url not in categories:
+                categories[url] = {'name': name, 'url': url, 'level': href.count('/') - 1}
+
+    return list(categories.values())
+
+
+def parse_listing(html: str, base_url: str, backend: str = BACKEND_LXML) -> Dict[str, Any]:
+    """
+    Ссылки на товары со страницы листинга.
+
+    Returns:
+        Словарь {urls: [...], has_next: bool, last_page: int | None}
+    """
+    doc = get_plan(backend).parse(html)
+
+    urls = []
+    for link in doc.all('product_link'):
+        href = doc.attr(link, 'href') or ''
+        if _is_product_href(href):
+            urls.append(_absolute_url(base_url, href))
+
+    return {'urls': urls, **_pagination(doc, len(urls))}
+
+
+def parse_listing_cards(html: str, base_url: str, backend: str = BACKEND_LXML) -> Dict[str, Any]:
+    """
+    Цены и наличие из карточек товаров на странице листинга.
+
+    Returns:
+        Словарь {cards: [{source_id, source_url, title, price, old_price, in_stock}],
+        has_next: bool, last_page: int | None}
+    """
+    doc = get_plan(backend).parse(html)
+
+    cards: Dict[str, Dict[str, Any]] = {}
+    for card in doc.all('product_cards'):
+        link = doc.first('product_link', card)
+        href = (doc.attr(link, 'href') or '') if link is not None else ''
+        if not _is_product_href(href):
+            continue
+
+        url = _absolute_url(base_url, href)
+        if url in cards:
+            # Вложенные элементы карточки тоже подходят под селектор карточек
+            continue
+
+        cards[url] = {
+            'source_id': extract_product_id(url),
+            'source_url': url,
+            'title': doc.first_text('product_title', card),
+            'price': parse_price(doc.first_text('product_price', card)),
+            'old_price': parse_price(doc.first_text('product_old_price', card)),
+            'in_stock': doc.first('out_of_stock', card) is None,
+        }
+
+    return {'cards': list(cards.values()), **_pagination(doc, len(cards))}
+
+
+def _is_product_href(href: str) -> bool:
+    return bool(href) and ('/product/' in href or '/goods/' in href)
+
+
+def _pagination(doc: Document, items_count: int) -> Dict[str, Any]:
+    has_next = doc.first('next_page') is not None or items_count >= LISTING_PAGE_SIZE
+    return {'has_next': has_next, 'last_page': extract_last_page(doc)}
+
+
+def extract_last_page(doc: Document) -> Optional[int]:
+    """Номер последней страницы из блока пагинации (None, если блока нет)."""
+    pages = []
+    for link in doc.all('pagination'):
+        match = PAGE_PARAM_RE.search(doc.attr(link, 'href') or '')
+        if match:
+            pages.append(int(match.group(1)))
+        else:
+            text = doc.text(link)
+            if text.isdigit():
+                pages.append(int(text))
+    return max(pages) if pages else None
+
+
+# ========================================
+# Product Page
+# ========================================
+
+def extract_specs(doc: Document) -> Dict[str, Any]:
+    """Характеристики товара в виде kwargs для ProductSpecs."""
+    specs: Dict[str, Any] = {}
+    additional: Dict[str, Any] = {}
+
+    specs_container = doc.first('product_specs')
+
+    if specs_container is not None:
+        for row in doc.all('spec_row', specs_container):
+            name_elem = doc.first('spec_name', row)
+            value_elem = doc.first('spec_value', row)
+
+            if name_elem is not None and value_elem is not None:
+                name = doc.text(name_elem).lower()
+                value = doc.text(value_elem)
+
+                spec_field = classify_spec(name)
+                if spec_field:
+                    specs[spec_field] = value
+                else:
+                    additional[name] = value
+
+    specs['additional'] = additional
+    return specs
+
+
+def extract_images(doc: Document, base_url: str) -> List[str]:
+    """URL оригиналов изображений товара (первый - главный)."""
+    found_urls: Dict[str, None] = {}
+
+    for key in IMAGE_KEYS:
+        for img in doc.all(key):
+            # Пробуем разные атрибуты для URL изображения
+            for attr in IMAGE_ATTRS:
+                src = doc.attr(img, attr)
+                if src:
+                    full_url = _absolute_url(base_url, src)
+
+                    # Пропускаем placeholder изображения
+                    if 'placeholder' in full_url.lower() or 'data:image' in full_url:
+                        continue
+
+                    found_urls.setdefault(original_image_url(full_url), None)
+                    break
+
+    return list(found_urls)
+
+
+def extract_breadcrumbs(doc: Document) -> List[str]:
+    """Путь категорий из хлебных крошек."""
+    categories_path = []
+    for crumb in doc.all('breadcrumbs'):
+        cat_name = doc.text(crumb)
+        if cat_name and cat_name.lower() not in ['главная', 'home']:
+            categories_path.append(cat_name)
+    return categories_path
+
+
+def parse_product(
+    html: str,
+    product_url: str,
+    backend: str = BACKEND_LXML
+) -> Optional[Dict[str, Any]]:
+    """
+    Поля товара со страницы товара.
+
+    Сначала пробует структурированные данные (JSON-LD / hydration JSON),
+    затем CSS селекторы. Цена может быть None - решение о том, нужен ли
+    браузер, принимает вызывающий код.
+
+    Returns:
+        Словарь полей товара (title, description, price, old_price, currency,
+        in_stock, sku, barcode, specs, images, categories_path, parser)
+        или None, если не найдено название
+    """
+    # Основной путь: JSON-LD / hydration JSON без построения DOM
+    fields = extract_structured_product(html, product_url)
+    if fields and fields.get('title') and fields.get('price') is not None:
+        fields['parser'] = 'structured'
+        if not fields.get('images') or not fields.get('categories_path'):
+            doc = get_plan(backend).parse(html)
+            if not fields.get('images'):
+                fields['images'] = extract_images(doc, product_url)
+            if not fields.get('categories_path'):
+                fields['categories_path'] = extract_breadcrumbs(doc)
+        return fields
+
+    # Fallback: CSS селекторы по DOM
+    doc = get_plan(backend).parse(html)
+
+    title = doc.first_text('product_page_title') or doc.first_text('h1')
+    if not title:
+        return None
+
+    # --- Наличие ---
+    in_stock = True
+    if doc.first('out_of_stock') is not None:
+        in_stock = False
+    elif 'нет в наличии' in html.lower():
+        in_stock = False
+
+    return {
+        'parser': 'css',
+        'title': title,
+        'description': doc.first_text('product_page_description'),
+        'price': parse_price(doc.first_text('product_page_price')),
+        'old_price': parse_price(doc.first_text('product_page_old_price')),
+        'in_stock': in_stock,
+        'sku': doc.first_text('sku'),
+        'specs': extract_specs(doc),
+        'images': extract_images(doc, product_url),
+        'categories_path': extract_breadcrumbs(doc),
+    }
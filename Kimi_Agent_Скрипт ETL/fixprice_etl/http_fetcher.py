@@ -0,0 +1,332 @@
+# ============================================
+# Fix-Price ETL Pipeline - Hybrid HTTP/Browser Fetcher
+# ============================================
+"""
+Гибридная загрузка страниц: сначала обычный HTTP GET, браузер - только если нужно.
+
+Многие страницы fix-price.com отдают цену, название и картинки уже в исходном
+HTML (серверный рендеринг). Для них запуск Chromium не нужен: достаточно GET
+через пул соединений httpx и тех же экстракторов. Если в ответе не хватает
+обязательных полей, страница догружается через Playwright.
+
+Статистика по шаблонам URL сохраняется между запусками, поэтому для шаблонов,
+которые стабильно требуют браузер, HTTP попытка пропускается.
+
+С архивом ответов (response_archive.py) HTML каждой загрузки записывается,
+а при повторе страницы отдаются из архива без сети и браузера.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Protocol, Tuple, TypeVar
+from urllib.parse import urlparse, parse_qs
+
+import httpx
+from loguru import logger
+
+from config import Config
+from adaptive_concurrency import AdaptiveLimiter
+from rate_limit import HostRateLimits, host_key
+from metrics import METRICS
+from response_archive import ResponseArchive, KIND_HTTP, KIND_BROWSER
+
+
+T = TypeVar('T')
+
+# Парсер страницы: async (html, strict) -> результат или None, если данных не хватает
+PageParser = Callable[[str, bool], Awaitable[Optional[T]]]
+
+# Режимы загрузки
+FETCH_MODE_HYBRID = 'hybrid'
+FETCH_MODE_HTTP = 'http'
+FETCH_MODE_BROWSER = 'browser'
+
+# После скольких HTTP попыток по шаблону можно делать выводы
+MIN_SAMPLES = 10
+# Ниже этой доли успешных HTTP попыток шаблон считается "браузерным"
+MIN_HTTP_SUCCESS_RATE = 0.2
+# Даже для "браузерных" шаблонов иногда пробуем HTTP - вдруг сайт изменился
+REPROBE_EVERY = 50
+
+
+class NotModified(Exception):
+    """Сервер ответил 304 на условный GET - страница не изменилась."""
+
+    def __init__(self, url: str):
+        super().__init__(f"304 Not Modified: {url}")
+        self.url = url
+
+
+class ValidatorStore(Protocol):
+    """Хранилище ETag / Last-Modified по URL (см. catalog_index.CatalogIndex)."""
+
+    def get_validators(self, url: str) -> Dict[str, str]: ...
+
+    def save_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]): ...
+
+
+def url_pattern(url: str) -> str:
+    """
+    Шаблон URL для группировки статистики.
+
+    https://fix-price.com/catalog/dom/p-123-name?page=2 -> fix-price.com/catalog/*/*?page
+    """
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split('/') if s]
+    path = '/'.join(segments[:1] + ['*'] * (len(segments) - 1))
+    query = ','.join(sorted(parse_qs(parsed.query)))
+    return f"{parsed.hostname}/{path}" + (f"?{query}" if query else '')
+
+
+@dataclass
+class PathStats:
+    """Какой путь загрузки срабатывал для шаблона URL."""
+    http_ok: int = 0          # HTTP ответа хватило
+    http_incomplete: int = 0  # HTTP ответ без обязательных полей
+    http_error: int = 0       # Ошибка сети / статус >= 400
+    browser_ok: int = 0       # Страница получена через браузер
+    skipped_http: int = 0     # HTTP попытка пропущена по статистике
+    not_modified: int = 0     # Условный GET вернул 304
+
+    @property
+    def http_attempts(self) -> int:
+        return self.http_ok + self.http_incomplete + self.http_error
+
+    @property
+    def http_success_rate(self) -> float:
+        return self.http_ok / self.http_attempts if self.http_attempts else 1.0
+
+    def prefers_browser(self) -> bool:
+        """Нужно ли сразу идти в браузер."""
+        if self.http_attempts < MIN_SAMPLES:
+            return False
+        if self.http_success_rate >= MIN_HTTP_SUCCESS_RATE:
+            return False
+        # Периодически перепроверяем HTTP путь
+        return (self.skipped_http + 1) % REPROBE_EVERY != 0
+
+
+class HybridFetcher:
+    """
+    Загрузчик страниц с HTTP fast path и fallback на браузер.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        browser_fetch: Callable[[str, Optional[str]], Awaitable[str]],
+        headers: Optional[Dict[str, str]] = None,
+        validators: Optional[ValidatorStore] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        rate_limits: Optional[HostRateLimits] = None,
+        archive: Optional[ResponseArchive] = None
+    ):
+        """
+        Args:
+            config: Конфигурация
+            browser_fetch: Загрузка через Playwright (url, wait_for_selector) -> html
+            headers: Заголовки для HTTP запросов
+            validators: Хранилище ETag / Last-Modified для условных GET
+            limiter: Лимитер параллельности источника - слот на каждый HTTP запрос
+            rate_limits: Бюджет запросов по хостам - токен до слота лимитера
+            archive: Архив ответов (запись загруженного HTML или повтор из него)
+        """
+        self.config = config
+        self.mode = config.FETCH_MODE
+        self.browser_fetch = browser_fetch
+        self.validators = validators
+        self.limiter = limiter
+        self.rate_limits = rate_limits
+        self.archive = archive
+        self.stats_path = Path(config.FETCH_STATS_PATH) if config.FETCH_STATS_PATH else None
+        self.stats: Dict[str, PathStats] = self._load_stats()
+
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(
+                max_keepalive_connections=config.max_concurrency,
+                max_connections=config.max_concurrency * 2
+            ),
+            timeout=httpx.Timeout(config.HTTP_TIMEOUT, connect=10.0),
+            http2=True,
+            follow_redirects=True
+        )
+
+    async def close(self):
+        """Закрывает HTTP клиент и сохраняет статистику."""
+        await self.client.aclose()
+        self._save_stats()
+        if self.stats:
+            logger.info(f"⚡ Пути загрузки: {self.summary()}")
+
+    # ========================================
+    # Fetching
+    # ========================================
+
+    async def fetch_parsed(
+        self,
+        url: str,
+        parse: PageParser,
+        wait_for_selector: Optional[str] = None,
+        conditional: bool = False
+    ) -> T:
+        """
+        Загружает страницу и извлекает из нее данные.
+
+        Args:
+            url: URL страницы
+            parse: Async парсер (html, strict) -> результат; в strict режиме
+                возвращает None, если обязательных полей нет
+            wait_for_selector: Селектор ожидания для браузерного пути
+            conditional: Отправить условный GET с сохраненными ETag / Last-Modified
+
+        Returns:
+            Результат парсера
+
+        Raises:
+            NotModified: Условный GET вернул 304
+            ArchiveMiss: Повтор из архива, а страница не записана
+        """
+        if self.archive and self.archive.replaying:
+            # В архиве - итоговый HTML загрузки, браузер для него уже не нужен
+            return await parse(self.archive.replay(url).text, False)
+
+        stats = self.stats.setdefault(url_pattern(url), PathStats())
+        # При записи в архив нужно тело страницы, а не 304
+        conditional = conditional and not (self.archive and self.archive.recording)
+        validators = (
+            self.validators.get_validators(url)
+            if conditional and self.validators and self.mode != FETCH_MODE_BROWSER else {}
+        )
+
+        if self.mode != FETCH_MODE_BROWSER:
+            # Условный GET дешевле браузера даже для "браузерных" шаблонов: 304 отвечает на все
+            if self.mode == FETCH_MODE_HYBRID and stats.prefers_browser() and not validators:
+                stats.skipped_http += 1
+            else:
+                content, result = await self._try_http(url, parse, stats, validators)
+                if result is not None:
+                    return result
+                if self.mode == FETCH_MODE_HTTP:
+                    if content is None:
+                        raise Exception(f"HTTP загрузка не удалась для {url}")
+                    # Браузер отключен - отдаем то, что есть в HTML
+                    return await parse(content, False)
+
+        content = await self.browser_fetch(url, wait_for_selector)
+        stats.browser_ok += 1
+        await self._record(url, KIND_BROWSER, content)
+        return await parse(content, False)
+
+    async def fetch_html(self, url: str) -> str:
+        """Обычный HTTP GET, возвращает HTML."""
+        if self.archive and self.archive.replaying:
+            return self.archive.replay(url).text
+        response = await self._get(url)
+        response.raise_for_status()
+        await self._record(url, KIND_HTTP, response.text)
+        return response.text
+
+    async def _record(self, url: str, kind: str, content: str):
+        """HTML загрузки - в архив, если он пишется."""
+        if self.archive and self.archive.recording:
+            await self.archive.record_html(url, kind, content)
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET в слоте запроса: статус - лимитеру, длительность и байты - в метрики."""
+        host = host_key(url)
+        # Сетевые ошибки и таймауты внутри слота учитывает сам лимитер
+        async with self.request_slot(url):
+            with METRICS.track('http_fetch', host):
+                response = await self.client.get(url, headers=headers)
+            if self.limiter:
+                self.limiter.observe(response.status_code, response.headers.get('retry-after'))
+        METRICS.inc('bytes_total', len(response.content), direction='in', host=host)
+        return response
+
+    @asynccontextmanager
+    async def request_slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Разрешение на один запрос: токен бюджета хоста, затем слот лимитера.
+
+        Бюджета ждем без слота - ожидающие запросы не занимают параллельность.
+        """
+        if self.rate_limits:
+            await self.rate_limits.acquire(url)
+        if self.limiter:
+            async with self.limiter.slot():
+                yield
+        else:
+            yield
+
+    async def _try_http(
+        self,
+        url: str,
+        parse: PageParser,
+        stats: PathStats,
+        validators: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[str], Optional[T]]:
+        """HTTP попытка: (html или None при ошибке, результат strict парсера)."""
+        try:
+            response = await self._get(url, headers=validators or None)
+            if response.status_code == 304:
+                stats.not_modified += 1
+                raise NotModified(url)
+            response.raise_for_status()
+            content = response.text
+        except NotModified:
+            raise
+        except Exception as e:
+            stats.http_error += 1
+            logger.debug(f"⚡ HTTP путь не сработал для {url}: {e}")
+            return None, None
+
+        if self.validators and (response.headers.get('etag') or response.headers.get('last-modified')):
+            self.validators.save_validators(
+                url, response.headers.get('etag'), response.headers.get('last-modified')
+            )
+        await self._record(url, KIND_HTTP, content)
+
+        result = await parse(content, True)
+        if result is None:
+            stats.http_incomplete += 1
+            logger.debug(f"⚡ В HTML не хватает данных, нужен браузер: {url}")
+            return content, None
+
+        stats.http_ok += 1
+        return content, result
+
+    # ========================================
+    # Stats persistence
+    # ========================================
+
+    def _load_stats(self) -> Dict[str, PathStats]:
+        if not self.stats_path or not self.stats_path.exists():
+            return {}
+        try:
+            raw = json.loads(self.stats_path.read_text(encoding='utf-8'))
+            return {pattern: PathStats(**values) for pattern, values in raw.items()}
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось прочитать статистику путей загрузки: {e}")
+            return {}
+
+    def _save_stats(self):
+        if not self.stats_path:
+            return
+        self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats_path.write_text(
+            json.dumps({p: asdict(s) for p, s in self.stats.items()}, ensure_ascii=False, indent=2),
+            encoding='utf-8'
+        )
+
+    def summary(self) -> Dict[str, str]:
+        """Краткая сводка по шаблонам URL."""
+        return {
+            pattern: (
+                f"http {s.http_ok}/{s.http_attempts}, browser {s.browser_ok}"
+                + (f", 304 {s.not_modified}" if s.not_modified else '')
+            )
+            for pattern, s in self.stats.items()
+        }
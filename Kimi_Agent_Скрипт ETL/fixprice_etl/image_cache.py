@@ -0,0 +1,241 @@
+# ============================================
+# Fix-Price ETL Pipeline - Image Cache
+# ============================================
+"""
+Контентно-адресуемый кэш изображений.
+
+Изображение идентифицируется SHA-256 своих байтов. Индекс хранит две связи:
+
+    original_url -> hash          (URL уже скачивался - повторно не качаем)
+    hash -> uploaded_url          (байты уже загружены на API - не загружаем)
+
+Одинаковые картинки разных товаров (варианты, общие фото) загружаются на
+API один раз. Байты лежат на диске в `IMAGE_CACHE_DIR/ab/abcdef...`, общий
+размер ограничен `IMAGE_CACHE_MAX_MB`, при превышении удаляются давно не
+использованные файлы (LRU). Индекс при вытеснении сохраняется - для
+загруженных картинок байты больше не нужны.
+
+Байты в память целиком не читаются: скачивание идет во временный файл с
+подсчетом hash по чанкам, в кэш копируется файл, загрузка на API - из файла.
+"""
+
+import hashlib
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, BinaryIO
+
+from loguru import logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    original_url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    mime_type TEXT,
+    uploaded_url TEXT,
+    on_disk INTEGER NOT NULL DEFAULT 0,
+    last_used REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_blobs_lru ON blobs(on_disk, last_used);
+"""
+
+
+def content_hasher() -> 'hashlib._Hash':
+    """Инкрементальный SHA-256 байтов изображения (hexdigest - ключ кэша)."""
+    return hashlib.sha256()
+
+
+class ImageCache:
+    """Индекс URL -> hash -> uploaded_url и LRU хранилище байтов на диске."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Args:
+            cache_dir: Каталог для байтов и индекса (index.sqlite)
+            max_bytes: Лимит размера байтов на диске
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.conn: Optional[sqlite3.Connection] = None
+        self.disk_bytes = 0
+        self.stats: Dict[str, int] = {
+            'url_hits': 0,
+            'upload_hits': 0,
+            'disk_hits': 0,
+            'downloads': 0,
+            'uploads': 0,
+            'evicted': 0,
+        }
+
+    def open(self) -> 'ImageCache':
+        """Открывает (или создает) индекс кэша."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.cache_dir / 'index.sqlite')
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        self.disk_bytes = self.conn.execute(
+            'SELECT COALESCE(SUM(size_bytes), 0) FROM blobs WHERE on_disk = 1'
+        ).fetchone()[0]
+        logger.info(f"🖼️  Кэш изображений: {self.cache_dir} ({self.disk_bytes / 1024 / 1024:.1f} MB)")
+        return self
+
+    def close(self):
+        """Закрывает индекс."""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            logger.info(f"🖼️  Кэш изображений: {self.stats}")
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / digest[:2] / digest
+
+    # ========================================
+    # Lookups
+    # ========================================
+
+    def lookup_url(self, original_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Запись для уже скачанного URL.
+
+        Returns:
+            Словарь {hash, etag, last_modified, uploaded_url, mime_type, size_bytes}
+            или None
+        """
+        row = self.conn.execute(
+            'SELECT u.hash, u.etag, u.last_modified, b.uploaded_url, b.mime_type, b.size_bytes '
+            'FROM urls u JOIN blobs b ON b.hash = u.hash WHERE u.original_url = ?',
+            (original_url,)
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ('hash', 'etag', 'last_modified', 'uploaded_url', 'mime_type', 'size_bytes')
+        return dict(zip(keys, row))
+
+    def uploaded_url(self, digest: str) -> Optional[str]:
+        """URL на API для байтов с этим хешем (None, если еще не загружались)."""
+        row = self.conn.execute(
+            'SELECT uploaded_url FROM blobs WHERE hash = ?', (digest,)
+        ).fetchone()
+        if row and row[0]:
+            self._touch(digest)
+            return row[0]
+        return None
+
+    def open_blob(self, digest: str) -> Optional[BinaryIO]:
+        """Файл с байтами из дискового хранилища (None, если вытеснены)."""
+        path = self._path(digest)
+        try:
+            # Открытый файл читается и после вытеснения (unlink)
+            blob = open(path, 'rb')
+        except OSError:
+            return None
+        self._touch(digest)
+        self.stats['disk_hits'] += 1
+        return blob
+
+    def _touch(self, digest: str):
+        with self.conn:
+            self.conn.execute('UPDATE blobs SET last_used = ? WHERE hash = ?', (time.time(), digest))
+
+    # ========================================
+    # Updates
+    # ========================================
+
+    def store(
+        self,
+        original_url: str,
+        body: BinaryIO,
+        digest: str,
+        size_bytes: int,
+        mime_type: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """
+        Сохраняет скачанные байты и связь URL -> hash.
+
+        Args:
+            original_url: URL изображения на источнике
+            body: Файл с байтами (позиция после вызова - в начале)
+            digest: SHA-256 байтов (content_hasher)
+            size_bytes: Размер байтов
+        """
+        path = self._path(digest)
+        now = time.time()
+
+        row = self.conn.execute('SELECT on_disk FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        write_to_disk = self.max_bytes > 0 and size_bytes <= self.max_bytes and not (row and row[0])
+
+        if write_to_disk:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            body.seek(0)
+            with open(tmp_path, 'wb') as blob:
+                shutil.copyfileobj(body, blob)
+            tmp_path.replace(path)
+            self.disk_bytes += size_bytes
+        body.seek(0)
+
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO blobs (hash, size_bytes, mime_type, on_disk, last_used) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(hash) DO UPDATE SET on_disk = MAX(on_disk, excluded.on_disk), '
+                'last_used = excluded.last_used',
+                (digest, size_bytes, mime_type, int(write_to_disk), now)
+            )
+            self.conn.execute(
+                'INSERT INTO urls (original_url, hash, etag, last_modified, updated_at) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(original_url) DO UPDATE SET hash = excluded.hash, '
+                'etag = excluded.etag, last_modified = excluded.last_modified, '
+                'updated_at = excluded.updated_at',
+                (original_url, digest, etag, last_modified, datetime.utcnow().isoformat())
+            )
+
+        if self.disk_bytes > self.max_bytes:
+            self._evict()
+
+    def set_uploaded(self, digest: str, uploaded_url: str):
+        """Запоминает URL на API для байтов с этим хешем."""
+        with self.conn:
+            self.conn.execute(
+                'UPDATE blobs SET uploaded_url = ?, last_used = ? WHERE hash = ?',
+                (uploaded_url, time.time(), digest)
+            )
+
+    def _evict(self):
+        """Удаляет давно не использованные файлы, пока размер не станет меньше лимита."""
+        rows = self.conn.execute(
+            'SELECT hash, size_bytes FROM blobs WHERE on_disk = 1 ORDER BY last_used'
+        ).fetchall()
+
+        evicted = []
+        for digest, size_bytes in rows:
+            if self.disk_bytes <= self.max_bytes:
+                break
+            self._path(digest).unlink(missing_ok=True)
+            self.disk_bytes -= size_bytes
+            evicted.append((digest,))
+
+        if evicted:
+            with self.conn:
+                self.conn.executemany('UPDATE blobs SET on_disk = 0 WHERE hash = ?', evicted)
+            self.stats['evicted'] += len(evicted)
+            logger.debug(f"🖼️  Вытеснено из кэша: {len(evicted)} файлов")
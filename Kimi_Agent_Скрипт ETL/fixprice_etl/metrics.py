@@ -0,0 +1,300 @@
+# ============================================
+# Fix-Price ETL Pipeline - Metrics
+# ============================================
+"""
+Метрики этапов: гистограммы задержек, gauges "в работе" и счетчики.
+
+Итоговых счетчиков ParsingStats мало, чтобы понять, что тормозит медленный
+запуск: навигация, ожидания рендеринга и скролла, парсинг, скачивание,
+загрузка изображений или создание товаров. Каждый этап оборачивается в
+`METRICS.track(stage, host)`:
+
+    fixprice_etl_stage_seconds{stage, host}      гистограмма длительности
+    fixprice_etl_stage_in_flight{stage}          сколько сейчас в работе
+    fixprice_etl_stage_errors_total{stage, host} завершились исключением
+
+Плюс ожидание слотов лимитеров и бюджета запросов по хостам, повторы по
+причинам, переданные байты и состояние circuit breaker'ов.
+
+Экспорт (без зависимостей):
+    METRICS_TEXTFILE - файл в формате Prometheus (для textfile collector
+                       node_exporter), обновляется каждые METRICS_INTERVAL с
+    METRICS_PORT     - локальный HTTP: /metrics (Prometheus) и /metrics.json
+    JSON сводка      - раздел "metrics" в output/etl_results_*.json
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from tracing import TRACER
+
+
+PREFIX = 'fixprice_etl_'
+
+# Границы корзин гистограмм (секунды)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HELP = {
+    'stage_seconds': 'Длительность этапа обработки',
+    'stage_in_flight': 'Операций этапа в работе',
+    'stage_errors_total': 'Операций этапа, завершившихся исключением',
+    'slot_wait_seconds': 'Ожидание слота адаптивного лимитера',
+    'limiter_in_flight': 'Занятых слотов лимитера',
+    'limiter_limit': 'Текущий лимит параллельности',
+    'rate_limit_wait_seconds': 'Ожидание токена бюджета запросов хоста',
+    'retries_total': 'Повторов запросов к API по причинам',
+    'retries_denied_total': 'Повторов, не сделанных из-за исчерпанного бюджета',
+    'bytes_total': 'Переданных байт',
+    'circuit_open': 'Circuit breaker эндпоинта разомкнут (1) или замкнут (0)',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, '' if value is None else str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in items)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + '}'
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами (как в Prometheus)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # последняя корзина - +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'Histogram'):
+        """Добавляет наблюдения другой гистограммы с теми же корзинами."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля линейной интерполяцией внутри корзины."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for idx, count in enumerate(self.counts):
+            upper = self.buckets[idx] if idx < len(self.buckets) else self.max
+            if seen + count >= rank and count:
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+            lower = upper
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum_s': round(self.sum, 3),
+            'avg_ms': round(self.sum / self.count * 1000, 1) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5) * 1000, 1),
+            'p95_ms': round(self.quantile(0.95) * 1000, 1),
+            'p99_ms': round(self.quantile(0.99) * 1000, 1),
+            'max_ms': round(self.max * 1000, 1),
+        }
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса."""
+
+    def __init__(self):
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.peaks: Dict[str, Dict[LabelKey, float]] = {}
+
+    # ========================================
+    # Recording
+    # ========================================
+
+    def observe(self, name: str, value: float, **labels: Any):
+        """Значение в гистограмму."""
+        series = self.histograms.setdefault(name, {})
+        key = _labels(labels)
+        if key not in series:
+            series[key] = Histogram()
+        series[key].observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        """Увеличивает счетчик."""
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any):
+        """Устанавливает gauge (пиковое значение запоминается для JSON сводки)."""
+        key = _labels(labels)
+        self.gauges.setdefault(name, {})[key] = value
+        peaks = self.peaks.setdefault(name, {})
+        peaks[key] = max(peaks.get(key, value), value)
+
+    def add_gauge(self, name: str, delta: float, **labels: Any):
+        """Изменяет gauge на delta."""
+        self.set_gauge(name, self.gauges.get(name, {}).get(_labels(labels), 0) + delta, **labels)
+
+    @contextmanager
+    def track(self, stage: str, host: str = '') -> Iterator[None]:
+        """
+        Замер этапа: длительность, "в работе" и ошибки (и span в трассе товара).
+
+        Args:
+            stage: Имя этапа (navigation, parse, image_download, ...)
+            host: Хост запроса (rate_limit.host_key), пусто - этап без сети
+        """
+        self.add_gauge('stage_in_flight', 1, stage=stage)
+        started = time.monotonic()
+        try:
+            with TRACER.span(stage):
+                yield
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                self.inc('stage_errors_total', stage=stage, host=host)
+            raise
+        finally:
+            self.observe('stage_seconds', time.monotonic() - started, stage=stage, host=host)
+            self.add_gauge('stage_in_flight', -1, stage=stage)
+
+    # ========================================
+    # Export
+    # ========================================
+
+    def render_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str):
+            if name in HELP:
+                lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for name, series in sorted(self.counters.items()):
+            header(name, 'counter')
+            for key, value in series.items():
+                lines.append(f"{PREFIX}{name}{_format_labels(key)} {value:g}")
+
+        for name, series in sorted(self.gauges.items()):
+            header(name, 'gauge')
+            for key, value in series.items():
+                lines.append(f"{PREFIX}{name}{_format_labels(key)} {value:g}")
+
+        for name, series in sorted(self.histograms.items()):
+            header(name, 'histogram')
+            for key, hist in series.items():
+                cumulative = 0
+                for bound, count in zip(hist.buckets + (math.inf,), hist.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == math.inf else f"{bound:g}"
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {hist.sum:.6f}")
+                lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {hist.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def merged(self, name: str, label: str) -> Dict[str, Histogram]:
+        """Гистограммы метрики, объединенные по одной метке (например, stage по всем хостам)."""
+        result: Dict[str, Histogram] = {}
+        for key, hist in self.histograms.get(name, {}).items():
+            value = dict(key).get(label, '')
+            result.setdefault(value, Histogram(hist.buckets)).merge(hist)
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        JSON сводка: квантили гистограмм, счетчики и пики gauges.
+
+        Серии именуются по меткам: "stage=navigation,host=fix-price.com".
+        """
+        def name_of(key: LabelKey) -> str:
+            return ','.join(f"{label}={value}" for label, value in key) or 'total'
+
+        return {
+            'histograms': {
+                name: {name_of(key): hist.summary() for key, hist in series.items()}
+                for name, series in self.histograms.items()
+            },
+            'counters': {
+                name: {name_of(key): value for key, value in series.items()}
+                for name, series in self.counters.items()
+            },
+            'gauge_peaks': {
+                name: {name_of(key): value for key, value in series.items()}
+                for name, series in self.peaks.items()
+            },
+        }
+
+    def write_textfile(self, path: str):
+        """Атомарно записывает метрики в файл (textfile collector)."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render_prometheus(), encoding='utf-8')
+        tmp_path.replace(target)
+
+    async def serve(self, port: int, host: str = '127.0.0.1') -> asyncio.AbstractServer:
+        """Локальный HTTP: GET /metrics (Prometheus) и /metrics.json."""
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                request_line = await reader.readline()
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                parts = request_line.decode('latin-1').split()
+                path = parts[1].split('?')[0] if len(parts) > 1 else '/'
+
+                if path == '/metrics':
+                    status, content_type = '200 OK', 'text/plain; version=0.0.4; charset=utf-8'
+                    body = self.render_prometheus().encode('utf-8')
+                elif path == '/metrics.json':
+                    status, content_type = '200 OK', 'application/json; charset=utf-8'
+                    body = json.dumps(self.summary(), ensure_ascii=False).encode('utf-8')
+                else:
+                    status, content_type, body = '404 Not Found', 'text/plain', b'not found\n'
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+            except Exception as e:
+                logger.debug(f"📈 Ошибка HTTP метрик: {e}")
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, host, port)
+        logger.info(f"📈 Метрики: http://{host}:{port}/metrics")
+        return server
+
+
+# Реестр процесса: этапы в разных модулях пишут в него напрямую
+METRICS = MetricsRegistry()
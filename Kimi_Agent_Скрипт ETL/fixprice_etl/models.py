@@ -92,6 +92,11 @@ class Product(BaseModel):
             return float(v) if v else 0.0
         return float(v)
 
+    @property
+    def primary_image_index(self) -> int:
+        """Индекс главного изображения (первое, если не отмечено)."""
+        return next((idx for idx, img in enumerate(self.images) if img.is_primary), 0)
+
     @property
     def discount_percent(self) -> Optional[float]:
         """Вычисляет процент скидки."""
@@ -99,8 +104,26 @@ class Product(BaseModel):
             return round((self.old_price - self.price) / self.old_price * 100, 2)
         return None
 
-    def to_api_payload(self) -> Dict[str, Any]:
-        """Формирует JSON payload для отправки на ваш API."""
+    def images_payload(self, images: Optional[List[ProductImage]] = None) -> List[Dict[str, Any]]:
+        """Изображения для payload API (по умолчанию все изображения товара)."""
+        return [
+            {
+                "url": img.uploaded_url or img.original_url,
+                "is_primary": img.is_primary,
+                "filename": img.filename
+            }
+            for img in (self.images if images is None else images)
+            if img.uploaded_url or img.original_url
+        ]
+
+    def to_api_payload(self, images: Optional[List[ProductImage]] = None) -> Dict[str, Any]:
+        """
+        Формирует JSON payload для отправки на ваш API.
+
+        Args:
+            images: Только эти изображения (по умолчанию все), например
+                главное - остальные дозагружаются после создания товара
+        """
         payload = {
             "external_id": self.source_id,
             "source_url": self.source_url,
@@ -113,14 +136,7 @@ class Product(BaseModel):
             "subcategory": self.subcategory,
             "categories_path": self.categories_path,
             "specifications": self.specs.to_dict(),
-            "images": [
-                {
-                    "url": img.uploaded_url or img.original_url,
-                    "is_primary": img.is_primary,
-                    "filename": img.filename
-                }
-                for img in self.images if img.uploaded_url or img.original_url
-            ],
+            "images": self.images_payload(images),
             "in_stock": self.in_stock,
             "stock_quantity": self.stock_quantity,
             "sku": self.sku,
@@ -135,6 +151,31 @@ class Product(BaseModel):
         return {k: v for k, v in payload.items() if v is not None}
 
 
+class PriceUpdate(BaseModel):
+    """Частичное обновление товара из карточки на странице листинга."""
+    source_id: str = Field(..., description="ID товара из URL (SKU в карточке нет)")
+    source_url: str = Field(..., description="URL товара на fix-price.com")
+    title: Optional[str] = Field(None, description="Название из карточки")
+    price: Optional[float] = Field(None, ge=0, description="Текущая цена")
+    old_price: Optional[float] = Field(None, ge=0, description="Старая цена")
+    in_stock: bool = Field(default=True, description="В наличии")
+
+    def changed_fields(self, previous: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Поля, отличающиеся от последних отправленных на API.
+
+        Цена без значения (не распознана в карточке) не считается изменением.
+        """
+        current = {'price': self.price, 'old_price': self.old_price, 'in_stock': self.in_stock}
+        if self.price is None:
+            current.pop('price')
+            current.pop('old_price')
+        return {
+            key: value for key, value in current.items()
+            if previous.get(key) != value
+        }
+
+
 class Category(BaseModel):
     """Модель категории."""
     name: str = Field(..., description="Название категории")
@@ -152,13 +193,19 @@ class ParsingStats(BaseModel):
     categories_found: int = 0
     products_found: int = 0
     products_parsed: int = 0
-    products_filtered: int = 0  # После применения 50% фильтра
+    products_filtered: int = 0  # В выборке PRODUCT_SAMPLE_PERCENT (до парсинга)
     products_uploaded: int = 0
+    products_unchanged: int = 0  # Инкрементальный режим: не изменились, загрузка пропущена
+    products_updated: int = 0  # Синхронизация: уже были на API, отправлены измененные поля
+    products_deactivated: int = 0  # Синхронизация: пропали с источника
     products_failed: int = 0
     
     # Ошибки
     errors: List[Dict[str, Any]] = Field(default_factory=list)
     
+    # Адаптивные лимиты по имени (source, download, upload, create): текущий, пик, снижения
+    concurrency: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    
     @property
     def duration_seconds(self) -> Optional[float]:
         """Длительность выполнения в секундах."""
@@ -171,7 +218,11 @@ class ParsingStats(BaseModel):
         """Процент успешно загруженных товаров."""
         if self.products_filtered == 0:
             return 0.0
-        return round(self.products_uploaded / self.products_filtered * 100, 2)
+        return round(
+            (self.products_uploaded + self.products_updated + self.products_unchanged)
+            / self.products_filtered * 100,
+            2
+        )
 
 
 class APIResponse(BaseModel):
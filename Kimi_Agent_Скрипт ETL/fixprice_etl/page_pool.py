@@ -0,0 +1,134 @@
+# ============================================
+# Fix-Price ETL Pipeline - Playwright Page Pool
+# ============================================
+"""
+Пул переиспользуемых страниц Playwright.
+
+Создание страницы (new_page + set_extra_http_headers + add_init_script)
+стоит несколько round-trip'ов к браузеру. Пул держит "прогретые" страницы
+и выдает их в аренду, сбрасывая между использованиями и пересоздавая
+после N навигаций или после ошибки.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+
+from playwright.async_api import Page
+from loguru import logger
+
+
+@dataclass
+class PagePoolStats:
+    """Счетчики работы пула."""
+    hits: int = 0        # Выдана уже прогретая страница
+    misses: int = 0      # Пришлось создать новую страницу
+    recycled: int = 0    # Страница закрыта и будет пересоздана
+    errors: int = 0      # Аренды, завершившиеся ошибкой
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class PagePool:
+    """
+    Пул страниц фиксированного размера.
+
+    Использование:
+        async with pool.lease() as page:
+            await page.goto(url)
+    """
+
+    def __init__(
+        self,
+        page_factory: Callable[[], Awaitable[Page]],
+        size: int,
+        max_uses: int = 50
+    ):
+        """
+        Args:
+            page_factory: Корутина, создающая новую настроенную страницу
+            size: Максимальное количество одновременно открытых страниц
+            max_uses: Количество навигаций, после которого страница пересоздается
+        """
+        self.page_factory = page_factory
+        self.size = size
+        self.max_uses = max_uses
+        self.stats = PagePoolStats()
+
+        self._idle: List[Page] = []
+        self._uses: Dict[int, int] = {}
+        self._slots = asyncio.Semaphore(size)
+        self._closed = False
+
+    async def warm(self):
+        """Заранее создает все страницы пула."""
+        pages = await asyncio.gather(*(self.page_factory() for _ in range(self.size)))
+        for page in pages:
+            self._uses[id(page)] = 0
+            self._idle.append(page)
+        logger.info(f"🔥 Пул страниц прогрет: {self.size} шт.")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Page]:
+        """Выдает страницу в аренду и возвращает ее в пул после использования."""
+        async with self._slots:
+            page = await self._acquire()
+            failed = False
+            try:
+                yield page
+            except BaseException:
+                failed = True
+                self.stats.errors += 1
+                raise
+            finally:
+                await self._release(page, failed)
+
+    async def _acquire(self) -> Page:
+        while self._idle:
+            page = self._idle.pop()
+            if not page.is_closed():
+                self.stats.hits += 1
+                return page
+            self._uses.pop(id(page), None)
+
+        self.stats.misses += 1
+        page = await self.page_factory()
+        self._uses[id(page)] = 0
+        return page
+
+    async def _release(self, page: Page, failed: bool):
+        uses = self._uses.get(id(page), 0) + 1
+        self._uses[id(page)] = uses
+
+        if failed or uses >= self.max_uses or self._closed:
+            await self._discard(page)
+            return
+
+        try:
+            # Сбрасываем состояние: останавливаем JS прошлой страницы и освобождаем DOM
+            await page.goto('about:blank')
+        except Exception as e:
+            logger.debug(f"⚠️ Не удалось сбросить страницу: {e}")
+            await self._discard(page)
+            return
+
+        self._idle.append(page)
+
+    async def _discard(self, page: Page):
+        self._uses.pop(id(page), None)
+        if not self._closed:
+            self.stats.recycled += 1
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        """Закрывает все свободные страницы пула."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for page in idle:
+            await self._discard(page)
+        logger.info(f"📄 Пул страниц: {self.stats.to_dict()}")
@@ -0,0 +1,92 @@
+# ============================================
+# Fix-Price ETL Pipeline - Parse Workers
+# ============================================
+"""
+Пул воркеров для CPU-парсинга HTML вне event loop.
+
+BeautifulSoup на большой странице занимает десятки миллисекунд CPU. Если
+выполнять его прямо в корутине, в это время стоят все остальные навигации,
+загрузки и пробуждения семафоров. Пул выносит парсинг в отдельные процессы
+(или потоки) и отдает корутине только компактный plain-dict результат.
+
+Режимы:
+- process - ProcessPoolExecutor, парсинг масштабируется по ядрам
+- thread  - ThreadPoolExecutor, без накладных расходов на pickle (для малых запусков)
+- inline  - прямо в event loop (отладка, тесты)
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from metrics import METRICS
+
+
+PARSE_MODE_PROCESS = 'process'
+PARSE_MODE_THREAD = 'thread'
+PARSE_MODE_INLINE = 'inline'
+
+
+class ParseWorkerPool:
+    """
+    Асинхронный фасад над пулом парсинг-воркеров.
+
+    Использование:
+        fields = await pool.run(html_parsing.parse_product, html, url)
+    """
+
+    def __init__(self, mode: str = PARSE_MODE_PROCESS, workers: int = 0):
+        """
+        Args:
+            mode: process, thread или inline
+            workers: Количество воркеров (0 = по числу CPU)
+        """
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.mode == PARSE_MODE_INLINE:
+            return None
+
+        if self._executor is None:
+            if self.mode == PARSE_MODE_PROCESS:
+                # spawn: не форкаем процесс с запущенным event loop и Playwright
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='parse'
+                )
+            logger.info(f"🧮 Парсинг-воркеры: {self.mode} x{self.workers}")
+
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Выполняет функцию парсинга в пуле.
+
+        Функция и аргументы должны быть picklable (модульные функции
+        и строки), результат - plain-данные.
+        """
+        executor = self._get_executor()
+        with METRICS.track('parse'):
+            if executor is None:
+                return func(*args, **kwargs)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    def close(self):
+        """Останавливает воркеры."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -5,19 +5,36 @@
 Главный ETL Pipeline - оркестратор процесса парсинга и загрузки.
 """
 
+import argparse
 import asyncio
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Dict, Any, Union, Set
 from datetime import datetime
 
 from loguru import logger
 from tqdm import tqdm
 
 from config import Config, init_config
-from models import Product, Category, ParsingStats
+from models import Product, Category, ParsingStats, PriceUpdate
 from scraper import FixPriceScraper
 from api_client import APIClient
+from catalog_index import CatalogIndex
+from rate_limit import HostRateLimits
+from html_parsing import extract_product_id
+from sync_engine import SyncEngine, SYNC_CREATE, SYNC_UPDATED, SYNC_UNCHANGED
+from sampling import ProductSampler, CategorySample
+from metrics import METRICS
+from tracing import TRACER
+from response_archive import ResponseArchive
+from state_store import (
+    RunStateStore,
+    STATUS_PARSED,
+    STATUS_SKIPPED,
+    STATUS_UPLOADED,
+    STATUS_FAILED
+)
 
 
 class FixPriceETLPipeline:
@@ -25,16 +42,39 @@ class FixPriceETLPipeline:
     Главный ETL Pipeline для парсинга fix-price.com и загрузки на ваш сервер.
     
     Этапы работы:
-    1. EXTRACT: Парсинг категорий и товаров с fix-price.com
-    2. TRANSFORM: Фильтрация 50% товаров, валидация данных
+    1. EXTRACT: Обход категорий, выборка PRODUCT_SAMPLE_PERCENT товаров по URL
+       и парсинг только товаров выборки
+    2. TRANSFORM: Валидация данных
     3. LOAD: Загрузка изображений и создание товаров на вашем API
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, resume: bool = False):
         self.config = config
+        self.resume = resume
         self.stats = ParsingStats()
         self.scraper: Optional[FixPriceScraper] = None
         self.api_client: Optional[APIClient] = None
+        self.state = RunStateStore(config.STATE_DB_PATH)
+        self.catalog = CatalogIndex(config.CATALOG_INDEX_PATH)
+        # Один бюджет запросов по хостам на скрапер и API клиент
+        self.rate_limits = HostRateLimits.from_config(config)
+        # Архив ответов (ARCHIVE_MODE): запись страниц и изображений или повтор из него
+        self.archive = ResponseArchive.from_config(config)
+        # Выборка товаров по хешу ID - до парсинга, стабильная между запусками
+        self.sampler = ProductSampler(config.sample_rate, config.SAMPLE_SEED)
+        # Трассировка пути TRACE_SAMPLE_PERCENT товаров (TRACE_FILE)
+        TRACER.configure(
+            config.TRACE_FILE, config.TRACE_SAMPLE_PERCENT, config.TRACE_MAX_EVENTS, config.SAMPLE_SEED
+        )
+        # Инкрементальный режим: url -> (отпечаток, снимок товара до загрузки)
+        self._pending_fingerprints: Dict[str, tuple[str, str]] = {}
+        # Синхронизация: ID из URL всех товаров, найденных в этом обходе
+        # (source_id известен только для распарсенных, а выборка парсит не все)
+        self.sync: Optional[SyncEngine] = None
+        self._seen_url_ids: Set[str] = set()
+        # Экспорт метрик: HTTP сервер и периодическая запись textfile
+        self._metrics_server: Optional[asyncio.AbstractServer] = None
+        self._metrics_task: Optional[asyncio.Task] = None
         
         # Настройка логирования
         self._setup_logging()
@@ -75,12 +115,31 @@ class FixPriceETLPipeline:
         logger.info("🚀 Fix-Price ETL Pipeline - Запуск")
         logger.info("=" * 60)
         
+        await self._start_metrics()
+        
+        # Открываем хранилище состояния
+        self.state.open()
+        if self.resume:
+            logger.info(f"♻️  Продолжение запуска: {self.state.progress()}")
+        else:
+            self.state.reset()
+        self.catalog.open()
+        if self.archive:
+            self.archive.open()
+        
         # Инициализируем скрапер
-        self.scraper = FixPriceScraper(self.config)
+        self.scraper = FixPriceScraper(
+            self.config,
+            page_index=self.catalog if self.config.INCREMENTAL_MODE else None,
+            rate_limits=self.rate_limits,
+            archive=self.archive
+        )
         await self.scraper.init_browser()
         
         # Инициализируем API клиент
-        self.api_client = APIClient(self.config)
+        self.api_client = APIClient(self.config, rate_limits=self.rate_limits, archive=self.archive)
+        if self.config.SYNC_MODE:
+            self.sync = SyncEngine(self.config, self.api_client, self.catalog)
         
         # Проверяем доступность API
         if not await self.api_client.health_check():
@@ -94,10 +153,67 @@ class FixPriceETLPipeline:
             await self.scraper.close()
         if self.api_client:
             await self.api_client.close()
+        self.state.close()
+        self.catalog.close()
+        if self.archive:
+            await self.archive.close()
+        if self.rate_limits.summary():
+            logger.info(f"⏳ Бюджет запросов: {self.rate_limits.summary()}")
         
         # Финальная статистика
         self.stats.finished_at = datetime.utcnow()
+        self._update_concurrency_stats()
         self._print_final_stats()
+        await self._stop_metrics()
+        TRACER.write()
+    
+    async def _start_metrics(self):
+        """Запускает экспорт метрик (METRICS_PORT, METRICS_TEXTFILE)."""
+        if self.config.METRICS_PORT:
+            try:
+                self._metrics_server = await METRICS.serve(self.config.METRICS_PORT)
+            except OSError as e:
+                logger.warning(f"⚠️ HTTP метрик не запущен на порту {self.config.METRICS_PORT}: {e}")
+        if self.config.METRICS_TEXTFILE:
+            self._metrics_task = asyncio.create_task(self._write_metrics_periodically())
+    
+    async def _write_metrics_periodically(self):
+        """Обновляет METRICS_TEXTFILE каждые METRICS_INTERVAL секунд."""
+        while True:
+            await asyncio.sleep(self.config.METRICS_INTERVAL)
+            try:
+                METRICS.write_textfile(self.config.METRICS_TEXTFILE)
+            except OSError as e:
+                logger.warning(f"⚠️ Не удалось записать метрики: {e}")
+    
+    async def _stop_metrics(self):
+        """Останавливает экспорт и записывает итоговые метрики."""
+        if self._metrics_task:
+            self._metrics_task.cancel()
+            try:
+                await self._metrics_task
+            except asyncio.CancelledError:
+                pass
+            self._metrics_task = None
+        if self.config.METRICS_TEXTFILE:
+            try:
+                METRICS.write_textfile(self.config.METRICS_TEXTFILE)
+                logger.info(f"📈 Метрики сохранены: {self.config.METRICS_TEXTFILE}")
+            except OSError as e:
+                logger.warning(f"⚠️ Не удалось записать метрики: {e}")
+        if self._metrics_server:
+            self._metrics_server.close()
+            await self._metrics_server.wait_closed()
+            self._metrics_server = None
+    
+    def _update_concurrency_stats(self):
+        """Снимок адаптивных лимитов и ожидания слотов в статистику запуска."""
+        limiters = []
+        if self.scraper:
+            limiters.append(self.scraper.source_limiter)
+        if self.api_client:
+            limiters += self.api_client.limiters
+        self.stats.concurrency = {limiter.name: limiter.snapshot() for limiter in limiters}
     
     def _print_final_stats(self):
         """Выводит финальную статистику."""
@@ -108,10 +224,23 @@ class FixPriceETLPipeline:
         logger.info(f"📂 Категорий найдено: {self.stats.categories_found}")
         logger.info(f"📦 Товаров найдено: {self.stats.products_found}")
         logger.info(f"🔍 Товаров распарсено: {self.stats.products_parsed}")
-        logger.info(f"🎯 Товаров отфильтровано (50%): {self.stats.products_filtered}")
+        logger.info(
+            f"🎯 Товаров в выборке ({self.config.PRODUCT_SAMPLE_PERCENT}%): {self.stats.products_filtered}"
+        )
         logger.info(f"✅ Товаров загружено: {self.stats.products_uploaded}")
+        if self.config.SYNC_MODE:
+            logger.info(f"✏️  Товаров обновлено: {self.stats.products_updated}")
+            logger.info(f"🗑️  Товаров деактивировано: {self.stats.products_deactivated}")
+        if self.config.INCREMENTAL_MODE or self.config.SYNC_MODE:
+            logger.info(f"💤 Без изменений (загрузка пропущена): {self.stats.products_unchanged}")
         logger.info(f"❌ Ошибок: {self.stats.products_failed}")
         logger.info(f"📈 Успешность: {self.stats.success_rate}%")
+        for name, snapshot in self.stats.concurrency.items():
+            logger.info(
+                f"🎚️  Лимит {name}: {snapshot['limit']} "
+                f"(пик {snapshot['peak_limit']}, снижений {snapshot['cuts']}, "
+                f"ожидание слота: ср. {snapshot['wait_avg_ms']} мс, макс. {snapshot['wait_max_ms']} мс)"
+            )
         
         if self.stats.errors:
             logger.info(f"\n⚠️  Ошибки ({len(self.stats.errors)}):")
@@ -135,7 +264,12 @@ class FixPriceETLPipeline:
         logger.info("📥 ЭТАП 1: EXTRACT - Получение категорий")
         logger.info("=" * 60)
         
-        categories = await self.scraper.get_categories()
+        categories = self.state.load_categories() if self.resume else []
+        if categories:
+            logger.info("♻️  Категории восстановлены из хранилища состояния")
+        else:
+            categories = await self.scraper.get_categories()
+            self.state.save_categories(categories)
         self.stats.categories_found = len(categories)
         
         logger.info(f"✅ Найдено категорий: {len(categories)}")
@@ -153,36 +287,43 @@ class FixPriceETLPipeline:
         max_products_per_category: Optional[int] = None
     ) -> List[str]:
         """
-        Этап EXTRACT: Получение URL товаров из категорий.
+        Этап EXTRACT: Получение URL товаров из категорий и выборка.
         
         Args:
             categories: Список категорий
             max_products_per_category: Макс. товаров на категорию
             
         Returns:
-            Список URL товаров
+            Список URL товаров выборки (остальные не парсятся)
         """
         logger.info("\n" + "=" * 60)
         logger.info("📥 ЭТАП 1: EXTRACT - Получение товаров из категорий")
         logger.info("=" * 60)
         
-        all_product_urls = []
+        done_categories = self.state.done_categories()
+        category_urls: Dict[str, List[str]] = {}
+        # Категории обходятся параллельно, частоту запросов ограничивает
+        # общий бюджет хоста источника (CRAWL_RATE_LIMIT)
+        semaphore = asyncio.Semaphore(self.config.CATEGORY_CONCURRENCY)
         
-        # Прогресс-бар для категорий
-        with tqdm(total=len(categories), desc="📂 Категории", unit="cat") as pbar:
-            for category in categories:
+        async def crawl_category(category: Category):
+            if category.url in done_categories:
+                # Категория обойдена в прошлом запуске
+                category_urls[category.url] = self.state.get_category_product_urls(category.url)
+                return
+            
+            async with semaphore:
                 try:
                     urls = await self.scraper.get_products_from_category(
                         category.url,
                         max_pages=max_products_per_category // 24 if max_products_per_category else None
                     )
                     
-                    all_product_urls.extend(urls)
-                    pbar.update(1)
-                    pbar.set_postfix({"products": len(all_product_urls)})
-                    
-                    # Задержка между категориями
-                    await asyncio.sleep(self.config.REQUEST_DELAY)
+                    self.state.add_product_urls(category.url, urls)
+                    # Ошибка страницы листинга пробрасывается сюда не дойдя до
+                    # отметки: --resume обойдет такую категорию заново
+                    self.state.mark_category_done(category.url)
+                    category_urls[category.url] = urls
                     
                 except Exception as e:
                     logger.error(f"❌ Ошибка при обработке категории {category.name}: {e}")
@@ -190,15 +331,26 @@ class FixPriceETLPipeline:
                         "category": category.name,
                         "error": str(e)
                     })
-                    pbar.update(1)
         
-        # Убираем дубликаты
-        all_product_urls = list(dict.fromkeys(all_product_urls))
+        # Прогресс-бар для категорий
+        with tqdm(total=len(categories), desc="📂 Категории", unit="cat") as pbar:
+            async def crawl_with_progress(category: Category):
+                await crawl_category(category)
+                pbar.update(1)
+                pbar.set_postfix({"products": sum(len(urls) for urls in category_urls.values())})
+            
+            await asyncio.gather(*(crawl_with_progress(category) for category in categories))
+        
+        # Порядок категорий сохраняется, дубликаты убираются
+        all_product_urls = list(dict.fromkeys(
+            url for category in categories for url in category_urls.get(category.url, [])
+        ))
         self.stats.products_found = len(all_product_urls)
+        self._seen_url_ids.update(extract_product_id(url) for url in all_product_urls)
         
         logger.info(f"✅ Всего уникальных товаров: {len(all_product_urls)}")
         
-        return all_product_urls
+        return self.transform_sample_urls(categories, category_urls)
     
     async def extract_product_details(self, product_urls: List[str]) -> List[Product]:
         """
@@ -214,23 +366,35 @@ class FixPriceETLPipeline:
         logger.info("📥 ЭТАП 1: EXTRACT - Парсинг деталей товаров")
         logger.info("=" * 60)
         
-        products = []
+        # Товары, распарсенные в прошлом запуске, не парсим повторно
+        products_by_url = {
+            url: product for url, (_, product) in self.state.load_products(product_urls).items()
+        }
+        pending_urls = [url for url in product_urls if url not in products_by_url]
+        
+        if products_by_url:
+            logger.info(f"♻️  Восстановлено из хранилища: {len(products_by_url)} товаров")
         
         # Прогресс-бар
-        with tqdm(total=len(product_urls), desc="🔍 Парсинг товаров", unit="product") as pbar:
+        with tqdm(total=len(pending_urls), desc="🔍 Парсинг товаров", unit="product") as pbar:
             def update_progress():
                 pbar.update(1)
             
-            # Парсим батчами
-            batch_size = self.config.CONCURRENCY_LIMIT * 2
+            # Парсим батчами (внутри батча параллельность регулирует лимитер источника)
+            batch_size = self.config.max_concurrency * 2
             
-            for i in range(0, len(product_urls), batch_size):
-                batch = product_urls[i:i + batch_size]
+            for i in range(0, len(pending_urls), batch_size):
+                batch = pending_urls[i:i + batch_size]
                 batch_products = await self.scraper.parse_products_batch(batch, update_progress)
-                products.extend(batch_products)
                 
-                logger.info(f"   Прогресс: {len(products)}/{len(product_urls)} товаров")
+                for product in batch_products:
+                    self.state.save_product(product, STATUS_PARSED)
+                    products_by_url[product.source_url] = product
+                
+                logger.info(f"   Прогресс: {len(products_by_url)}/{len(product_urls)} товаров")
         
+        # Сохраняем исходный порядок URL, чтобы выборка была воспроизводимой
+        products = [products_by_url[url] for url in product_urls if url in products_by_url]
         self.stats.products_parsed = len(products)
         
         logger.info(f"✅ Успешно распарсено: {len(products)} товаров")
@@ -241,43 +405,49 @@ class FixPriceETLPipeline:
     # TRANSFORM Phase
     # ========================================
     
-    def transform_filter_products(self, products: List[Product]) -> List[Product]:
+    def transform_sample_urls(
+        self,
+        categories: List[Category],
+        category_urls: Dict[str, List[str]]
+    ) -> List[str]:
         """
-        Этап TRANSFORM: Фильтрация 50% товаров.
+        Этап TRANSFORM: Выборка PRODUCT_SAMPLE_PERCENT товаров по URL - до парсинга.
+        
+        Товар в выборке, если хеш его ID меньше sample_rate (см. sampling.py):
+        выборка стабильна между запусками, в каждой категории - около
+        PRODUCT_SAMPLE_PERCENT товаров, товары вне выборки не загружаются.
         
         Args:
-            products: Список товаров
+            categories: Категории в порядке обхода
+            category_urls: URL товаров по категориям
             
         Returns:
-            Отфильтрованный список (50% от исходного)
+            URL товаров выборки
         """
         logger.info("\n" + "=" * 60)
-        logger.info("🔧 ЭТАП 2: TRANSFORM - Фильтрация товаров")
+        logger.info(f"🔧 ЭТАП 2: TRANSFORM - Выборка {self.config.PRODUCT_SAMPLE_PERCENT}% товаров")
         logger.info("=" * 60)
         
-        # Сортируем по категориям для равномерной выборки
-        products_by_category = {}
-        for product in products:
-            cat = product.category or "Без категории"
-            if cat not in products_by_category:
-                products_by_category[cat] = []
-            products_by_category[cat].append(product)
-        
-        filtered_products = []
+        names = {category.url: category.name for category in categories}
+        sampled = self.sampler.sample({
+            category.url: category_urls.get(category.url, []) for category in categories
+        })
         
-        # Применяем 50% фильтр к каждой категории
-        for category, cat_products in products_by_category.items():
-            # Берем каждый второй товар (even indices: 0, 2, 4...)
-            sampled = [p for i, p in enumerate(cat_products) if i % 2 == 0]
-            filtered_products.extend(sampled)
-            
-            logger.info(f"   {category}: {len(cat_products)} → {len(sampled)} товаров")
+        sampled_urls = []
+        for category_url, urls in sampled.items():
+            if urls:
+                logger.info(
+                    f"   {names[category_url]}: {len(category_urls[category_url])} → {len(urls)} товаров"
+                )
+            for url in urls:
+                TRACER.discovered(url, category=names[category_url])
+            sampled_urls.extend(urls)
         
-        self.stats.products_filtered = len(filtered_products)
+        self.stats.products_filtered = len(sampled_urls)
         
-        logger.info(f"✅ После фильтрации: {len(filtered_products)} товаров")
+        logger.info(f"✅ В выборке: {len(sampled_urls)} товаров")
         
-        return filtered_products
+        return sampled_urls
     
     def transform_validate_products(self, products: List[Product]) -> List[Product]:
         """
@@ -297,14 +467,7 @@ class FixPriceETLPipeline:
         invalid_count = 0
         
         for product in products:
-            errors = []
-            
-            # Проверяем обязательные поля
-            if not product.title or len(product.title) < 2:
-                errors.append("Некорректное название")
-            
-            if product.price is None or product.price < 0:
-                errors.append("Некорректная цена")
+            errors = self._validate_product(product)
             
             if errors:
                 product.errors.extend(errors)
@@ -318,6 +481,18 @@ class FixPriceETLPipeline:
         
         return valid_products
     
+    def _validate_product(self, product: Product) -> List[str]:
+        """Проверяет обязательные поля товара и возвращает список ошибок."""
+        errors = []
+        
+        if not product.title or len(product.title) < 2:
+            errors.append("Некорректное название")
+        
+        if product.price is None or product.price < 0:
+            errors.append("Некорректная цена")
+        
+        return errors
+    
     # ========================================
     # LOAD Phase
     # ========================================
@@ -336,24 +511,132 @@ class FixPriceETLPipeline:
         logger.info("📤 ЭТАП 3: LOAD - Загрузка на сервер")
         logger.info("=" * 60)
         
+        # Товары, загруженные в прошлом запуске, повторно не отправляем
+        pending = [p for p in products if not p.uploaded_to_api]
+        already_uploaded = len(products) - len(pending)
+        
+        if already_uploaded:
+            logger.info(f"♻️  Уже загружено ранее: {already_uploaded}")
+        
+        if self.config.INCREMENTAL_MODE:
+            pending = [p for p in pending if not self._skip_unchanged(p)]
+            logger.info(f"💤 Без изменений с прошлой загрузки: {self.stats.products_unchanged}")
+        
+        if self.sync:
+            # Известные API товары обновляются PATCH, создаются только новые
+            pending = await self._sync_existing(pending)
+            logger.info(
+                f"✏️  Обновлено: {self.stats.products_updated}, "
+                f"без изменений: {self.stats.products_unchanged}, новых: {len(pending)}"
+            )
+        
         # Прогресс-бар
-        with tqdm(total=len(products), desc="📤 Загрузка товаров", unit="product") as pbar:
+        with tqdm(total=len(pending), desc="📤 Загрузка товаров", unit="product") as pbar:
             def update_progress():
                 pbar.update(1)
             
             success_count, error_count = await self.api_client.process_products_batch(
-                products, 
-                update_progress
+                pending, 
+                update_progress,
+                self._record_upload
             )
         
+        success_count += already_uploaded
         self.stats.products_uploaded = success_count
-        self.stats.products_failed = error_count
+        self.stats.products_failed += error_count
         
         logger.info(f"✅ Успешно загружено: {success_count}")
-        logger.info(f"❌ Ошибок: {error_count}")
+        logger.info(f"❌ Ошибок: {self.stats.products_failed}")
         
         return success_count, error_count
     
+    def _record_upload(self, product: Product, success: bool):
+        """Фиксирует результат загрузки в состоянии запуска и индексе каталога."""
+        self.state.record_upload(product, success)
+        pending = self._pending_fingerprints.pop(product.source_url, None)
+        if success:
+            self.catalog.record_product(product)
+            if pending:
+                fingerprint, snapshot = pending
+                self.catalog.record_page(
+                    product.source_url, fingerprint, snapshot, product.api_product_id
+                )
+    
+    async def _sync_existing(
+        self,
+        products: List[Product],
+        on_done: Optional[Callable[[Product], None]] = None
+    ) -> List[Product]:
+        """
+        Синхронизирует товары, уже отправленные на API (SYNC_MODE).
+        
+        Args:
+            products: Товары для загрузки
+            on_done: Callback для товаров, обработанных синхронизацией
+            
+        Returns:
+            Товары, которые нужно создать
+        """
+        outcomes = await asyncio.gather(*(self.sync.sync_product(p) for p in products))
+        
+        to_create = []
+        for product, outcome in zip(products, outcomes):
+            if outcome == SYNC_CREATE:
+                to_create.append(product)
+                continue
+            
+            if outcome == SYNC_UNCHANGED:
+                self.state.record_upload(product, True)
+                self.stats.products_unchanged += 1
+            else:
+                self._record_upload(product, outcome == SYNC_UPDATED)
+                if outcome == SYNC_UPDATED:
+                    self.stats.products_updated += 1
+                else:
+                    self.stats.products_failed += 1
+            
+            if on_done:
+                on_done(product)
+        
+        return to_create
+    
+    async def _deactivate_missing(self, crawl_complete: bool):
+        """
+        Деактивирует на API товары, пропавшие с источника (SYNC_MODE).
+        
+        Args:
+            crawl_complete: Обход был полным - без ограничений и ошибок категорий
+        """
+        if not self.sync or not self.config.SYNC_DEACTIVATE_MISSING:
+            return
+        
+        if not crawl_complete or any('category' in error for error in self.stats.errors):
+            logger.info("ℹ️  Деактивация пропавших товаров пропущена: обход каталога был неполным")
+            return
+        
+        self.stats.products_deactivated = await self.sync.deactivate_missing(self._seen_url_ids)
+    
+    def _skip_unchanged(self, product: Product) -> bool:
+        """
+        Инкрементальный режим: True, если payload товара не изменился с прошлой
+        загрузки (товар помечается загруженным, process_product не вызывается).
+        
+        Для измененных товаров запоминает отпечаток и снимок до загрузки
+        изображений - их сохранит _record_upload после успешной загрузки.
+        """
+        fingerprint = CatalogIndex.fingerprint(product)
+        api_product_id = self.catalog.unchanged_product_id(product.source_url, fingerprint)
+        
+        if api_product_id:
+            product.api_product_id = api_product_id
+            product.uploaded_to_api = True
+            self.state.record_upload(product, True)
+            self.stats.products_unchanged += 1
+            return True
+        
+        self._pending_fingerprints[product.source_url] = (fingerprint, product.model_dump_json())
+        return False
+    
     # ========================================
     # Full Pipeline
     # ========================================
@@ -379,24 +662,21 @@ class FixPriceETLPipeline:
                 categories = categories[:categories_limit]
                 logger.info(f"⚙️  Ограничение категорий: {len(categories)}")
             
-            # 2. Получаем URL товаров
+            # 2. Получаем URL товаров и выборку (до парсинга)
             product_urls = await self.extract_products_from_categories(
                 categories,
                 max_products_per_category
             )
             
-            # 3. Парсим детали товаров
+            # 3. Парсим детали только товаров выборки
             products = await self.extract_product_details(product_urls)
             
             # ========== TRANSFORM ==========
-            # 4. Фильтруем 50% товаров
-            products = self.transform_filter_products(products)
-            
-            # 5. Валидируем данные
+            # 4. Валидируем данные
             products = self.transform_validate_products(products)
             
             # ========== LOAD ==========
-            # 6. Загружаем на сервер
+            # 5. Загружаем на сервер
             if products:
                 success, errors = await self.load_products_to_api(products)
                 
@@ -405,11 +685,368 @@ class FixPriceETLPipeline:
             else:
                 logger.warning("⚠️ Нет товаров для загрузки")
             
+            await self._deactivate_missing(
+                categories_limit is None and max_products_per_category is None
+            )
+            
         except Exception as e:
             logger.exception(f"❌ Критическая ошибка в pipeline: {e}")
             raise
     
-    async def _save_results(self, products: List[Product]):
+    # ========================================
+    # Streaming Pipeline
+    # ========================================
+    
+    async def run_streaming_pipeline(
+        self,
+        categories_limit: Optional[int] = None,
+        max_products_per_category: Optional[int] = None
+    ):
+        """
+        Запускает ETL pipeline в потоковом режиме.
+        
+        Этапы работают одновременно и связаны ограниченными очередями:
+        
+            категории → выборка → [url_queue] → парсинг + валидация → [load_queue] → LOAD
+        
+        Когда очередь заполнена, предыдущий этап ждет (backpressure), поэтому
+        в памяти одновременно находится не больше STREAM_QUEUE_SIZE товаров
+        на каждую очередь, а первые загрузки начинаются сразу после первой
+        страницы каталога.
+        
+        Args:
+            categories_limit: Ограничение количества категорий (None = все)
+            max_products_per_category: Макс. товаров на категорию
+        """
+        logger.info("\n" + "=" * 60)
+        logger.info("🌊 Потоковый режим: EXTRACT → TRANSFORM → LOAD")
+        logger.info("=" * 60)
+        
+        categories = await self.extract_categories()
+        
+        if categories_limit:
+            categories = categories[:categories_limit]
+            logger.info(f"⚙️  Ограничение категорий: {len(categories)}")
+        
+        max_pages = max_products_per_category // 24 if max_products_per_category else None
+        # Воркеров с запасом: сколько из них работает одновременно, решают адаптивные лимиты
+        workers = self.config.max_concurrency
+        
+        url_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.STREAM_QUEUE_SIZE)
+        load_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.STREAM_QUEUE_SIZE)
+        
+        # Компактные записи для итогового JSON (без полных объектов Product)
+        results: List[Dict[str, Any]] = []
+        
+        pbar = tqdm(desc="📤 Загрузка товаров", unit="product")
+        
+        done_categories = self.state.done_categories()
+        
+        async def iter_category_pages(category: Category):
+            """URL товаров категории: из хранилища, если она уже обойдена."""
+            if category.url in done_categories:
+                yield self.state.get_category_product_urls(category.url)
+                return
+            
+            async for page_urls in self.scraper.iter_product_urls_from_category(
+                category.url, max_pages
+            ):
+                self.state.add_product_urls(category.url, page_urls)
+                yield page_urls
+            
+            # Сюда доходим, только если обход дошел до последней страницы
+            # (ошибка загрузки страницы листинга пробрасывается)
+            self.state.mark_category_done(category.url)
+        
+        async def dispatch(url: str):
+            """Отправляет URL на нужный этап с учетом сохраненного состояния."""
+            status = self.state.get_status(url)
+            
+            if status in (STATUS_UPLOADED, STATUS_SKIPPED):
+                if status == STATUS_UPLOADED:
+                    self.stats.products_parsed += 1
+                    self.stats.products_uploaded += 1
+                return
+            
+            if status in (STATUS_PARSED, STATUS_FAILED):
+                product = self.state.load_product(url)
+                if product:
+                    # Распарсен в прошлом запуске - сразу на загрузку
+                    self.stats.products_parsed += 1
+                    await load_queue.put(product)
+                    return
+            
+            await url_queue.put(url)
+        
+        async def discover():
+            """Этап 1: параллельный обход категорий и выдача URL товаров выборки."""
+            seen_urls = set()
+            picked_urls = set()
+            semaphore = asyncio.Semaphore(self.config.CATEGORY_CONCURRENCY)
+            
+            async def pick(url: str, category: Category):
+                # Товар из нескольких категорий отправляется один раз - какая
+                # категория успела первой, на выборку не влияет
+                if url in picked_urls:
+                    return
+                picked_urls.add(url)
+                self.stats.products_filtered += 1
+                TRACER.discovered(url, category=category.name)
+                await dispatch(url)
+            
+            async def crawl_category(category: Category):
+                async with semaphore:
+                    # Выборка по хешу ID среди всех URL категории (дубли из других
+                    # категорий отсеиваются после нее) - стабильна между запусками
+                    sample = CategorySample(self.sampler)
+                    try:
+                        async for page_urls in iter_category_pages(category):
+                            page_urls = list(dict.fromkeys(page_urls))
+                            new_urls = [url for url in page_urls if url not in seen_urls]
+                            seen_urls.update(new_urls)
+                            self._seen_url_ids.update(extract_product_id(url) for url in new_urls)
+                            self.stats.products_found += len(new_urls)
+                            for url in sample.offer(page_urls):
+                                await pick(url, category)
+                        
+                        for url in sample.finish():
+                            await pick(url, category)
+                        
+                    except Exception as e:
+                        logger.error(f"❌ Ошибка при обработке категории {category.name}: {e}")
+                        self.stats.errors.append({
+                            "category": category.name,
+                            "error": str(e)
+                        })
+            
+            await asyncio.gather(*(crawl_category(category) for category in categories))
+            
+            for _ in range(workers):
+                await url_queue.put(None)
+        
+        async def parse_and_transform():
+            """Этап 2: парсинг страницы товара и валидация."""
+            while True:
+                url = await url_queue.get()
+                if url is None:
+                    break
+                
+                product = await self.scraper.parse_product(url)
+                
+                if product is None:
+                    continue
+                self.stats.products_parsed += 1
+                
+                errors = self._validate_product(product)
+                if errors:
+                    product.errors.extend(errors)
+                    logger.warning(f"⚠️ Товар {product.source_url} не прошел валидацию: {errors}")
+                    self.state.save_product(product, STATUS_SKIPPED)
+                    continue
+                
+                self.state.save_product(product, STATUS_PARSED)
+                await load_queue.put(product)
+        
+        async def load():
+            """Этап 3: загрузка изображений и создание товара на API."""
+            while True:
+                product = await load_queue.get()
+                if product is None:
+                    break
+                
+                batch = [product]
+                if self.api_client.bulk_supported:
+                    # Забираем уже готовые товары из очереди в один пакет
+                    while len(batch) < self.config.BULK_BATCH_SIZE and not load_queue.empty():
+                        item = load_queue.get_nowait()
+                        if item is None:
+                            # Маркер конца - вернем его для следующей итерации
+                            await load_queue.put(None)
+                            break
+                        batch.append(item)
+                
+                if self.config.INCREMENTAL_MODE:
+                    fresh = []
+                    for item in batch:
+                        if self._skip_unchanged(item):
+                            done(item)
+                        else:
+                            fresh.append(item)
+                    batch = fresh
+                
+                if self.sync:
+                    batch = await self._sync_existing(batch, done)
+                
+                if self.api_client.bulk_supported:
+                    await self.api_client.process_products_batch(batch, None, record)
+                    continue
+                
+                for item in batch:
+                    success = await self.api_client.process_product(item)
+                    record(item, success)
+        
+        def record(product: Product, success: bool):
+            self._record_upload(product, success)
+            if success:
+                self.stats.products_uploaded += 1
+            else:
+                self.stats.products_failed += 1
+            done(product)
+        
+        def done(product: Product):
+            results.append(self._result_record(product))
+            pbar.update(1)
+        
+        async def run_parsers():
+            await asyncio.gather(*(parse_and_transform() for _ in range(workers)))
+            for _ in range(workers):
+                await load_queue.put(None)
+        
+        stages = [
+            asyncio.create_task(discover()),
+            asyncio.create_task(run_parsers()),
+            *(asyncio.create_task(load()) for _ in range(workers))
+        ]
+        
+        try:
+            await asyncio.gather(*stages)
+        except Exception as e:
+            logger.exception(f"❌ Критическая ошибка в потоковом pipeline: {e}")
+            raise
+        finally:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            pbar.close()
+        
+        logger.info(f"✅ Успешно загружено: {self.stats.products_uploaded}")
+        logger.info(f"❌ Ошибок: {self.stats.products_failed}")
+        
+        if results:
+            await self._save_results(results)
+        else:
+            logger.warning("⚠️ Нет товаров для загрузки")
+        
+        await self._deactivate_missing(
+            categories_limit is None and max_products_per_category is None
+        )
+    
+    # ========================================
+    # Price Refresh
+    # ========================================
+    
+    async def run_price_refresh(
+        self,
+        categories_limit: Optional[int] = None,
+        max_pages_per_category: Optional[int] = None
+    ):
+        """
+        Обновляет цены и наличие по карточкам на страницах листинга.
+        
+        Страницы товаров не открываются. Для каждой карточки изменения
+        вычисляются по индексу каталога (CATALOG_INDEX_PATH), и на API
+        через PATCH уходят только измененные поля (товар индекса находится
+        по URL карточки, а не по SKU). Товары, которых нет
+        в индексе (еще не загружались полным запуском), пропускаются.
+        
+        Args:
+            categories_limit: Ограничение количества категорий (None = все)
+            max_pages_per_category: Макс. страниц листинга на категорию
+        """
+        logger.info("\n" + "=" * 60)
+        logger.info("💲 Обновление цен по страницам листинга")
+        logger.info("=" * 60)
+        
+        categories = await self.extract_categories()
+        
+        if categories_limit:
+            categories = categories[:categories_limit]
+            logger.info(f"⚙️  Ограничение категорий: {len(categories)}")
+        
+        counters: Counter = Counter()
+        seen_ids = set()
+        semaphore = asyncio.Semaphore(self.config.CATEGORY_CONCURRENCY)
+        pbar = tqdm(desc="💲 Карточки товаров", unit="product")
+        
+        async def push(update: PriceUpdate):
+            # В индексе товар под SKU, у карточки - только URL
+            previous = self.catalog.get_by_url(update.source_url)
+            if previous is None:
+                counters['unknown'] += 1
+                return
+            
+            fields = update.changed_fields(previous)
+            if not fields:
+                counters['unchanged'] += 1
+                return
+            
+            try:
+                success = await self.api_client.update_product_fields(
+                    previous['api_product_id'], fields
+                )
+            except Exception as e:
+                logger.error(f"❌ Ошибка обновления товара {update.source_id}: {e}")
+                success = False
+            
+            if success:
+                self.catalog.record_price_update(previous['source_id'], fields)
+                counters['updated'] += 1
+            else:
+                counters['failed'] += 1
+        
+        async def refresh_category(category: Category):
+            async with semaphore:
+                try:
+                    async for updates in self.scraper.iter_price_updates_from_category(
+                        category.url, max_pages_per_category
+                    ):
+                        fresh = [u for u in updates if u.source_id not in seen_ids]
+                        seen_ids.update(u.source_id for u in fresh)
+                        await asyncio.gather(*(push(update) for update in fresh))
+                        pbar.update(len(fresh))
+                    
+                except Exception as e:
+                    logger.error(f"❌ Ошибка при обработке категории {category.name}: {e}")
+                    self.stats.errors.append({
+                        "category": category.name,
+                        "error": str(e)
+                    })
+        
+        try:
+            await asyncio.gather(*(refresh_category(category) for category in categories))
+        finally:
+            pbar.close()
+        
+        self.stats.products_found = len(seen_ids)
+        self.stats.products_uploaded = counters['updated']
+        self.stats.products_failed = counters['failed']
+        
+        # Карточки листинга покрывают весь каталог - по ним видно пропавшие товары
+        self._seen_url_ids = seen_ids
+        await self._deactivate_missing(
+            categories_limit is None and max_pages_per_category is None
+        )
+        
+        logger.info(f"📦 Карточек товаров: {len(seen_ids)}")
+        logger.info(f"✏️  Обновлено: {counters['updated']}")
+        logger.info(f"💤 Без изменений: {counters['unchanged']}")
+        logger.info(f"❔ Нет в индексе (нужен полный запуск): {counters['unknown']}")
+        logger.info(f"❌ Ошибок: {counters['failed']}")
+    
+    def _result_record(self, product: Product) -> Dict[str, Any]:
+        """Компактная запись о товаре для итогового JSON."""
+        return {
+            "title": product.title,
+            "price": product.price,
+            "old_price": product.old_price,
+            "category": product.category,
+            "source_url": product.source_url,
+            "api_product_id": product.api_product_id,
+            "uploaded": product.uploaded_to_api,
+            "errors": product.errors
+        }
+    
+    async def _save_results(self, products: List[Union[Product, Dict[str, Any]]]):
         """Сохраняет результаты в JSON файл."""
         import json
         
@@ -419,20 +1056,14 @@ class FixPriceETLPipeline:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = output_dir / f"etl_results_{timestamp}.json"
         
+        self._update_concurrency_stats()
         results = {
             "timestamp": datetime.now().isoformat(),
-            "stats": self.stats.model_dump(),
+            "stats": self.stats.model_dump(mode='json'),
+            # Гистограммы этапов, повторы, байты (см. metrics.py)
+            "metrics": METRICS.summary(),
             "products": [
-                {
-                    "title": p.title,
-                    "price": p.price,
-                    "old_price": p.old_price,
-                    "category": p.category,
-                    "source_url": p.source_url,
-                    "api_product_id": p.api_product_id,
-                    "uploaded": p.uploaded_to_api,
-                    "errors": p.errors
-                }
+                p if isinstance(p, dict) else self._result_record(p)
                 for p in products
             ]
         }
@@ -447,16 +1078,49 @@ class FixPriceETLPipeline:
 # Entry Point
 # ========================================
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Fix-Price ETL Pipeline")
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="Продолжить прерванный запуск из хранилища состояния (STATE_DB_PATH)"
+    )
+    parser.add_argument(
+        '--refresh-prices',
+        action='store_true',
+        help="Только обновить цены и наличие по страницам листинга (без страниц товаров)"
+    )
+    parser.add_argument(
+        '--max-products',
+        type=int,
+        default=None,
+        help="Макс. товаров на категорию (по умолчанию все; с ограничением "
+             "пропавшие товары не деактивируются)"
+    )
+    return parser.parse_args(argv)
+
+
 async def main():
     """Точка входа для запуска pipeline."""
+    args = parse_args()
+    
     # Инициализируем конфигурацию
     config = init_config()
     
     # Запускаем pipeline
-    async with FixPriceETLPipeline(config) as pipeline:
-        await pipeline.run_full_pipeline(
+    async with FixPriceETLPipeline(config, resume=args.resume) as pipeline:
+        if args.refresh_prices:
+            await pipeline.run_price_refresh(categories_limit=None)
+            return
+        
+        run = (
+            pipeline.run_streaming_pipeline if config.STREAMING_MODE
+            else pipeline.run_full_pipeline
+        )
+        await run(
             categories_limit=None,  # Все категории
-            max_products_per_category=100  # Макс. 100 товаров на категорию
+            max_products_per_category=args.max_products
         )
 
 
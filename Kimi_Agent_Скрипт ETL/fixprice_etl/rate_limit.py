@@ -0,0 +1,129 @@
+# ============================================
+# Fix-Price ETL Pipeline - Rate Limiting
+# ============================================
+"""
+Бюджет запросов по хостам (token bucket).
+
+У каждого хоста свой бюджет (запросов в секунду + burst), общий для всех
+корутин: обход категорий, предзагрузка страниц, страницы товаров,
+скачивание изображений и запросы к API не превышают заданной частоты,
+сколько бы их ни шло параллельно.
+
+Токен берется до слота лимитера параллельности (см. adaptive_concurrency):
+пока запрос ждет бюджета, он не занимает слот и не мешает другим хостам.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from config import Config
+from metrics import METRICS
+from tracing import TRACER
+
+
+# Ключ правила по умолчанию в HOST_RATE_LIMITS
+DEFAULT_HOST = '*'
+
+
+def host_key(url: str) -> str:
+    """Хост URL без `www.` (https://www.fix-price.com/x -> fix-price.com)."""
+    host = (urlparse(url).hostname or '') if '//' in url else url.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class RateLimiter:
+    """
+    Асинхронный token bucket.
+
+    Ожидающий резервирует токен сразу (баланс может уйти в минус) и спит
+    ровно до момента, когда токен накопится, - без блокировок и опроса,
+    порядок обслуживания совпадает с порядком вызовов acquire(). Если
+    ожидание отменено, токен возвращается в бюджет.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Запросов в секунду (0 = без ограничения)
+            burst: Сколько запросов можно сделать подряд без ожидания
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self.waited = 0.0
+
+    async def acquire(self):
+        """Ждет, пока бюджет позволит сделать очередной запрос."""
+        if self.rate <= 0:
+            return
+
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+
+        if self._tokens < 0:
+            delay = -self._tokens / self.rate
+            self.waited += delay
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # Запрос не уйдет - без возврата токена бюджет хоста сжимался бы
+                # с каждой отменой (предзагрузка, остановка)
+                self._tokens += 1
+                self.waited -= max(0.0, now + delay - time.monotonic())
+                raise
+
+
+class HostRateLimits:
+    """
+    Token bucket на каждый хост.
+
+    Хосты без правила не ограничиваются, если не задано правило `*`.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]]):
+        """
+        Args:
+            limits: Хост -> (запросов в секунду, burst); `*` - для остальных хостов
+        """
+        self.limits = {host_key(host) if host != DEFAULT_HOST else host: limit
+                       for host, limit in limits.items()}
+        self._buckets: Dict[str, RateLimiter] = {}
+
+    @classmethod
+    def from_config(cls, config: Config) -> 'HostRateLimits':
+        """Бюджет источника (CRAWL_RATE_LIMIT) и правила HOST_RATE_LIMITS."""
+        limits = {config.FIX_PRICE_BASE_URL: (config.CRAWL_RATE_LIMIT, config.CRAWL_RATE_BURST)}
+        limits.update(config.host_rate_limits)
+        return cls(limits)
+
+    def bucket(self, url: str) -> Optional[RateLimiter]:
+        """Бюджет хоста URL (None - хост не ограничен)."""
+        host = host_key(url)
+        if host not in self._buckets:
+            rate, burst = self.limits.get(host) or self.limits.get(DEFAULT_HOST) or (0.0, 1)
+            self._buckets[host] = RateLimiter(rate, burst)
+        bucket = self._buckets[host]
+        return bucket if bucket.rate > 0 else None
+
+    async def acquire(self, url: str):
+        """Ждет токен хоста URL перед отправкой запроса."""
+        bucket = self.bucket(url)
+        if bucket:
+            waited = bucket.waited
+            started = time.monotonic()
+            await bucket.acquire()
+            METRICS.observe('rate_limit_wait_seconds', bucket.waited - waited, host=host_key(url))
+            TRACER.record_wait('rate_limit_wait', started, time.monotonic(), host=host_key(url))
+
+    def summary(self) -> Dict[str, str]:
+        """Ограниченные хосты: частота и суммарное ожидание бюджета."""
+        return {
+            host: f"{bucket.rate:g}/s, ждали {bucket.waited:.1f}с"
+            for host, bucket in self._buckets.items()
+            if bucket.rate > 0
+        }
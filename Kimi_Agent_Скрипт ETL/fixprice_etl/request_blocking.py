@@ -0,0 +1,111 @@
+# ============================================
+# Fix-Price ETL Pipeline - Request Blocking
+# ============================================
+"""
+Перехват запросов браузера: отсекает все, что не нужно для парсинга HTML.
+
+Картинки, медиа, шрифты, стили, аналитика и трекинговые пиксели не влияют
+на извлекаемые данные, но занимают трафик и не дают странице "успокоиться".
+"""
+
+from collections import Counter
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Route
+from loguru import logger
+
+
+class ResourceBlocker:
+    """
+    Правила блокировки запросов для BrowserContext.
+
+    Порядок проверки:
+    1. Хост из allow-list - всегда пропускаем (скрипты, нужные для цен)
+    2. Тип ресурса из blocked_types - блокируем
+    3. Хост из blocked_hosts - блокируем
+    4. Сторонний хост (не домен источника) - блокируем, если block_third_party
+    """
+
+    def __init__(
+        self,
+        first_party_url: str,
+        blocked_types: Iterable[str],
+        blocked_hosts: Iterable[str] = (),
+        allowed_hosts: Iterable[str] = (),
+        block_third_party: bool = True
+    ):
+        self.first_party_host = self._normalize_host(urlparse(first_party_url).hostname or '')
+        self.blocked_types = frozenset(blocked_types)
+        self.blocked_hosts = tuple(self._normalize_host(h) for h in blocked_hosts if h)
+        self.allowed_hosts = tuple(self._normalize_host(h) for h in allowed_hosts if h)
+        self.block_third_party = block_third_party
+
+        # Статистика: сколько запросов заблокировано/пропущено по типам
+        self.blocked = Counter()
+        self.allowed = Counter()
+
+    @staticmethod
+    def _normalize_host(host: str) -> str:
+        host = host.lower().strip()
+        return host[4:] if host.startswith('www.') else host
+
+    @staticmethod
+    def _host_matches(host: str, patterns: tuple) -> bool:
+        """Совпадение хоста или любого его поддомена."""
+        return any(host == p or host.endswith('.' + p) for p in patterns)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Решает, нужно ли блокировать запрос."""
+        if resource_type == 'document':
+            return False
+
+        host = self._normalize_host(urlparse(url).hostname or '')
+        if not host:
+            # data:, blob: и т.п. - не сетевые запросы
+            return False
+
+        if self._host_matches(host, self.allowed_hosts):
+            return False
+
+        if resource_type in self.blocked_types:
+            return True
+
+        if self._host_matches(host, self.blocked_hosts):
+            return True
+
+        if self.block_third_party and not self._host_matches(host, (self.first_party_host,)):
+            return True
+
+        return False
+
+    async def handle(self, route: Route):
+        """Обработчик для context.route()."""
+        request = route.request
+        resource_type = request.resource_type
+
+        if self.should_block(resource_type, request.url):
+            self.blocked[resource_type] += 1
+            await route.abort()
+        else:
+            self.allowed[resource_type] += 1
+            await route.continue_()
+
+    async def install(self, context: BrowserContext):
+        """Подключает перехват ко всем страницам контекста."""
+        await context.route('**/*', self.handle)
+        logger.info(
+            f"🛡️ Блокировка ресурсов: {', '.join(sorted(self.blocked_types)) or '-'}"
+            f" | сторонние хосты: {'да' if self.block_third_party else 'нет'}"
+        )
+
+    def summary(self) -> Optional[str]:
+        """Краткая сводка для логов."""
+        total_blocked = sum(self.blocked.values())
+        total = total_blocked + sum(self.allowed.values())
+        if not total:
+            return None
+        return (
+            f"заблокировано {total_blocked}/{total} запросов "
+            f"({dict(self.blocked.most_common())})"
+        )
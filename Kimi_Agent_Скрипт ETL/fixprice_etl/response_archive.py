@@ -0,0 +1,297 @@
+# ============================================
+# Fix-Price ETL Pipeline - Response Archive
+# ============================================
+"""
+Архив ответов для детерминированных перезапусков (record/replay).
+
+ARCHIVE_MODE=record сохраняет HTML каждой загруженной страницы (и HTTP
+путь, и браузер) и байты каждого скачанного изображения. ARCHIVE_MODE=replay
+отдает их из архива вместо сети: этап extract целиком проходит со скоростью
+диска, без браузера и без запросов к fix-price.com. Так новый селектор или
+трансформацию можно проверить на вчерашнем каталоге, не обходя его заново.
+
+Формат - WARC: сегменты `ARCHIVE_DIR/segments/<время>.warc.gz` из записей
+типа resource, каждая запись - отдельный gzip member (файл читают обычные
+WARC инструменты). Индекс `index.sqlite` по URL и времени загрузки:
+
+    (url, fetched_at) -> segment, offset, length
+
+При повторе берется последняя запись URL не позже ARCHIVE_AS_OF (пусто -
+самая свежая). В архив попадают только успешные ответы с телом, поэтому при
+записи условные запросы (ETag / Last-Modified) не отправляются.
+
+Запись не блокирует event loop: record() только ставит ответ в очередь, а
+единственная задача-писатель сжимает и дописывает их пачками в отдельном
+потоке, с одним commit индекса на пачку. close() дожидается очереди.
+"""
+
+import asyncio
+import gzip
+import os
+import sqlite3
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from config import Config
+
+
+# Режимы архива
+ARCHIVE_OFF = 'off'
+ARCHIVE_RECORD = 'record'
+ARCHIVE_REPLAY = 'replay'
+
+# Виды записей
+KIND_HTTP = 'http'        # HTML, полученный обычным GET
+KIND_BROWSER = 'browser'  # HTML после рендеринга в браузере
+KIND_IMAGE = 'image'      # Байты изображения
+
+HTML_CONTENT_TYPE = 'text/html; charset=utf-8'
+
+# Очередь записи: сколько ответов ждут писателя (дальше record() ждет) и
+# сколько записей уходит в сегмент и индекс за один commit
+WRITE_QUEUE_SIZE = 256
+WRITE_BATCH_SIZE = 64
+
+# (url, kind, body, content_type, fetched_at)
+PendingRecord = Tuple[str, str, bytes, str, datetime]
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    content_type TEXT,
+    size_bytes INTEGER NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_records_url ON records(url, fetched_at);
+"""
+
+
+class ArchiveMiss(Exception):
+    """В архиве нет записи для URL (режим replay)."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Нет в архиве: {url}")
+        self.url = url
+
+
+@dataclass
+class ArchivedResponse:
+    """Запись архива."""
+    url: str
+    kind: str
+    fetched_at: str
+    content_type: str
+    body: bytes
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+
+class ResponseArchive:
+    """WARC сегменты с ответами и SQLite индекс (url, fetched_at) -> смещение."""
+
+    def __init__(self, archive_dir: str, mode: str, as_of: str = ''):
+        """
+        Args:
+            archive_dir: Каталог архива (segments/ и index.sqlite)
+            mode: record или replay
+            as_of: Повторять записи не позже этого момента (ISO, UTC), пусто - последние
+        """
+        self.archive_dir = Path(archive_dir)
+        self.segments_dir = self.archive_dir / 'segments'
+        self.mode = mode
+        self.as_of = datetime.fromisoformat(as_of).isoformat() if as_of else None
+        self.conn: Optional[sqlite3.Connection] = None
+        self._segment: Optional[BinaryIO] = None
+        self._segment_name = ''
+        self._readers: Dict[str, BinaryIO] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            'recorded': 0,
+            'recorded_bytes': 0,
+            'replayed': 0,
+            'misses': 0,
+        }
+
+    @classmethod
+    def from_config(cls, config: Config) -> Optional['ResponseArchive']:
+        """Архив по ARCHIVE_MODE (None - выключен)."""
+        if config.ARCHIVE_MODE == ARCHIVE_OFF:
+            return None
+        return cls(config.ARCHIVE_DIR, config.ARCHIVE_MODE, config.ARCHIVE_AS_OF)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == ARCHIVE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == ARCHIVE_REPLAY
+
+    def open(self) -> 'ResponseArchive':
+        """Открывает индекс, при записи - новый сегмент."""
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+
+        # Пишет индекс поток писателя, читает - event loop (в разных режимах)
+        self.conn = sqlite3.connect(self.archive_dir / 'index.sqlite', check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        if self.recording:
+            # Сегмент на запуск: записи одного обхода лежат рядом
+            self._segment_name = f"{datetime.utcnow():%Y%m%d-%H%M%S}-{os.getpid()}.warc.gz"
+            self._segment = open(self.segments_dir / self._segment_name, 'ab')
+            logger.info(f"📼 Запись ответов в архив: {self.segments_dir / self._segment_name}")
+        else:
+            count = self.conn.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+            logger.info(
+                f"📼 Повтор из архива: {self.archive_dir} ({count} записей"
+                + (f", не позже {self.as_of}" if self.as_of else '') + ')'
+            )
+        return self
+
+    async def close(self):
+        """Дописывает очередь записи, закрывает сегменты и индекс."""
+        if self._writer:
+            await self._queue.join()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        if self._segment:
+            self._segment.close()
+            self._segment = None
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            logger.info(f"📼 Архив ответов: {self.stats}")
+
+    # ========================================
+    # Record
+    # ========================================
+
+    async def record(self, url: str, kind: str, body: bytes, content_type: str):
+        """
+        Ставит ответ в очередь записи.
+
+        Ждет, только если писатель отстал на WRITE_QUEUE_SIZE ответов.
+        """
+        if self._writer is None:
+            self._queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+            self._writer = asyncio.create_task(self._write_loop())
+        await self._queue.put((url, kind, body, content_type, datetime.utcnow()))
+
+    async def record_html(self, url: str, kind: str, html: str):
+        """Ставит в очередь HTML страницы."""
+        await self.record(url, kind, html.encode('utf-8'), HTML_CONTENT_TYPE)
+
+    async def _write_loop(self):
+        """Задача-писатель: забирает из очереди все, что накопилось, и пишет пачкой."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(f"❌ Ошибка записи в архив ({len(batch)} ответов): {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: List[PendingRecord]):
+        """Дописывает пачку в сегмент и индекс (в потоке, не в event loop)."""
+        rows = []
+        for url, kind, body, content_type, fetched in batch:
+            header = (
+                'WARC/1.1\r\n'
+                'WARC-Type: resource\r\n'
+                f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n'
+                f'WARC-Date: {fetched.isoformat()}Z\r\n'
+                f'WARC-Target-URI: {url}\r\n'
+                f'Content-Type: {content_type}\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                '\r\n'
+            ).encode('utf-8')
+            # Изображения уже сжаты - для них самый быстрый уровень
+            level = 6 if content_type.startswith('text/') else 1
+            member = gzip.compress(header + body + b'\r\n\r\n', compresslevel=level)
+
+            offset = self._segment.tell()
+            self._segment.write(member)
+            rows.append((url, kind, fetched.isoformat(), content_type, len(body),
+                         self._segment_name, offset, len(member)))
+            self.stats['recorded_bytes'] += len(member)
+
+        # Индекс не должен ссылаться на недописанные данные
+        self._segment.flush()
+
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO records '
+                '(url, kind, fetched_at, content_type, size_bytes, segment, offset, length) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        self.stats['recorded'] += len(rows)
+
+    # ========================================
+    # Replay
+    # ========================================
+
+    def lookup(self, url: str) -> Optional[ArchivedResponse]:
+        """Последняя запись URL не позже ARCHIVE_AS_OF или None."""
+        row = self.conn.execute(
+            'SELECT kind, fetched_at, content_type, size_bytes, segment, offset, length '
+            'FROM records WHERE url = ? AND (? IS NULL OR fetched_at <= ?) '
+            'ORDER BY fetched_at DESC, id DESC LIMIT 1',
+            (url, self.as_of, self.as_of)
+        ).fetchone()
+        if row is None:
+            return None
+
+        kind, fetched_at, content_type, size_bytes, segment, offset, length = row
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = self._readers[segment] = open(self.segments_dir / segment, 'rb')
+        reader.seek(offset)
+        data = gzip.decompress(reader.read(length))
+        body_start = data.index(b'\r\n\r\n') + 4
+        return ArchivedResponse(
+            url, kind, fetched_at, content_type, data[body_start:body_start + size_bytes]
+        )
+
+    def replay(self, url: str) -> ArchivedResponse:
+        """
+        Ответ из архива.
+
+        Raises:
+            ArchiveMiss: URL не записан
+        """
+        record = self.lookup(url)
+        if record is None:
+            self.stats['misses'] += 1
+            raise ArchiveMiss(url)
+        self.stats['replayed'] += 1
+        return record
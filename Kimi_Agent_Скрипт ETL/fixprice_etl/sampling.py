@@ -0,0 +1,106 @@
+# ============================================
+# Fix-Price ETL Pipeline - Product Sampling
+# ============================================
+"""
+Детерминированная выборка PRODUCT_SAMPLE_PERCENT товаров до парсинга.
+
+Решение принимается по URL сразу после обхода листинга: товар в выборке,
+если хеш его ID (html_parsing.extract_product_id) меньше `sample_rate`.
+Поэтому:
+
+    - товары вне выборки не загружаются вовсе (ни HTTP, ни браузер);
+    - выборка одна и та же от запуска к запуску и в обычном и потоковом
+      режимах, новые товары каталога не сдвигают ее;
+    - в каждой категории в выборку попадает около `sample_rate` товаров, а
+      если порог не прошел ни один, берется товар с наименьшим хешем -
+      категория не остается без товаров.
+
+Каждая категория выбирается по всем своим URL, а товар из нескольких
+категорий отсеивается уже после выборки. Поэтому выборка не зависит от того,
+какая категория обошлась первой (в потоковом режиме они идут параллельно).
+
+SAMPLE_SEED меняет выборку целиком (другая, но тоже стабильная).
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from html_parsing import extract_product_id
+
+
+class ProductSampler:
+    """Стабильная выборка товаров по хешу ID, с минимумом в каждой категории."""
+
+    def __init__(self, rate: float, seed: str = ''):
+        """
+        Args:
+            rate: Доля товаров в выборке (0..1]
+            seed: Соль хеша - другая соль дает другую выборку
+        """
+        self.rate = rate
+        self.seed = seed
+
+    def score(self, url: str) -> float:
+        """Хеш ID товара в [0, 1) - одинаковый для товара во всех запусках."""
+        key = f"{self.seed}:{extract_product_id(url)}".encode('utf-8')
+        return int.from_bytes(hashlib.sha256(key).digest()[:8], 'big') / 2 ** 64
+
+    def accepts(self, url: str) -> bool:
+        """Проходит ли товар порог выборки."""
+        return self.rate >= 1 or self.score(url) < self.rate
+
+    def sample_category(self, urls: List[str]) -> List[str]:
+        """Выборка из товаров одной категории (порядок сохраняется)."""
+        picked = [url for url in urls if self.accepts(url)]
+        if not picked and urls:
+            picked = [min(urls, key=self.score)]
+        return picked
+
+    def sample(self, category_urls: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        Выборка по категориям.
+
+        Каждая категория выбирается по всем своим URL; товар, попавший в
+        выборку нескольких категорий, относится к первой из них (в порядке
+        словаря) - набор товаров от порядка не зависит.
+        """
+        picked = set()
+        result: Dict[str, List[str]] = {}
+        for category, urls in category_urls.items():
+            own = [url for url in self.sample_category(list(dict.fromkeys(urls))) if url not in picked]
+            picked.update(own)
+            result[category] = own
+        return result
+
+
+class CategorySample:
+    """
+    Потоковая выборка одной категории: решение по каждому URL сразу,
+    минимум в один товар - в конце категории (см. ProductSampler.sample_category).
+    """
+
+    def __init__(self, sampler: ProductSampler):
+        self.sampler = sampler
+        self.picked = 0
+        self._fallback: Optional[str] = None
+        self._fallback_score = 1.0
+
+    def offer(self, urls: Iterable[str]) -> List[str]:
+        """URL из очередной порции категории, попавшие в выборку."""
+        picked = []
+        for url in urls:
+            if self.sampler.accepts(url):
+                picked.append(url)
+                continue
+            score = self.sampler.score(url)
+            if score < self._fallback_score:
+                self._fallback, self._fallback_score = url, score
+        self.picked += len(picked)
+        return picked
+
+    def finish(self) -> List[str]:
+        """Товар для категории, в которой порог не прошел ни один URL."""
+        if self.picked or self._fallback is None:
+            return []
+        self.picked = 1
+        return [self._fallback]
@@ -6,18 +6,25 @@
 """
 
 import asyncio
-import re
-from typing import List, Optional, Dict, Any, AsyncGenerator
-from urllib.parse import urljoin, urlparse
+from typing import List, Optional, Dict, Any, AsyncGenerator, Awaitable, Callable
 from dataclasses import dataclass
 
-from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from fake_useragent import UserAgent
 from loguru import logger
 
-from models import Product, ProductSpecs, ProductImage, Category
+from models import Product, ProductSpecs, ProductImage, Category, PriceUpdate
 from config import Config
+from page_pool import PagePool
+from request_blocking import ResourceBlocker
+from http_fetcher import HybridFetcher, NotModified, ValidatorStore
+from parse_workers import ParseWorkerPool
+from rate_limit import HostRateLimits, host_key
+from metrics import METRICS
+from response_archive import ResponseArchive
+from tracing import TRACER
+from adaptive_concurrency import AdaptiveLimiter
+import html_parsing
 
 
 @dataclass
@@ -36,35 +43,28 @@ class FixPriceScraper:
     """
     
     # Селекторы для парсинга
-    SELECTORS = {
-        # Категории
-        'category_links': 'a[href*="/catalog/"]',
-        'category_list': '.catalog-categories a, .category-item a, nav a[href*="/catalog/"]',
-        
-        # Товары в списке
-        'product_cards': '.product-card, .catalog-item, [data-product-id], .goods-item',
-        'product_link': 'a[href*="/product/"], a.product-link',
-        'product_title': '.product-title, .product-name, h1, .goods-title',
-        'product_price': '.price-current, .product-price-current, [data-price], .price',
-        'product_old_price': '.price-old, .product-price-old, .old-price',
-        
-        # Страница товара
-        'product_page_title': 'h1, .product-detail h1, .product-info h1',
-        'product_page_description': '.product-description, .description, [itemprop="description"]',
-        'product_page_price': '.price-current, .product-price, [data-price]',
-        'product_page_old_price': '.price-old, .old-price, .compare-price',
-        'product_images': '.product-image img, .gallery-image img, .product-gallery img, [data-src]',
-        'product_specs': '.product-specs, .specifications, .product-attributes',
-        'spec_row': '.spec-row, .attribute-row, tr',
-        'spec_name': '.spec-name, .attribute-name, td:first-child',
-        'spec_value': '.spec-value, .attribute-value, td:last-child',
-        'in_stock': '.in-stock, .available, [data-available="true"]',
-        'out_of_stock': '.out-of-stock, .unavailable, [data-available="false"]',
-        'sku': '.sku, .article, [data-sku]',
-    }
+    SELECTORS = html_parsing.SELECTORS
     
-    def __init__(self, config: Config, scraping_config: Optional[ScrapingConfig] = None):
+    def __init__(
+        self,
+        config: Config,
+        scraping_config: Optional[ScrapingConfig] = None,
+        page_index: Optional[ValidatorStore] = None,
+        rate_limits: Optional[HostRateLimits] = None,
+        archive: Optional[ResponseArchive] = None
+    ):
+        """
+        Args:
+            config: Конфигурация
+            scraping_config: Настройки браузера (по умолчанию из config)
+            page_index: Индекс страниц для инкрементального режима (условные GET
+                и товары страниц, ответивших 304), см. catalog_index.CatalogIndex
+            rate_limits: Общий бюджет запросов по хостам (по умолчанию из config)
+            archive: Архив ответов: запись страниц или повтор без браузера
+        """
         self.config = config
+        self.page_index = page_index
+        self.archive = archive
         self.scraping_config = scraping_config or ScrapingConfig(
             headless=config.HEADLESS,
             browser_type=config.BROWSER_TYPE
@@ -72,6 +72,21 @@ class FixPriceScraper:
         self.ua = UserAgent()
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self.page_pool: Optional[PagePool] = None
+        self.resource_blocker: Optional[ResourceBlocker] = None
+        self.fetcher: Optional[HybridFetcher] = None
+        self.parse_workers = ParseWorkerPool(config.PARSE_WORKERS_MODE, config.PARSE_WORKERS)
+        # Бюджет запросов по хостам: общий для листинга, страниц товаров,
+        # HTTP и браузерного пути (и для APIClient, если передан тот же объект)
+        self.rate_limits = rate_limits or HostRateLimits.from_config(config)
+        # Параллельность запросов к сайту подстраивается под его ответы
+        self.source_limiter = AdaptiveLimiter(
+            'source',
+            initial=config.CONCURRENCY_LIMIT,
+            max_limit=config.max_concurrency,
+            adaptive=config.ADAPTIVE_CONCURRENCY,
+            latency_tolerance=config.ADAPTIVE_LATENCY_TOLERANCE
+        )
         
     async def __aenter__(self):
         """Асинхронный контекстный менеджер - инициализация браузера."""
@@ -83,7 +98,29 @@ class FixPriceScraper:
         await self.close()
     
     async def init_browser(self):
-        """Инициализирует Playwright браузер."""
+        """Инициализирует Playwright браузер и загрузчик страниц."""
+        if self.archive and self.archive.replaying:
+            # Страницы отдаются из архива - браузер не нужен
+            logger.info("📼 Повтор из архива: браузер не запускается")
+        else:
+            await self._launch_browser()
+        
+        # HTTP fast path: браузер только если в исходном HTML не хватает данных
+        http_headers = self._get_random_headers()
+        http_headers['Accept-Encoding'] = 'gzip, deflate'
+        http_headers.pop('Connection')  # hop-by-hop заголовок, недопустим в HTTP/2
+        self.fetcher = HybridFetcher(
+            self.config,
+            self.get_page_content,
+            headers=http_headers,
+            validators=self.page_index,
+            limiter=self.source_limiter,
+            rate_limits=self.rate_limits,
+            archive=self.archive
+        )
+    
+    async def _launch_browser(self):
+        """Запускает браузер, контекст и пул страниц."""
         logger.info("🚀 Инициализация Playwright браузера...")
         
         self.playwright = await async_playwright().start()
@@ -114,10 +151,36 @@ class FixPriceScraper:
         self.context.set_default_timeout(self.scraping_config.timeout)
         self.context.set_default_navigation_timeout(self.scraping_config.navigation_timeout)
         
+        # Отсекаем картинки, шрифты, стили и сторонние скрипты - для парсинга нужен только HTML
+        if self.config.BLOCK_RESOURCES:
+            self.resource_blocker = ResourceBlocker(
+                first_party_url=self.config.FIX_PRICE_BASE_URL,
+                blocked_types=self.config.BLOCKED_RESOURCE_TYPES,
+                blocked_hosts=self.config.BLOCKED_HOSTS,
+                allowed_hosts=self.config.ALLOWED_SCRIPT_HOSTS,
+                block_third_party=self.config.BLOCK_THIRD_PARTY
+            )
+            await self.resource_blocker.install(self.context)
+        
+        # Пул прогретых страниц вместо new_page/close на каждый URL
+        self.page_pool = PagePool(
+            self._create_page,
+            size=self.config.CONCURRENCY_LIMIT,
+            max_uses=self.config.PAGE_POOL_MAX_USES
+        )
+        await self.page_pool.warm()
+        
         logger.info("✅ Браузер инициализирован")
     
     async def close(self):
         """Закрывает браузер."""
+        if self.fetcher:
+            await self.fetcher.close()
+        self.parse_workers.close()
+        if self.page_pool:
+            await self.page_pool.close()
+        if self.resource_blocker and self.resource_blocker.summary():
+            logger.info(f"🛡️ Блокировка ресурсов: {self.resource_blocker.summary()}")
         if self.context:
             await self.context.close()
         if self.browser:
@@ -172,34 +235,40 @@ class FixPriceScraper:
         Returns:
             HTML-контент страницы
         """
-        page = await self._create_page()
-        
-        try:
+        # Токен бюджета берется до вкладки, слот лимитера - только на навигацию
+        host = host_key(url)
+        await self.rate_limits.acquire(url)
+        async with self.page_pool.lease() as page:
             logger.debug(f"🌐 Загрузка: {url}")
             
-            # Переходим на страницу
-            response = await page.goto(url, wait_until='networkidle')
+            # Переходим на страницу: ждем DOMContentLoaded, а не тишины в сети,
+            # готовность контента определяется селектором ниже
+            async with self.source_limiter.slot():
+                with METRICS.track('navigation', host):
+                    response = await page.goto(url, wait_until=self.config.NAVIGATION_WAIT_UNTIL)
+                if response:
+                    self.source_limiter.observe(response.status, response.headers.get('retry-after'))
             
             if not response or response.status >= 400:
                 raise Exception(f"HTTP {response.status if response else 'Unknown'} для {url}")
             
             # Ждем загрузки контента
-            if wait_for_selector:
-                await page.wait_for_selector(wait_for_selector, timeout=10000)
-            else:
-                # Ждем основные элементы
-                await asyncio.sleep(1)  # Даем время на JS-рендеринг
+            with METRICS.track('render_wait', host):
+                if wait_for_selector:
+                    await page.wait_for_selector(wait_for_selector, timeout=10000)
+                else:
+                    # Ждем основные элементы
+                    await asyncio.sleep(1)  # Даем время на JS-рендеринг
             
             # Прокручиваем страницу для подгрузки lazy-контента
-            await self._scroll_page(page)
+            with METRICS.track('scroll', host):
+                await self._scroll_page(page)
             
             content = await page.content()
+            METRICS.inc('bytes_total', len(content.encode('utf-8')), direction='in', host=host)
             logger.debug(f"✅ Страница загружена: {len(content)} bytes")
             
             return content
-            
-        finally:
-            await page.close()
     
     async def _scroll_page(self, page: Page, scroll_delay: float = 0.5):
         """Прокручивает страницу для подгрузки lazy-контента."""
@@ -225,37 +294,30 @@ class FixPriceScraper:
         """
         logger.info("📂 Получение списка категорий...")
         
-        content = await self.get_page_content(
+        categories = await self.fetcher.fetch_parsed(
             self.config.FIX_PRICE_CATALOG_URL,
+            self._parse_categories_html,
             wait_for_selector='.catalog-categories, .category-list, main'
         )
         
-        soup = BeautifulSoup(content, 'lxml')
-        categories = []
+        logger.info(f"✅ Найдено категорий: {len(categories)}")
+        return categories
+    
+    async def _parse_categories_html(self, content: str, strict: bool = False) -> Optional[List[Category]]:
+        """
+        Извлекает категории из HTML каталога (в пуле парсинг-воркеров).
         
-        # Ищем ссылки на категории
-        for link in soup.select(self.SELECTORS['category_links']):
-            href = link.get('href', '')
-            name = link.get_text(strip=True)
-            
-            if href and name and '/catalog/' in href:
-                url = urljoin(self.config.FIX_PRICE_BASE_URL, href)
-                categories.append(Category(
-                    name=name,
-                    url=url,
-                    level=href.count('/') - 1
-                ))
-        
-        # Убираем дубликаты по URL
-        seen_urls = set()
-        unique_categories = []
-        for cat in categories:
-            if cat.url not in seen_urls:
-                seen_urls.add(cat.url)
-                unique_categories.append(cat)
-        
-        logger.info(f"✅ Найдено категорий: {len(unique_categories)}")
-        return unique_categories
+        Args:
+            content: HTML страницы каталога
+            strict: Вернуть None, если категории не найдены (нужен браузер)
+        """
+        raw = await self.parse_workers.run(
+            html_parsing.parse_categories, content, self.config.FIX_PRICE_BASE_URL,
+            self.config.PARSER_BACKEND
+        )
+        if strict and not raw:
+            return None
+        return [Category(**item) for item in raw]
     
     async def get_products_from_category(
         self, 
@@ -275,145 +337,201 @@ class FixPriceScraper:
         logger.info(f"📄 Получение товаров из категории: {category_url}")
         
         product_urls = []
-        page_num = 1
+        async for page_products in self.iter_product_urls_from_category(category_url, max_pages):
+            product_urls.extend(page_products)
         
-        while True:
-            if max_pages and page_num > max_pages:
-                break
+        # Убираем дубликаты
+        product_urls = list(dict.fromkeys(product_urls))
+        logger.info(f"✅ Найдено товаров в категории: {len(product_urls)}")
+        
+        return product_urls
+    
+    async def iter_product_urls_from_category(
+        self,
+        category_url: str,
+        max_pages: Optional[int] = None
+    ) -> AsyncGenerator[List[str], None]:
+        """
+        Постранично отдает URL товаров из категории.
+        
+        Используется потоковым режимом pipeline: товары с первой страницы
+        уходят в парсинг, не дожидаясь обхода всей категории.
+        
+        Когда из блока пагинации известно число страниц, следующие
+        PAGE_PREFETCH страниц загружаются заранее (в пределах общего бюджета
+        запросов). Страницы отдаются строго по порядку, обход прекращается
+        на первой пустой странице, а лишние предзагрузки отменяются.
+        
+        Args:
+            category_url: URL категории
+            max_pages: Максимальное количество страниц (None = все)
             
-            page_url = f"{category_url}?page={page_num}" if page_num > 1 else category_url
+        Yields:
+            Список URL товаров с очередной страницы
             
-            try:
-                content = await self.get_page_content(
-                    page_url,
-                    wait_for_selector='.product-card, .catalog-item, [data-product-id]'
-                )
-                
-                soup = BeautifulSoup(content, 'lxml')
-                
-                # Ищем ссылки на товары
-                page_products = []
-                for link in soup.select(self.SELECTORS['product_link']):
-                    href = link.get('href', '')
-                    if href and ('/product/' in href or '/goods/' in href):
-                        full_url = urljoin(self.config.FIX_PRICE_BASE_URL, href)
-                        page_products.append(full_url)
-                
-                if not page_products:
-                    logger.debug(f"⏹️ Нет товаров на странице {page_num}")
-                    break
-                
-                product_urls.extend(page_products)
-                logger.debug(f"   Страница {page_num}: {len(page_products)} товаров")
-                
-                # Проверяем есть ли следующая страница
-                pagination = soup.select('.pagination, .pager')
-                next_page = soup.select_one('a[rel="next"], .next-page')
+        Raises:
+            Exception: Страница листинга не загрузилась - категория обойдена
+                не полностью и не должна считаться завершенной
+        """
+        async for page_urls in self._iter_listing_pages(
+            category_url, max_pages, self._parse_listing_html
+        ):
+            yield page_urls
+    
+    async def iter_price_updates_from_category(
+        self,
+        category_url: str,
+        max_pages: Optional[int] = None
+    ) -> AsyncGenerator[List[PriceUpdate], None]:
+        """
+        Постранично отдает цены и наличие из карточек листинга категории.
+        
+        Страницы товаров не открываются: стоимость обновления цен всего
+        каталога - число страниц листинга, а не число товаров.
+        
+        Args:
+            category_url: URL категории
+            max_pages: Максимальное количество страниц (None = все)
+            
+        Yields:
+            Список частичных обновлений товаров с очередной страницы
+        """
+        async for page_updates in self._iter_listing_pages(
+            category_url, max_pages, self._parse_listing_cards_html
+        ):
+            yield page_updates
+    
+    async def _iter_listing_pages(
+        self,
+        category_url: str,
+        max_pages: Optional[int],
+        parse: Callable[[str, bool], Awaitable[Optional[tuple]]]
+    ) -> AsyncGenerator[List[Any], None]:
+        """Обход пагинации категории с предзагрузкой (см. iter_product_urls_from_category)."""
+        first_page = await self._fetch_listing_page(category_url, 1, parse)
+        if not first_page:
+            return
+        
+        page_products, has_next, last_page = first_page
+        yield page_products
+        
+        limit = last_page
+        if max_pages:
+            limit = min(limit, max_pages) if limit else max_pages
+        # Без числа страниц заранее неизвестно, где остановиться - идем по одной
+        prefetch = self.config.PAGE_PREFETCH if last_page else 0
+        
+        pending: Dict[int, asyncio.Task] = {}
+        next_page = 2
+        page_num = 2
+        
+        try:
+            while has_next and (limit is None or page_num <= limit):
+                while next_page <= page_num + prefetch and (limit is None or next_page <= limit):
+                    pending[next_page] = asyncio.create_task(
+                        self._fetch_listing_page(category_url, next_page, parse)
+                    )
+                    next_page += 1
                 
-                if not next_page and len(page_products) < 12:  # Предполагаем 12 товаров на страницу
+                result = await pending.pop(page_num)
+                if not result:
                     break
                 
+                page_products, has_next, _ = result
+                yield page_products
                 page_num += 1
-                await asyncio.sleep(self.config.REQUEST_DELAY)
-                
-            except Exception as e:
-                logger.error(f"❌ Ошибка при получении страницы {page_num}: {e}")
-                break
-        
-        # Убираем дубликаты
-        product_urls = list(dict.fromkeys(product_urls))
-        logger.info(f"✅ Найдено товаров в категории: {len(product_urls)}")
-        
-        return product_urls
+        finally:
+            # Отмененную предзагрузку дожидаемся: после выхода из обхода загрузки
+            # не продолжаются, а их ошибки забраны
+            for task in pending.values():
+                task.cancel()
+            await asyncio.gather(*pending.values(), return_exceptions=True)
     
-    def _parse_price(self, price_text: Optional[str]) -> Optional[float]:
-        """Парсит цену из текста."""
-        if not price_text:
-            return None
+    async def _fetch_listing_page(
+        self,
+        category_url: str,
+        page_num: int,
+        parse: Callable[[str, bool], Awaitable[Optional[tuple]]]
+    ) -> Optional[tuple[List[Any], bool, Optional[int]]]:
+        """
+        Загружает и разбирает одну страницу листинга категории.
         
-        # Убираем все кроме цифр и запятой/точки
-        cleaned = re.sub(r'[^\d.,]', '', price_text.replace(' ', '').replace('\xa0', ''))
-        cleaned = cleaned.replace(',', '.')
+        Returns:
+            Кортеж (элементы страницы, есть ли следующая страница, номер
+            последней страницы) или None, если страница пустая
+            
+        Raises:
+            Exception: Страница не загрузилась (обход категории нельзя считать полным)
+        """
+        page_url = f"{category_url}?page={page_num}" if page_num > 1 else category_url
         
         try:
-            return float(cleaned) if cleaned else None
-        except ValueError:
+            result = await self.fetcher.fetch_parsed(
+                page_url,
+                parse,
+                wait_for_selector='.product-card, .catalog-item, [data-product-id]'
+            )
+        except Exception as e:
+            logger.error(f"❌ Ошибка при получении страницы {page_num}: {e}")
+            raise
+        
+        if not result[0]:
+            logger.debug(f"⏹️ Нет товаров на странице {page_num}")
             return None
+        
+        logger.debug(f"   Страница {page_num}: {len(result[0])} товаров")
+        return result
     
-    def _extract_specs(self, soup: BeautifulSoup) -> ProductSpecs:
-        """Извлекает характеристики товара."""
-        specs = ProductSpecs()
-        additional = {}
+    async def _parse_listing_html(
+        self,
+        content: str,
+        strict: bool = False
+    ) -> Optional[tuple[List[str], bool, Optional[int]]]:
+        """
+        Извлекает ссылки на товары со страницы листинга (в пуле парсинг-воркеров).
         
-        specs_container = soup.select_one(self.SELECTORS['product_specs'])
+        Args:
+            content: HTML страницы категории
+            strict: Вернуть None, если товары не найдены (нужен браузер)
+            
+        Returns:
+            Кортеж (URL товаров, есть ли следующая страница, номер последней страницы)
+        """
+        raw = await self.parse_workers.run(
+            html_parsing.parse_listing, content, self.config.FIX_PRICE_BASE_URL,
+            self.config.PARSER_BACKEND
+        )
+        if strict and not raw['urls']:
+            return None
+        return raw['urls'], raw['has_next'], raw['last_page']
+    
+    async def _parse_listing_cards_html(
+        self,
+        content: str,
+        strict: bool = False
+    ) -> Optional[tuple[List[PriceUpdate], bool, Optional[int]]]:
+        """
+        Извлекает цены и наличие из карточек листинга (в пуле парсинг-воркеров).
         
-        if specs_container:
-            for row in specs_container.select(self.SELECTORS['spec_row']):
-                name_elem = row.select_one(self.SELECTORS['spec_name'])
-                value_elem = row.select_one(self.SELECTORS['spec_value'])
-                
-                if name_elem and value_elem:
-                    name = name_elem.get_text(strip=True).lower()
-                    value = value_elem.get_text(strip=True)
-                    
-                    if 'бренд' in name or 'brand' in name:
-                        specs.brand = value
-                    elif 'вес' in name or 'weight' in name:
-                        specs.weight = value
-                    elif 'страна' in name or 'country' in name:
-                        specs.country = value
-                    elif 'размер' in name or 'dimension' in name:
-                        specs.dimensions = value
-                    elif 'материал' in name or 'material' in name:
-                        specs.material = value
-                    else:
-                        additional[name] = value
-        
-        specs.additional = additional
-        return specs
+        Args:
+            content: HTML страницы категории
+            strict: Вернуть None, если в карточках нет цен (нужен браузер)
+            
+        Returns:
+            Кортеж (обновления товаров, есть ли следующая страница, номер последней страницы)
+        """
+        raw = await self.parse_workers.run(
+            html_parsing.parse_listing_cards, content, self.config.FIX_PRICE_BASE_URL,
+            self.config.PARSER_BACKEND
+        )
+        cards = raw['cards']
+        if strict and not any(card['price'] is not None for card in cards):
+            return None
+        return [PriceUpdate(**card) for card in cards], raw['has_next'], raw['last_page']
     
-    def _extract_images(self, soup: BeautifulSoup, base_url: str) -> List[ProductImage]:
-        """Извлекает URL изображений товара."""
-        images = []
-        
-        # Ищем изображения по разным селекторам
-        img_selectors = [
-            '.product-image img',
-            '.gallery-image img',
-            '.product-gallery img',
-            '[data-src]',
-            '.swiper-slide img',
-            '.product-photos img'
-        ]
-        
-        found_urls = set()
-        
-        for selector in img_selectors:
-            for img in soup.select(selector):
-                # Пробуем разные атрибуты для URL изображения
-                for attr in ['data-src', 'data-original', 'src', 'data-lazy']:
-                    src = img.get(attr)
-                    if src:
-                        # Преобразуем относительные URL
-                        full_url = urljoin(base_url, src)
-                        
-                        # Пропускаем placeholder изображения
-                        if 'placeholder' in full_url.lower() or 'data:image' in full_url:
-                            continue
-                        
-                        # Получаем оригинальное изображение (без resize)
-                        original_url = re.sub(r'/resize/\d+x\d+/', '/', full_url)
-                        original_url = re.sub(r'\?w=\d+&h=\d+', '', original_url)
-                        
-                        if original_url not in found_urls:
-                            found_urls.add(original_url)
-                            images.append(ProductImage(
-                                original_url=original_url,
-                                is_primary=len(images) == 0
-                            ))
-                        break
-        
-        return images
+    def _parse_price(self, price_text: Optional[str]) -> Optional[float]:
+        """Парсит цену из текста."""
+        return html_parsing.parse_price(price_text)
     
     async def parse_product(self, product_url: str) -> Optional[Product]:
         """
@@ -427,100 +545,102 @@ class FixPriceScraper:
         """
         logger.debug(f"🔍 Парсинг товара: {product_url}")
         
-        try:
-            content = await self.get_page_content(
-                product_url,
-                wait_for_selector='h1, .product-title'
-            )
-            
-            soup = BeautifulSoup(content, 'lxml')
-            
-            # --- Название ---
-            title_elem = soup.select_one(self.SELECTORS['product_page_title'])
-            if not title_elem:
-                title_elem = soup.select_one('h1')
-            title = title_elem.get_text(strip=True) if title_elem else None
-            
-            if not title:
-                logger.warning(f"⚠️ Не найдено название товара: {product_url}")
+        parse = lambda content, strict: self._parse_product_html(content, product_url, strict)
+        
+        with TRACER.product(product_url, 'parse_product'):
+            try:
+                try:
+                    return await self.fetcher.fetch_parsed(
+                        product_url,
+                        parse,
+                        wait_for_selector='h1, .product-title',
+                        conditional=self.page_index is not None
+                    )
+                except NotModified:
+                    # Страница не менялась - берем товар из последней загрузки
+                    product = self.page_index.load_page_product(product_url)
+                    if product:
+                        logger.debug(f"💤 Не изменился (304): {product_url}")
+                        TRACER.instant('not_modified')
+                        return product
+                    return await self.fetcher.fetch_parsed(
+                        product_url, parse, wait_for_selector='h1, .product-title'
+                    )
+            except Exception as e:
+                logger.error(f"❌ Ошибка парсинга товара {product_url}: {e}")
                 return None
+    
+    async def _parse_product_html(
+        self,
+        content: str,
+        product_url: str,
+        strict: bool = False
+    ) -> Optional[Product]:
+        """
+        Извлекает товар из HTML страницы (в пуле парсинг-воркеров).
+        
+        Args:
+            content: HTML страницы товара
+            product_url: URL товара
+            strict: Вернуть None, если нет названия или цены (нужен браузер)
             
-            # --- Описание ---
-            description_elem = soup.select_one(self.SELECTORS['product_page_description'])
-            description = description_elem.get_text(strip=True) if description_elem else None
-            
-            # --- Цены ---
-            price_elem = soup.select_one(self.SELECTORS['product_page_price'])
-            price = self._parse_price(price_elem.get_text(strip=True) if price_elem else None)
-            
-            old_price_elem = soup.select_one(self.SELECTORS['product_page_old_price'])
-            old_price = self._parse_price(old_price_elem.get_text(strip=True) if old_price_elem else None)
-            
-            # Если не нашли цену - товар недоступен или ошибка
-            if price is None:
-                logger.warning(f"⚠️ Не найдена цена товара: {product_url}")
-                # Продолжаем с price=0, чтобы не терять товар
-                price = 0.0
-            
-            # --- Наличие ---
-            in_stock = True
-            if soup.select_one(self.SELECTORS['out_of_stock']):
-                in_stock = False
-            elif 'нет в наличии' in content.lower():
-                in_stock = False
-            
-            # --- SKU ---
-            sku_elem = soup.select_one(self.SELECTORS['sku'])
-            sku = sku_elem.get_text(strip=True) if sku_elem else None
-            
-            # --- Характеристики ---
-            specs = self._extract_specs(soup)
-            
-            # --- Изображения ---
-            images = self._extract_images(soup, product_url)
-            
-            # --- Категории ---
-            categories_path = []
-            breadcrumbs = soup.select('.breadcrumb a, .breadcrumbs a, [itemprop="itemListElement"] a')
-            for crumb in breadcrumbs:
-                cat_name = crumb.get_text(strip=True)
-                if cat_name and cat_name.lower() not in ['главная', 'home']:
-                    categories_path.append(cat_name)
-            
-            # Создаем объект товара
-            product = Product(
-                source_id=sku or self._extract_product_id(product_url),
-                source_url=product_url,
-                title=title,
-                description=description,
-                price=price,
-                old_price=old_price,
-                category=categories_path[-1] if categories_path else None,
-                categories_path=categories_path,
-                specs=specs,
-                images=images,
-                in_stock=in_stock,
-                sku=sku,
-                processed=True
-            )
-            
-            logger.debug(f"✅ Товар распарсен: {title[:50]}... | Цена: {price}")
-            return product
-            
-        except Exception as e:
-            logger.error(f"❌ Ошибка парсинга товара {product_url}: {e}")
+        Returns:
+            Объект Product или None
+        """
+        fields = await self.parse_workers.run(
+            html_parsing.parse_product, content, product_url, self.config.PARSER_BACKEND
+        )
+        
+        if not fields:
+            if not strict:
+                logger.warning(f"⚠️ Не найдено название товара: {product_url}")
             return None
+        
+        # Если не нашли цену - товар недоступен или ошибка
+        if fields.get('price') is None:
+            if strict:
+                return None
+            logger.warning(f"⚠️ Не найдена цена товара: {product_url}")
+            # Продолжаем с price=0, чтобы не терять товар
+            fields['price'] = 0.0
+        
+        return self._product_from_fields(fields, product_url)
+    
+    def _product_from_fields(self, fields: Dict[str, Any], product_url: str) -> Product:
+        """Собирает Product из plain-dict результата парсинга."""
+        categories_path = fields.get('categories_path') or []
+        sku = fields.get('sku')
+        
+        product = Product(
+            source_id=sku or self._extract_product_id(product_url),
+            source_url=product_url,
+            title=fields['title'],
+            description=fields.get('description'),
+            price=fields['price'],
+            old_price=fields.get('old_price'),
+            currency=fields.get('currency') or 'RUB',
+            category=categories_path[-1] if categories_path else None,
+            categories_path=categories_path,
+            specs=ProductSpecs(**fields.get('specs', {})),
+            images=[
+                ProductImage(original_url=url, is_primary=idx == 0)
+                for idx, url in enumerate(fields.get('images') or [])
+            ],
+            in_stock=fields.get('in_stock', True),
+            sku=sku,
+            barcode=fields.get('barcode'),
+            processed=True
+        )
+        
+        logger.debug(
+            f"✅ Товар распарсен ({fields.get('parser', 'css')}): "
+            f"{product.title[:50]}... | Цена: {product.price}"
+        )
+        return product
     
     def _extract_product_id(self, url: str) -> str:
         """Извлекает ID товара из URL."""
-        # Пробуем найти ID в URL
-        match = re.search(r'/product[s]?/(\d+)', url)
-        if match:
-            return match.group(1)
-        
-        # Если не нашли - используем хеш URL
-        import hashlib
-        return hashlib.md5(url.encode()).hexdigest()[:12]
+        return html_parsing.extract_product_id(url)
     
     async def parse_products_batch(
         self, 
@@ -528,7 +648,7 @@ class FixPriceScraper:
         progress_callback=None
     ) -> List[Product]:
         """
-        Парсит батч товаров с ограничением concurrency.
+        Парсит батч товаров (бюджет запросов и адаптивная concurrency - на уровне запросов).
         
         Args:
             product_urls: Список URL товаров
@@ -538,20 +658,16 @@ class FixPriceScraper:
             Список распарсенных товаров
         """
         products = []
-        semaphore = asyncio.Semaphore(self.config.CONCURRENCY_LIMIT)
         
-        async def parse_with_limit(url: str) -> Optional[Product]:
-            async with semaphore:
-                product = await self.parse_product(url)
-                if progress_callback:
-                    progress_callback()
-                await asyncio.sleep(self.config.REQUEST_DELAY)
-                return product
-        
-        # Создаем задачи
-        tasks = [parse_with_limit(url) for url in product_urls]
+        async def parse_with_progress(url: str) -> Optional[Product]:
+            product = await self.parse_product(url)
+            if progress_callback:
+                progress_callback()
+            return product
         
-        # Выполняем с ограничением concurrency
+        # Частоту и параллельность запросов ограничивают бюджет хоста
+        # и лимитер источника на каждом запросе (см. HybridFetcher.request_slot)
+        tasks = [parse_with_progress(url) for url in product_urls]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         for result in results:
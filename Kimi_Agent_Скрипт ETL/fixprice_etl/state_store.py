@@ -0,0 +1,224 @@
+# ============================================
+# Fix-Price ETL Pipeline - Run State Store
+# ============================================
+"""
+Персистентное хранилище состояния запуска (checkpoint/resume).
+
+Хранит найденные категории, URL товаров, распарсенные товары и результаты
+загрузки на API в SQLite файле. При запуске с `--resume` pipeline пропускает
+уже выполненную работу, поэтому стоимость перезапуска пропорциональна
+оставшейся работе, а не размеру каталога.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Set, Iterable
+
+from loguru import logger
+
+from models import Product, Category
+
+
+# Статусы товара в хранилище
+STATUS_DISCOVERED = 'discovered'  # URL найден, страница товара еще не распарсена
+STATUS_PARSED = 'parsed'          # Товар распарсен, ждет загрузки
+STATUS_SKIPPED = 'skipped'        # Отброшен фильтром или валидацией
+STATUS_UPLOADED = 'uploaded'      # Успешно загружен на API
+STATUS_FAILED = 'failed'          # Ошибка загрузки (будет повторена при resume)
+
+# URL в одном запросе IN (...) - ниже лимита параметров SQLite
+URL_CHUNK = 500
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    parent TEXT,
+    level INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS products (
+    url TEXT PRIMARY KEY,
+    category_url TEXT,
+    status TEXT NOT NULL,
+    product_json TEXT,
+    api_product_id TEXT,
+    uploaded_to_api INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_url);
+CREATE INDEX IF NOT EXISTS idx_products_status ON products(status);
+"""
+
+
+class RunStateStore:
+    """
+    SQLite хранилище состояния запуска.
+
+    Каждое изменение коммитится сразу (WAL журнал), поэтому после падения
+    или OOM kill в файле остается все, что было сделано до момента сбоя.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> 'RunStateStore':
+        """Открывает (или создает) файл состояния."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        logger.info(f"💾 Хранилище состояния: {self.db_path}")
+        return self
+
+    def close(self):
+        """Закрывает соединение с базой."""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def reset(self):
+        """Очищает состояние перед новым (не --resume) запуском."""
+        with self.conn:
+            self.conn.execute('DELETE FROM categories')
+            self.conn.execute('DELETE FROM products')
+        logger.info("🧹 Состояние предыдущего запуска очищено")
+
+    # ========================================
+    # Categories
+    # ========================================
+
+    def save_categories(self, categories: List[Category]):
+        """Сохраняет найденные категории (порядок сохраняется)."""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO categories (url, name, parent, level, position) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [
+                    (cat.url, cat.name, cat.parent, cat.level, position)
+                    for position, cat in enumerate(categories)
+                ]
+            )
+
+    def load_categories(self) -> List[Category]:
+        """Возвращает сохраненные категории в исходном порядке."""
+        rows = self.conn.execute(
+            'SELECT name, url, parent, level FROM categories ORDER BY position'
+        ).fetchall()
+        return [
+            Category(name=name, url=url, parent=parent, level=level)
+            for name, url, parent, level in rows
+        ]
+
+    def done_categories(self) -> Set[str]:
+        """URL категорий, которые уже полностью обойдены."""
+        rows = self.conn.execute('SELECT url FROM categories WHERE done = 1').fetchall()
+        return {url for (url,) in rows}
+
+    def add_product_urls(self, category_url: str, product_urls: Iterable[str]):
+        """Регистрирует найденные URL товаров (уже известные не трогает)."""
+        now = datetime.utcnow().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO products (url, category_url, status, updated_at) '
+                'VALUES (?, ?, ?, ?)',
+                [(url, category_url, STATUS_DISCOVERED, now) for url in product_urls]
+            )
+
+    def mark_category_done(self, category_url: str):
+        """Отмечает категорию как полностью обойденную."""
+        with self.conn:
+            self.conn.execute('UPDATE categories SET done = 1 WHERE url = ?', (category_url,))
+
+    def get_category_product_urls(self, category_url: str) -> List[str]:
+        """URL товаров категории в порядке обнаружения."""
+        rows = self.conn.execute(
+            'SELECT url FROM products WHERE category_url = ? ORDER BY rowid',
+            (category_url,)
+        ).fetchall()
+        return [url for (url,) in rows]
+
+    # ========================================
+    # Products
+    # ========================================
+
+    def get_status(self, url: str) -> Optional[str]:
+        """Статус товара или None, если URL неизвестен."""
+        row = self.conn.execute('SELECT status FROM products WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else None
+
+    def save_product(self, product: Product, status: str = STATUS_PARSED):
+        """Сохраняет распарсенный товар."""
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO products (url, status, product_json, api_product_id, uploaded_to_api, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET status = excluded.status, '
+                'product_json = excluded.product_json, api_product_id = excluded.api_product_id, '
+                'uploaded_to_api = excluded.uploaded_to_api, updated_at = excluded.updated_at',
+                (
+                    product.source_url,
+                    status,
+                    product.model_dump_json(),
+                    product.api_product_id,
+                    int(product.uploaded_to_api),
+                    datetime.utcnow().isoformat()
+                )
+            )
+
+    def record_upload(self, product: Product, success: bool):
+        """Сохраняет результат загрузки товара на API."""
+        self.save_product(product, STATUS_UPLOADED if success else STATUS_FAILED)
+
+    def load_product(self, url: str) -> Optional[Product]:
+        """Загружает сохраненный товар или None, если данных нет."""
+        row = self.conn.execute(
+            'SELECT product_json FROM products WHERE url = ? AND product_json IS NOT NULL',
+            (url,)
+        ).fetchone()
+        return Product.model_validate_json(row[0]) if row else None
+
+    def load_products(self, urls: Optional[Iterable[str]] = None) -> Dict[str, tuple[str, Product]]:
+        """
+        Загружает сохраненные товары.
+
+        Args:
+            urls: Ограничить выборку этими URL (None = все)
+
+        Returns:
+            Словарь url -> (статус, Product) для товаров, у которых есть данные
+        """
+        query = 'SELECT url, status, product_json FROM products WHERE product_json IS NOT NULL'
+        if urls is None:
+            rows = self.conn.execute(query).fetchall()
+        else:
+            # Фильтр в SQL: разбираются только нужные товары, а не вся таблица
+            wanted = list(dict.fromkeys(urls))
+            rows = []
+            for start in range(0, len(wanted), URL_CHUNK):
+                chunk = wanted[start:start + URL_CHUNK]
+                rows += self.conn.execute(
+                    f"{query} AND url IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+
+        return {
+            url: (status, Product.model_validate_json(product_json))
+            for url, status, product_json in rows
+        }
+
+    def progress(self) -> Dict[str, int]:
+        """Количество товаров по статусам."""
+        rows = self.conn.execute(
+            'SELECT status, COUNT(*) FROM products GROUP BY status'
+        ).fetchall()
+        return dict(rows)
@@ -0,0 +1,330 @@
+# ============================================
+# Fix-Price ETL Pipeline - Structured Data Extractor
+# ============================================
+"""
+Извлечение товара из структурированных данных страницы без построения DOM.
+
+Источники (в порядке приоритета):
+1. JSON-LD блоки `<script type="application/ld+json">` (Product / Offer / BreadcrumbList)
+2. Hydration JSON фреймворка (`__NEXT_DATA__`, `__NUXT_DATA__`, `window.__INITIAL_STATE__`)
+
+Скрипты находятся регулярными выражениями и разбираются через json.loads,
+что на порядок дешевле BeautifulSoup. Результат - словарь полей товара,
+из которого скрапер собирает Product.
+"""
+
+import json
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+
+
+JSON_LD_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]+id=["\'](?:__NEXT_DATA__|__NUXT_DATA__)["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+INITIAL_STATE_RE = re.compile(
+    r'window\.__(?:INITIAL_STATE|PRELOADED_STATE|NUXT)__\s*=\s*(\{.*?\})\s*;?\s*</script>',
+    re.DOTALL
+)
+
+RESIZE_RE = re.compile(r'/resize/\d+x\d+/')
+RESIZE_QUERY_RE = re.compile(r'\?w=\d+&h=\d+')
+
+# Ключевые слова названий характеристик -> поле ProductSpecs
+SPEC_KEYWORDS = (
+    (('бренд', 'brand'), 'brand'),
+    (('вес', 'weight'), 'weight'),
+    (('страна', 'country'), 'country'),
+    (('размер', 'dimension'), 'dimensions'),
+    (('материал', 'material'), 'material'),
+)
+# Точные названия -> поле (быстрый путь без перебора подстрок)
+SPEC_LOOKUP = {
+    keyword: spec_field
+    for keywords, spec_field in SPEC_KEYWORDS
+    for keyword in keywords
+}
+
+# Ключи hydration JSON, под которыми обычно лежат поля товара
+TITLE_KEYS = ('title', 'name')
+PRICE_KEYS = ('price', 'currentPrice', 'salePrice', 'specialPrice')
+OLD_PRICE_KEYS = ('oldPrice', 'old_price', 'regularPrice', 'basePrice', 'priceOld')
+SKU_KEYS = ('sku', 'vendorCode', 'article', 'code')
+IMAGE_KEYS = ('images', 'gallery', 'photos', 'image')
+STOCK_KEYS = ('inStock', 'in_stock', 'isAvailable', 'available')
+
+
+def original_image_url(url: str) -> str:
+    """URL оригинального изображения (без resize параметров CDN)."""
+    if '/resize/' in url:
+        url = RESIZE_RE.sub('/', url)
+    if '?w=' in url:
+        url = RESIZE_QUERY_RE.sub('', url)
+    return url
+
+
+@lru_cache(maxsize=4096)
+def classify_spec(name: str) -> Optional[str]:
+    """Поле ProductSpecs по названию характеристики (None - дополнительная)."""
+    name = name.lower()
+    if name in SPEC_LOOKUP:
+        return SPEC_LOOKUP[name]
+    for keywords, spec_field in SPEC_KEYWORDS:
+        if any(keyword in name for keyword in keywords):
+            return spec_field
+    return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    cleaned = re.sub(r'[^\d.,]', '', str(value)).replace(',', '.')
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _type_matches(node: Dict[str, Any], type_name: str) -> bool:
+    return any(str(t).split('/')[-1] == type_name for t in _as_list(node.get('@type')))
+
+
+def _walk(node: Any) -> Iterator[Dict[str, Any]]:
+    """Обходит все словари JSON структуры в ширину (сначала верхние уровни)."""
+    queue = deque([node])
+    while queue:
+        current = queue.popleft()
+        if isinstance(current, dict):
+            yield current
+            queue.extend(current.values())
+        elif isinstance(current, list):
+            queue.extend(current)
+
+
+def _load_json(raw: str) -> Optional[Any]:
+    try:
+        return json.loads(raw.strip())
+    except (ValueError, TypeError):
+        return None
+
+
+# ========================================
+# JSON-LD
+# ========================================
+
+def _image_urls(value: Any, base_url: str) -> List[str]:
+    urls = []
+    for item in _as_list(value):
+        if isinstance(item, dict):
+            item = item.get('contentUrl') or item.get('url') or item.get('src')
+        if isinstance(item, str) and item and not item.startswith('data:'):
+            urls.append(original_image_url(urljoin(base_url, item)))
+    return list(dict.fromkeys(urls))
+
+
+def _product_from_json_ld(node: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {
+        'title': node.get('name'),
+        'description': node.get('description'),
+        'sku': node.get('sku') or node.get('mpn'),
+        'barcode': node.get('gtin13') or node.get('gtin') or node.get('gtin8'),
+        'images': _image_urls(node.get('image'), base_url),
+    }
+
+    specs: Dict[str, Any] = {}
+    additional: Dict[str, Any] = {}
+
+    brand = node.get('brand')
+    if isinstance(brand, dict):
+        brand = brand.get('name')
+    if brand:
+        specs['brand'] = str(brand)
+
+    weight = node.get('weight')
+    if isinstance(weight, dict):
+        weight = ' '.join(str(weight[k]) for k in ('value', 'unitText', 'unitCode') if weight.get(k))
+    if weight:
+        specs['weight'] = str(weight)
+
+    country = node.get('countryOfOrigin')
+    if isinstance(country, dict):
+        country = country.get('name')
+    if country:
+        specs['country'] = str(country)
+
+    for prop in _as_list(node.get('additionalProperty')):
+        if not isinstance(prop, dict) or not prop.get('name'):
+            continue
+        name, value = str(prop['name']), prop.get('value')
+        spec_field = classify_spec(name)
+        if spec_field and spec_field not in specs:
+            specs[spec_field] = str(value)
+        else:
+            additional[name.lower()] = value
+
+    specs['additional'] = additional
+    fields['specs'] = specs
+
+    # --- Offers ---
+    offers = [o for o in _as_list(node.get('offers')) if isinstance(o, dict)]
+    for offer in offers:
+        price = _to_float(offer.get('price', offer.get('lowPrice')))
+        if price is None:
+            continue
+        fields['price'] = price
+        fields['currency'] = offer.get('priceCurrency') or 'RUB'
+
+        availability = str(offer.get('availability', ''))
+        if availability:
+            fields['in_stock'] = availability.split('/')[-1] in ('InStock', 'LimitedAvailability', 'OnlineOnly')
+
+        for spec in _as_list(offer.get('priceSpecification')):
+            if isinstance(spec, dict) and str(spec.get('priceType', '')).split('/')[-1] in (
+                'StrikethroughPrice', 'ListPrice'
+            ):
+                fields['old_price'] = _to_float(spec.get('price'))
+        if fields.get('old_price') is None and offer.get('highPrice') is not None:
+            high = _to_float(offer.get('highPrice'))
+            if high and high > price:
+                fields['old_price'] = high
+        break
+
+    return fields
+
+
+def _breadcrumbs_from_json_ld(node: Dict[str, Any]) -> List[str]:
+    items = sorted(
+        (i for i in _as_list(node.get('itemListElement')) if isinstance(i, dict)),
+        key=lambda i: _to_float(i.get('position')) or 0
+    )
+    path = []
+    for item in items:
+        name = item.get('name')
+        if not name and isinstance(item.get('item'), dict):
+            name = item['item'].get('name')
+        if name and str(name).lower() not in ('главная', 'home'):
+            path.append(str(name))
+    return path
+
+
+def extract_json_ld(html: str, base_url: str) -> Optional[Dict[str, Any]]:
+    """Поля товара из JSON-LD блоков (None, если Product не найден)."""
+    product_fields = None
+    categories_path: List[str] = []
+
+    for raw in JSON_LD_RE.findall(html):
+        data = _load_json(raw)
+        if data is None:
+            continue
+        for node in _walk(data):
+            if product_fields is None and _type_matches(node, 'Product'):
+                product_fields = _product_from_json_ld(node, base_url)
+            elif not categories_path and _type_matches(node, 'BreadcrumbList'):
+                categories_path = _breadcrumbs_from_json_ld(node)
+
+    if product_fields is not None and categories_path:
+        product_fields['categories_path'] = categories_path
+    return product_fields
+
+
+# ========================================
+# Hydration JSON (Next.js / Nuxt / Redux)
+# ========================================
+
+def _first(node: Dict[str, Any], keys: tuple) -> Any:
+    for key in keys:
+        if node.get(key) not in (None, ''):
+            return node[key]
+    return None
+
+
+def _price_value(value: Any) -> Optional[float]:
+    if isinstance(value, dict):
+        value = _first(value, ('value', 'current', 'price', 'amount'))
+    return _to_float(value)
+
+
+def _looks_like_product(node: Dict[str, Any]) -> bool:
+    title = _first(node, TITLE_KEYS)
+    return (
+        isinstance(title, str)
+        and _price_value(_first(node, PRICE_KEYS)) is not None
+        and (_first(node, SKU_KEYS) is not None or _first(node, IMAGE_KEYS) is not None or 'id' in node)
+    )
+
+
+def _product_from_state(node: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    price_node = _first(node, PRICE_KEYS)
+    fields: Dict[str, Any] = {
+        'title': _first(node, TITLE_KEYS),
+        'description': node.get('description'),
+        'price': _price_value(price_node),
+        'old_price': _price_value(_first(node, OLD_PRICE_KEYS)),
+        'sku': _first(node, SKU_KEYS),
+        'barcode': node.get('barcode') or node.get('ean'),
+        'images': _image_urls(_first(node, IMAGE_KEYS), base_url),
+    }
+    if fields['old_price'] is None and isinstance(price_node, dict):
+        fields['old_price'] = _price_value(_first(price_node, OLD_PRICE_KEYS + ('old', 'regular')))
+
+    in_stock = _first(node, STOCK_KEYS)
+    if isinstance(in_stock, bool):
+        fields['in_stock'] = in_stock
+
+    if fields['sku'] is not None:
+        fields['sku'] = str(fields['sku'])
+    return fields
+
+
+def extract_hydration_state(html: str, base_url: str) -> Optional[Dict[str, Any]]:
+    """Поля товара из встроенного состояния фронтенда (None, если не найдено)."""
+    raw_blocks = NEXT_DATA_RE.findall(html) + INITIAL_STATE_RE.findall(html)
+
+    for raw in raw_blocks:
+        data = _load_json(raw)
+        if data is None:
+            continue
+        for node in _walk(data):
+            if _looks_like_product(node):
+                return _product_from_state(node, base_url)
+    return None
+
+
+def extract_structured_product(html: str, base_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Поля товара из структурированных данных страницы.
+
+    JSON-LD приоритетнее; если в нем нет цены или картинок, пробелы
+    дополняются из hydration JSON.
+
+    Returns:
+        Словарь полей (title, price, old_price, currency, in_stock, sku,
+        barcode, description, specs, images, categories_path) или None
+    """
+    fields = extract_json_ld(html, base_url)
+    state = None
+    if fields is None or fields.get('price') is None or not fields.get('images'):
+        state = extract_hydration_state(html, base_url)
+
+    if fields is None:
+        return state
+    if state:
+        for key, value in state.items():
+            if fields.get(key) in (None, '', []) and value not in (None, '', []):
+                fields[key] = value
+    return fields
@@ -0,0 +1,169 @@
+# ============================================
+# Fix-Price ETL Pipeline - Delta Sync
+# ============================================
+"""
+Дельта-синхронизация товаров с API вместо создания при каждом запуске.
+
+По индексу каталога (CATALOG_INDEX_PATH) для каждого source_id известны
+ID товара на API и последний отправленный payload:
+
+    товара нет в индексе       -> создается обычным POST (или пакетом)
+    payload не изменился       -> запрос не отправляется
+    payload изменился          -> PATCH только измененных полей
+    товар пропал с источника   -> пакетная деактивация после полного обхода
+
+Изображения известного товара повторно не загружаются, если их исходные
+URL не изменились: в payload подставляются ранее загруженные URL.
+"""
+
+from collections import Counter
+from typing import Dict, Any, List, Set
+
+import httpx
+from loguru import logger
+
+from config import Config
+from models import Product
+from api_client import APIClient
+from catalog_index import CatalogIndex
+
+
+# Результаты синхронизации одного товара
+SYNC_CREATE = 'create'
+SYNC_UPDATED = 'updated'
+SYNC_UNCHANGED = 'unchanged'
+SYNC_FAILED = 'failed'
+
+
+def changed_fields(payload: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Поля верхнего уровня payload, отличающиеся от последних отправленных.
+
+    Поле, пропавшее из payload (стало None), отправляется как None.
+    """
+    return {
+        key: payload.get(key)
+        for key in payload.keys() | previous.keys()
+        if payload.get(key) != previous.get(key)
+    }
+
+
+class SyncEngine:
+    """Решает, создать, обновить или пропустить товар, и деактивирует пропавшие."""
+
+    def __init__(self, config: Config, api_client: APIClient, catalog: CatalogIndex):
+        self.config = config
+        self.api_client = api_client
+        self.catalog = catalog
+        self.counters: Counter = Counter()
+
+    async def sync_product(self, product: Product) -> str:
+        """
+        Синхронизирует товар, уже отправленный на API.
+
+        Returns:
+            SYNC_CREATE - товара нет в индексе (или на API), нужно создать;
+            SYNC_UPDATED / SYNC_UNCHANGED - товар актуален на API;
+            SYNC_FAILED - ошибка обновления (записана в product.errors)
+        """
+        previous = self.catalog.get_synced(product.source_id) if product.source_id else None
+        if previous is None:
+            return SYNC_CREATE
+
+        images_reused = self._reuse_images(product, previous)
+        if not images_reused:
+            await self.api_client.process_product_images(product)
+
+        payload = CatalogIndex.stable_payload(product)
+        fields = {}
+        if CatalogIndex.payload_hash(payload) != previous['payload_hash']:
+            fields = changed_fields(payload, previous['payload'])
+        if not previous['active']:
+            # Товар вернулся на источник после деактивации
+            fields['active'] = True
+
+        product.api_product_id = previous['api_product_id']
+        if not fields:
+            product.uploaded_to_api = True
+            if not images_reused:
+                # Новые исходные URL дали те же файлы на API - запоминаем их
+                self.catalog.record_product(product)
+            self.counters[SYNC_UNCHANGED] += 1
+            return SYNC_UNCHANGED
+
+        try:
+            success = await self.api_client.update_product_fields(product.api_product_id, fields)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                # Товар удален на API - создаем заново
+                logger.warning(f"⚠️ Товар {product.api_product_id} не найден на API, будет создан заново")
+                product.api_product_id = None
+                return SYNC_CREATE
+            success = False
+            product.errors.append(f"Ошибка обновления товара: {e}")
+        except Exception as e:
+            success = False
+            product.errors.append(f"Ошибка обновления товара: {e}")
+
+        if not success:
+            logger.error(f"❌ Не удалось обновить товар {product.source_id}")
+            self.counters[SYNC_FAILED] += 1
+            return SYNC_FAILED
+
+        logger.debug(f"✏️  Товар {product.source_id} обновлен: {sorted(fields)}")
+        product.uploaded_to_api = True
+        self.counters[SYNC_UPDATED] += 1
+        return SYNC_UPDATED
+
+    @staticmethod
+    def _reuse_images(product: Product, previous: Dict[str, Any]) -> bool:
+        """Подставляет ранее загруженные URL, если исходные URL изображений не изменились."""
+        sources = [img.original_url for img in product.images]
+        sent = previous['payload'].get('images', [])
+        if sources != previous['image_sources'] or len(sent) != len(product.images):
+            return False
+
+        for image, item in zip(product.images, sent):
+            image.uploaded_url = item.get('url')
+            image.filename = item.get('filename')
+        return True
+
+    async def deactivate_missing(self, seen_url_ids: Set[str]) -> int:
+        """
+        Деактивирует товары индекса, которых не было в этом обходе.
+
+        Вызывать только после полного обхода каталога: товары из
+        пропущенных категорий и страниц тоже считались бы пропавшими.
+
+        Args:
+            seen_url_ids: ID из URL всех найденных товаров (extract_product_id),
+                в том числе не попавших в выборку - source_id товара может быть SKU
+
+        Returns:
+            Количество деактивированных товаров
+        """
+        active = self.catalog.active_products()
+        missing = {
+            source_id: api_product_id
+            for source_id, (url_id, api_product_id) in active.items()
+            if url_id not in seen_url_ids
+        }
+        if not missing:
+            return 0
+
+        if not seen_url_ids or len(missing) * 100 > len(active) * self.config.SYNC_DEACTIVATE_MAX_PERCENT:
+            logger.warning(
+                f"⚠️ Пропало {len(missing)} из {len(active)} товаров - больше "
+                f"SYNC_DEACTIVATE_MAX_PERCENT={self.config.SYNC_DEACTIVATE_MAX_PERCENT}%, "
+                f"деактивация пропущена"
+            )
+            return 0
+
+        logger.info(f"🗑️  Деактивация пропавших с источника товаров: {len(missing)}")
+        done = set(await self.api_client.deactivate_products(list(missing.values())))
+        deactivated: List[str] = [
+            source_id for source_id, api_product_id in missing.items()
+            if api_product_id in done
+        ]
+        self.catalog.mark_inactive(deactivated)
+        return len(deactivated)
@@ -0,0 +1,40 @@
+# ============================================
+# Fix-Price ETL Pipeline - Test Configuration
+# ============================================
+"""
+Модули пакета импортируются плоско (from config import ...), как в скриптах.
+
+Общие фикстуры: api_env (обязательные настройки API) и pipeline.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def api_env(monkeypatch):
+    """Обязательные настройки API - без них Config() не проходит валидацию."""
+    monkeypatch.setenv('MY_API_URL', 'http://api.test/api/v1')
+    monkeypatch.setenv('API_TOKEN', 'test')
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch, api_env):
+    """Pipeline с хранилищем состояния и индексом каталога во временном каталоге."""
+    monkeypatch.setenv('STATE_DB_PATH', str(tmp_path / 'run_state.sqlite'))
+    monkeypatch.setenv('CATALOG_INDEX_PATH', str(tmp_path / 'catalog_index.sqlite'))
+    monkeypatch.setenv('TRACE_FILE', '')
+
+    from config import Config
+    from pipeline import FixPriceETLPipeline
+
+    etl = FixPriceETLPipeline(Config())
+    etl.state.open()
+    etl.catalog.open()
+    yield etl
+    etl.state.close()
+    etl.catalog.close()
@@ -0,0 +1,100 @@
+# ============================================
+# Fix-Price ETL Pipeline - Adaptive Concurrency Tests
+# ============================================
+"""AIMD лимитер на поддельных часах: рост, снижение, Retry-After."""
+
+import asyncio
+
+import pytest
+
+import adaptive_concurrency
+from adaptive_concurrency import AdaptiveLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Подменяется только модуль time лимитера - часы event loop настоящие
+    fake = FakeClock()
+    monkeypatch.setattr(adaptive_concurrency, 'time', fake)
+    return fake
+
+
+def run_slot(limiter, clock, status, latency=0.1):
+    async def request():
+        async with limiter.slot():
+            clock.now += latency
+            limiter.observe(status)
+
+    asyncio.run(request())
+
+
+def test_successes_increase_limit_additively(clock):
+    limiter = AdaptiveLimiter('create', initial=4, max_limit=10)
+
+    for _ in range(4):
+        run_slot(limiter, clock, 200)
+
+    # +1/limit за запрос: 4 -> 4.25 -> 4.49 -> 4.71 -> 4.92 -> 5.13
+    assert limiter.current == 4
+    run_slot(limiter, clock, 200)
+    assert limiter.current == 5
+    assert limiter.stats['increases'] == 1
+
+
+def test_overload_halves_limit_once_per_response_time(clock):
+    limiter = AdaptiveLimiter('create', initial=8, max_limit=10)
+    run_slot(limiter, clock, 200, latency=0.5)
+
+    run_slot(limiter, clock, 503, latency=0.1)
+    assert limiter.current == 4
+    # Ответы запросов, отправленных до снижения, - та же перегрузка
+    run_slot(limiter, clock, 429, latency=0.1)
+    assert limiter.current == 4
+
+    clock.now += 1.0
+    run_slot(limiter, clock, 504, latency=0.1)
+    assert limiter.current == 2
+    assert limiter.stats['cuts'] == 2
+
+
+@pytest.mark.parametrize('status', [500, 502, 503])
+def test_error_response_is_not_a_success(clock, status):
+    limiter = AdaptiveLimiter('create', initial=4, max_limit=10)
+    run_slot(limiter, clock, 200)
+    limit = limiter.limit
+
+    run_slot(limiter, clock, status)
+
+    assert limiter.limit <= limit
+    assert limiter.stats['increases'] == 0
+
+
+def test_retry_after_blocks_new_slots(clock):
+    limiter = AdaptiveLimiter('download', initial=4, max_limit=4, adaptive=False)
+
+    async def run():
+        async with limiter.slot():
+            limiter.observe(429, '30')
+
+        waiter = asyncio.create_task(limiter._acquire())
+        await asyncio.sleep(0.01)
+        blocked = not waiter.done()
+
+        clock.now += 31
+        async with limiter._cond:
+            limiter._cond.notify_all()
+        await asyncio.wait_for(waiter, 1)
+        return blocked
+
+    assert asyncio.run(run())
+    assert limiter.stats['retry_after'] == 1
+    # Фиксированный лимит не меняется
+    assert limiter.current == 4
@@ -0,0 +1,155 @@
+# ============================================
+# Fix-Price ETL Pipeline - Bulk Create Tests
+# ============================================
+"""Пакетное создание: ошибки пакета не роняют запуск."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from models import Product
+
+
+@pytest.fixture
+def api_client(monkeypatch, api_env):
+    monkeypatch.setenv('IMAGE_CACHE_ENABLED', 'false')
+    monkeypatch.setenv('BULK_CREATE_ENABLED', 'true')
+
+    from api_client import APIClient
+    from config import Config
+
+    client = APIClient(Config())
+    yield client
+    asyncio.run(client.close())
+
+
+def make_products(count):
+    return [
+        Product(source_id=str(i), source_url=f'https://fix-price.com/catalog/p/{i}', title=f'Товар {i}', price=10.0)
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize('error', [
+    httpx.ConnectError('connection refused'),
+    httpx.HTTPStatusError(
+        'Server error', request=httpx.Request('POST', 'http://api.test'),
+        response=httpx.Response(503, request=httpx.Request('POST', 'http://api.test'))
+    ),
+    ValueError('Expecting value: line 1 column 1 (char 0)'),
+])
+def test_failed_bulk_post_marks_chunk_failed(api_client, error):
+    async def post_bulk(bodies):
+        raise error
+
+    api_client._post_bulk = post_bulk
+    products = make_products(3)
+    reported = []
+
+    result = asyncio.run(api_client.process_products_batch(
+        products, None, lambda product, success: reported.append((product.source_id, success))
+    ))
+
+    assert result == (0, 3)
+    assert reported == [('0', False), ('1', False), ('2', False)]
+    assert api_client.bulk_supported
+
+
+def test_image_failure_does_not_fail_chunk(api_client):
+    products = make_products(2)
+
+    async def process_product_images(product):
+        if product.source_id == '0':
+            raise RuntimeError('upload exploded')
+        return []
+
+    async def create_products_bulk(chunk):
+        from models import APIResponse
+        for product in chunk:
+            product.uploaded_to_api = True
+        return [APIResponse(success=True, product_id=f'api-{p.source_id}') for p in chunk]
+
+    api_client.process_product_images = process_product_images
+    api_client.create_products_bulk = create_products_bulk
+
+    assert asyncio.run(api_client.process_products_batch(products)) == (2, 0)
+    assert 'upload exploded' in products[0].errors[0]
+
+
+def test_failed_chunk_awaits_next_chunk_images(api_client):
+    products = make_products(api_client.config.BULK_BATCH_SIZE + 1)
+    started = asyncio.Event()
+    cancelled = []
+
+    async def process_product_images(product):
+        if product is products[-1]:
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(product.source_id)
+                raise
+        return []
+
+    async def create_products_bulk(chunk):
+        # Изображения следующей порции уже загружаются
+        await started.wait()
+        raise RuntimeError('callback exploded')
+
+    api_client.process_product_images = process_product_images
+    api_client.create_products_bulk = create_products_bulk
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await api_client.process_products_batch(products)
+        # Отмена завершена до выхода, а не при закрытии event loop
+        return list(cancelled)
+
+    assert asyncio.run(run()) == [products[-1].source_id]
+
+
+def test_results_matched_by_external_id(api_client):
+    products = make_products(3)
+    items = [
+        {'external_id': '2', 'id': 'api-2'},
+        {'external_id': '0', 'id': 'api-0'},
+        {'external_id': '1', 'id': 'api-1'},
+    ]
+
+    responses = api_client._map_bulk_results(products, items)
+
+    assert [r.product_id for r in responses] == ['api-0', 'api-1', 'api-2']
+    assert [p.api_product_id for p in products] == ['api-0', 'api-1', 'api-2']
+
+
+def test_results_without_external_id_matched_by_order(api_client):
+    products = make_products(2)
+    items = [{'id': 'api-a'}, {'id': 'api-b'}]
+
+    responses = api_client._map_bulk_results(products, items)
+
+    assert [r.product_id for r in responses] == ['api-a', 'api-b']
+
+
+def test_mixed_results_do_not_reuse_claimed_items(api_client):
+    products = make_products(3)
+    items = [
+        {'id': 'api-x'},
+        {'external_id': '2', 'id': 'api-2'},
+        {'external_id': '0', 'id': 'api-0'},
+    ]
+
+    responses = api_client._map_bulk_results(products, items)
+
+    assert [r.product_id for r in responses] == ['api-0', 'api-x', 'api-2']
+
+
+def test_non_dict_result_marks_product_failed(api_client):
+    products = make_products(2)
+
+    responses = api_client._map_bulk_results(products, [{'id': 'api-0'}, 'oops'])
+
+    assert responses[0].success and responses[0].product_id == 'api-0'
+    assert not responses[1].success
+    assert not products[1].uploaded_to_api
@@ -0,0 +1,168 @@
+# ============================================
+# Fix-Price ETL Pipeline - Circuit Breaker Tests
+# ============================================
+"""Переходы breaker, бюджет повторов и единый учет ошибок транспорта."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import circuit_breaker
+from api_client import is_retryable, retry_cause
+from circuit_breaker import (
+    CircuitBreaker, CircuitOpenError, RetryBudget, STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+)
+
+
+TRANSPORT_FAILURES = [
+    httpx.ConnectError('connection refused'),
+    httpx.ReadTimeout('timed out'),
+    httpx.RemoteProtocolError('Server disconnected without sending a response.'),
+    httpx.ProxyError('502 from proxy'),
+]
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(circuit_breaker, 'time', fake)
+    return fake
+
+
+async def fail_through(breaker, error):
+    with pytest.raises(type(error)):
+        async with breaker.guard():
+            raise error
+
+
+@pytest.mark.parametrize('error', TRANSPORT_FAILURES, ids=lambda e: type(e).__name__)
+def test_transport_errors_open_breaker(error):
+    breaker = CircuitBreaker('products', failure_threshold=2, recovery_timeout=60)
+
+    async def run():
+        for _ in range(2):
+            await fail_through(breaker, error)
+
+    asyncio.run(run())
+
+    assert breaker.state == STATE_OPEN
+
+
+@pytest.mark.parametrize('error', TRANSPORT_FAILURES, ids=lambda e: type(e).__name__)
+def test_transport_errors_are_retryable(error):
+    assert is_retryable(error)
+    assert retry_cause(error) != 'api'
+
+
+async def respond(breaker, status):
+    async with breaker.guard() as outcome:
+        outcome.record(status)
+
+
+def test_breaker_opens_after_threshold_consecutive_failures(clock):
+    breaker = CircuitBreaker('products', failure_threshold=3, recovery_timeout=5, max_wait=0)
+
+    async def run():
+        await respond(breaker, 500)
+        await respond(breaker, 502)
+        await respond(breaker, 200)
+        await respond(breaker, 503)
+        await respond(breaker, 503)
+        assert breaker.state == STATE_CLOSED
+        await respond(breaker, 404)
+        assert breaker.state == STATE_CLOSED
+        await respond(breaker, 503)
+        await respond(breaker, 503)
+        await respond(breaker, 503)
+
+    asyncio.run(run())
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.stats['opened'] == 1
+
+
+def test_open_breaker_rejects_after_max_wait(clock):
+    breaker = CircuitBreaker('products', failure_threshold=1, recovery_timeout=5, max_wait=0)
+
+    async def run():
+        await respond(breaker, 500)
+        with pytest.raises(CircuitOpenError):
+            await respond(breaker, 200)
+
+    asyncio.run(run())
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.stats['rejected'] == 1
+
+
+def test_successful_probe_closes_breaker(clock):
+    breaker = CircuitBreaker('products', failure_threshold=1, recovery_timeout=5, max_wait=0)
+
+    async def run():
+        await respond(breaker, 500)
+        clock.now += 5
+        async with breaker.guard() as outcome:
+            assert breaker.state == STATE_HALF_OPEN
+            # Пока идет пробный запрос, остальные ждут
+            with pytest.raises(CircuitOpenError):
+                await respond(breaker, 200)
+            outcome.record(200)
+
+    asyncio.run(run())
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats['opened'] == 1
+
+
+def test_failed_probe_reopens_breaker(clock):
+    breaker = CircuitBreaker('products', failure_threshold=3, recovery_timeout=5, max_wait=0)
+
+    async def run():
+        for _ in range(3):
+            await respond(breaker, 500)
+        clock.now += 5
+        await respond(breaker, 500)
+        assert breaker.state == STATE_OPEN
+        clock.now += 4
+        with pytest.raises(CircuitOpenError):
+            await respond(breaker, 200)
+        clock.now += 1
+        await respond(breaker, 200)
+
+    asyncio.run(run())
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats['opened'] == 2
+
+
+def test_retry_budget_exhausts_and_refills_by_ratio():
+    budget = RetryBudget(percent=50, reserve=2)
+
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    budget.record_request()
+    assert not budget.try_spend()
+    budget.record_request()
+    assert budget.try_spend()
+    assert budget.stats == {'requests': 2, 'retries': 3, 'denied': 2}
+
+
+def test_retry_budget_balance_capped_at_reserve():
+    budget = RetryBudget(percent=50, reserve=2)
+
+    for _ in range(100):
+        budget.record_request()
+
+    assert budget.snapshot()['balance'] == 2
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
@@ -0,0 +1,88 @@
+# ============================================
+# Fix-Price ETL Pipeline - Image Cache Tests
+# ============================================
+"""Кэш изображений: hash по чанкам, загрузка из файла, дедупликация по hash."""
+
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+
+from api_client import ImageTooLargeError
+from models import ProductImage
+
+
+IMAGE = b'\xff\xd8' + bytes(range(256)) * 4096
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch, api_env):
+    monkeypatch.setenv('IMAGE_CACHE_DIR', str(tmp_path / 'image_cache'))
+    monkeypatch.setenv('IMAGE_MAX_MB', '2')
+    monkeypatch.setenv('ARCHIVE_DIR', str(tmp_path / 'archive'))
+
+    from api_client import APIClient
+    from config import Config
+
+    uploads = []
+
+    async def chunks():
+        for _ in range(4):
+            yield IMAGE
+
+    def source(request):
+        if request.url.path.endswith('/huge.jpg'):
+            # Без Content-Length: лимит проверяется по прочитанным байтам
+            return httpx.Response(200, content=chunks(), headers={'content-type': 'image/jpeg'})
+        return httpx.Response(200, content=IMAGE, headers={'content-type': 'image/jpeg'})
+
+    def api(request):
+        uploads.append(request.read())
+        return httpx.Response(200, json={'url': f'https://cdn.api.test/{len(uploads)}.jpg'})
+
+    def make_client(archive=None):
+        client = APIClient(Config(), archive=archive)
+        client.download_client = httpx.AsyncClient(transport=httpx.MockTransport(source))
+        client.upload_client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+        client.uploads = uploads
+        return client
+
+    return make_client
+
+
+def test_same_bytes_uploaded_once_from_file(api_client):
+    client = api_client()
+    images = [ProductImage(original_url=f'https://img.fix-price.com/{i}.jpg') for i in range(3)]
+
+    async def run():
+        urls = await asyncio.gather(*(client._process_image_cached(image) for image in images))
+        await client.close()
+        return urls
+
+    urls = asyncio.run(run())
+
+    assert urls == ['https://cdn.api.test/1.jpg'] * 3
+    assert len(client.uploads) == 1 and IMAGE in client.uploads[0]
+    digest = hashlib.sha256(IMAGE).hexdigest()
+    assert images[0].filename == f'{digest[:16]}.jpg'
+    assert images[0].size_bytes == len(IMAGE)
+    assert client._upload_locks == {}
+
+
+def test_recording_enforces_size_limit(api_client, tmp_path):
+    from response_archive import ARCHIVE_RECORD, ResponseArchive
+
+    archive = ResponseArchive(str(tmp_path / 'archive'), ARCHIVE_RECORD).open()
+    client = api_client(archive)
+
+    async def run():
+        with pytest.raises(ImageTooLargeError):
+            await client._process_image_cached(ProductImage(original_url='https://img.fix-price.com/huge.jpg'))
+        await client._process_image_cached(ProductImage(original_url='https://img.fix-price.com/ok.jpg'))
+        await client.close()
+        await archive.close()
+
+    asyncio.run(run())
+
+    assert archive.stats['recorded'] == 1
@@ -0,0 +1,64 @@
+# ============================================
+# Fix-Price ETL Pipeline - Listing Prefetch Tests
+# ============================================
+"""Предзагрузка страниц листинга: при выходе из обхода задачи дожидаются."""
+
+import asyncio
+
+import pytest
+
+
+CATEGORY_URL = 'https://fix-price.com/catalog/dom'
+
+
+class FakeFetcher:
+    """Пять страниц, страница 3 падает; считает загрузки, которые еще идут."""
+
+    def __init__(self):
+        self.active = 0
+
+    async def fetch_parsed(self, page_url, parse, wait_for_selector=None):
+        page = int(page_url.rsplit('=', 1)[1]) if '?page=' in page_url else 1
+        self.active += 1
+        try:
+            await asyncio.sleep(0.01 * page)
+            if page == 3:
+                raise RuntimeError('Timeout 30000ms exceeded')
+            return [f'{CATEGORY_URL}/p/{page}'], True, 5
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def scraper(monkeypatch, api_env):
+    monkeypatch.setenv('PAGE_PREFETCH', '3')
+
+    from config import Config
+    from scraper import FixPriceScraper
+
+    scraper = FixPriceScraper(Config())
+    scraper.fetcher = FakeFetcher()
+    return scraper
+
+
+def test_early_break_waits_for_prefetch(scraper):
+    async def run():
+        pages = scraper._iter_listing_pages(CATEGORY_URL, None, None)
+        async for items in pages:
+            if items == [f'{CATEGORY_URL}/p/2']:
+                break
+        await pages.aclose()
+        return scraper.fetcher.active
+
+    # Страницы 3-5 уже в предзагрузке, к выходу ни одна не должна выполняться
+    assert asyncio.run(run()) == 0
+
+
+def test_page_error_waits_for_prefetch(scraper):
+    async def run():
+        with pytest.raises(RuntimeError):
+            async for _ in scraper._iter_listing_pages(CATEGORY_URL, None, None):
+                pass
+        return scraper.fetcher.active
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,47 @@
+# ============================================
+# Fix-Price ETL Pipeline - Price Refresh Tests
+# ============================================
+"""Обновление цен по карточкам листинга находит товары индекса по URL."""
+
+import asyncio
+
+from models import Category, PriceUpdate, Product
+
+
+PRODUCT_URL = 'https://fix-price.com/catalog/dom/product/12345-kruzhka'
+CATEGORY_URL = 'https://fix-price.com/catalog/dom'
+
+
+class FakeScraper:
+    async def get_categories(self):
+        return [Category(name='Дом', url=CATEGORY_URL)]
+
+    async def iter_price_updates_from_category(self, category_url, max_pages=None):
+        yield [PriceUpdate(source_id='12345', source_url=PRODUCT_URL, price=79.0, in_stock=False)]
+
+
+class FakeAPIClient:
+    def __init__(self):
+        self.patches = []
+
+    async def update_product_fields(self, api_product_id, fields):
+        self.patches.append((api_product_id, fields))
+        return True
+
+
+def test_refresh_updates_product_indexed_by_sku(pipeline):
+    pipeline.scraper = FakeScraper()
+    pipeline.api_client = FakeAPIClient()
+    # На странице товара есть SKU - в индексе товар под ним, а не под ID из URL
+    product = Product(
+        source_id='SKU-777', source_url=PRODUCT_URL, title='Кружка', price=99.0,
+        api_product_id='api-1', processed=True
+    )
+    pipeline.catalog.record_product(product)
+
+    asyncio.run(pipeline.run_price_refresh())
+
+    assert pipeline.api_client.patches == [('api-1', {'price': 79.0, 'in_stock': False})]
+    record = pipeline.catalog.get('SKU-777')
+    assert record['price'] == 79.0
+    assert record['in_stock'] is False
@@ -0,0 +1,31 @@
+# ============================================
+# Fix-Price ETL Pipeline - Response Archive Tests
+# ============================================
+"""Запись архива через очередь: все ответы доходят до индекса к close()."""
+
+import asyncio
+
+from response_archive import (
+    KIND_HTTP, KIND_IMAGE, ARCHIVE_RECORD, ARCHIVE_REPLAY, ResponseArchive, WRITE_BATCH_SIZE
+)
+
+
+def test_queued_records_are_replayed_after_close(tmp_path):
+    count = WRITE_BATCH_SIZE * 3 + 5
+
+    async def record():
+        archive = ResponseArchive(str(tmp_path), ARCHIVE_RECORD).open()
+        await asyncio.gather(*(
+            archive.record_html(f'https://fix-price.com/catalog/p/{i}', KIND_HTTP, f'<h1>{i}</h1>')
+            for i in range(count)
+        ))
+        await archive.record('https://img.fix-price.com/a.jpg', KIND_IMAGE, b'\xff\xd8jpeg', 'image/jpeg')
+        await archive.close()
+        return archive.stats['recorded']
+
+    assert asyncio.run(record()) == count + 1
+
+    archive = ResponseArchive(str(tmp_path), ARCHIVE_REPLAY).open()
+    assert archive.replay('https://fix-price.com/catalog/p/7').text == '<h1>7</h1>'
+    assert archive.replay('https://img.fix-price.com/a.jpg').body == b'\xff\xd8jpeg'
+    asyncio.run(archive.close())
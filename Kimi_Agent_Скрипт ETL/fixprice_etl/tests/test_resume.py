@@ -0,0 +1,49 @@
+# ============================================
+# Fix-Price ETL Pipeline - Resume Tests
+# ============================================
+"""Категория с недогруженным листингом не считается обойденной."""
+
+import asyncio
+
+from models import Category, Product
+from state_store import RunStateStore, STATUS_PARSED, STATUS_UPLOADED
+
+
+CATEGORY = Category(name='Дом', url='https://fix-price.com/catalog/dom')
+
+
+class FailingScraper:
+    async def get_products_from_category(self, category_url, max_pages=None):
+        raise RuntimeError('HTTP 503 на странице 3')
+
+
+def test_failed_listing_page_keeps_category_pending(pipeline):
+    pipeline.state.save_categories([CATEGORY])
+    pipeline.scraper = FailingScraper()
+
+    asyncio.run(pipeline.extract_products_from_categories([CATEGORY]))
+
+    assert pipeline.state.done_categories() == set()
+    assert pipeline.stats.errors[0]['category'] == CATEGORY.name
+
+
+def test_load_products_filters_urls(tmp_path):
+    state = RunStateStore(str(tmp_path / 'run_state.sqlite')).open()
+    for pid in range(3):
+        product = Product(
+            source_id=str(pid), source_url=f'https://fix-price.com/catalog/dom/product/{pid}',
+            title=f'Товар {pid}', price=10.0
+        )
+        state.save_product(product, STATUS_UPLOADED if pid == 2 else STATUS_PARSED)
+
+    loaded = state.load_products([
+        'https://fix-price.com/catalog/dom/product/0',
+        'https://fix-price.com/catalog/dom/product/2',
+        'https://fix-price.com/catalog/dom/product/404',
+    ])
+
+    assert {url: status for url, (status, _) in loaded.items()} == {
+        'https://fix-price.com/catalog/dom/product/0': STATUS_PARSED,
+        'https://fix-price.com/catalog/dom/product/2': STATUS_UPLOADED,
+    }
+    state.close()
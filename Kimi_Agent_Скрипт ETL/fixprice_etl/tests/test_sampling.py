@@ -0,0 +1,107 @@
+# ============================================
+# Fix-Price ETL Pipeline - Sampling Tests
+# ============================================
+"""Выборка по хешу ID: стабильна между запусками и не зависит от порядка категорий."""
+
+import asyncio
+
+import pytest
+
+from models import Category
+from sampling import CategorySample, ProductSampler
+
+
+def product_urls(category, ids):
+    return [f'https://fix-price.com/catalog/{category}/p-{pid}-tovar' for pid in ids]
+
+
+SHARED = product_urls('dom', range(0, 40))
+CATEGORY_URLS = {
+    'https://fix-price.com/catalog/dom': SHARED,
+    # Половина товаров категории есть и в "Доме"
+    'https://fix-price.com/catalog/kuhnya': SHARED[20:] + product_urls('kuhnya', range(100, 120)),
+    'https://fix-price.com/catalog/sad': product_urls('sad', range(200, 203)),
+}
+
+
+# При этой соли наименьший хеш "Дома" - у общего с "Кухней" товара, а у
+# собственных товаров "Кухни" хеш еще меньше: выборка с минимумом в категории
+# зависела бы от того, какая категория первой забрала общие товары
+SEED = '10'
+
+
+def sampled_set(sample):
+    return {url for urls in sample.values() for url in urls}
+
+
+def test_sample_is_stable_across_runs_and_seeds():
+    first = ProductSampler(0.3, seed='a').sample(CATEGORY_URLS)
+    again = ProductSampler(0.3, seed='a').sample(CATEGORY_URLS)
+    other = ProductSampler(0.3, seed='b').sample(CATEGORY_URLS)
+
+    assert first == again
+    assert sampled_set(first) != sampled_set(other)
+
+
+def test_sample_does_not_depend_on_category_order():
+    sampler = ProductSampler(0.001, SEED)
+    reordered = dict(reversed(list(CATEGORY_URLS.items())))
+
+    assert sampled_set(sampler.sample(CATEGORY_URLS)) == sampled_set(sampler.sample(reordered))
+
+
+def test_every_category_gets_at_least_one_url():
+    sampler = ProductSampler(0.001, SEED)
+
+    sample = sampler.sample(CATEGORY_URLS)
+    picked = sampled_set(sample)
+
+    for urls in CATEGORY_URLS.values():
+        assert len(sampler.sample_category(urls)) == 1
+        assert picked & set(urls)
+    # Товар из двух категорий в выборке один раз
+    assert sum(len(urls) for urls in sample.values()) == len(picked)
+
+
+def test_streaming_sample_matches_batch_sample():
+    sampler = ProductSampler(0.001, SEED)
+    streamed = []
+    for urls in CATEGORY_URLS.values():
+        sample = CategorySample(sampler)
+        for start in range(0, len(urls), 7):
+            streamed.extend(sample.offer(urls[start:start + 7]))
+        streamed.extend(sample.finish())
+
+    assert set(streamed) == sampled_set(sampler.sample(CATEGORY_URLS))
+
+
+class FakeScraper:
+    """Категории отдают страницы с разными задержками - порядок завершения задает тест."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.parsed = []
+
+    async def get_categories(self):
+        return [Category(name=url.rsplit('/', 1)[1], url=url) for url in CATEGORY_URLS]
+
+    async def iter_product_urls_from_category(self, category_url, max_pages=None):
+        urls = CATEGORY_URLS[category_url]
+        for start in range(0, len(urls), 10):
+            await asyncio.sleep(self.delays[category_url])
+            yield urls[start:start + 10]
+
+    async def parse_product(self, url):
+        self.parsed.append(url)
+        return None
+
+
+@pytest.mark.parametrize('order', [(0.001, 0.002, 0.003), (0.003, 0.001, 0.002)])
+def test_streaming_pipeline_sample_does_not_depend_on_finish_order(pipeline, order):
+    # Категории обходятся параллельно (CATEGORY_CONCURRENCY=4 по умолчанию)
+    pipeline.sampler = ProductSampler(0.001, SEED)
+    pipeline.scraper = FakeScraper(dict(zip(CATEGORY_URLS, order)))
+
+    asyncio.run(pipeline.run_streaming_pipeline())
+
+    assert sorted(pipeline.scraper.parsed) == sorted(sampled_set(pipeline.sampler.sample(CATEGORY_URLS)))
@@ -0,0 +1,148 @@
+# ============================================
+# Fix-Price ETL Pipeline - Structured Data Tests
+# ============================================
+"""Товар из JSON-LD и hydration JSON, CSS селекторы - запасной путь."""
+
+import json
+
+from html_parsing import parse_product
+from structured_data import extract_structured_product
+
+
+PRODUCT_URL = 'https://fix-price.com/catalog/dom/p-12345-kruzhka'
+
+
+def page(*scripts, body=''):
+    return f"<html><head>{''.join(scripts)}</head><body>{body}</body></html>"
+
+
+def json_ld(data):
+    return f'<script type="application/ld+json">{json.dumps(data, ensure_ascii=False)}</script>'
+
+
+def next_data(data):
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data, ensure_ascii=False)}</script>'
+
+
+PRODUCT_LD = {
+    '@context': 'https://schema.org',
+    '@type': 'Product',
+    'name': 'Кружка керамическая',
+    'sku': '5001234',
+    'gtin13': '4601234567890',
+    'image': ['/upload/resize/300x300/kruzhka.jpg', {'contentUrl': 'https://img.fix-price.com/kruzhka-2.jpg'}],
+    'brand': {'@type': 'Brand', 'name': 'Fix Price'},
+    'additionalProperty': [
+        {'@type': 'PropertyValue', 'name': 'Страна производства', 'value': 'Китай'},
+        {'@type': 'PropertyValue', 'name': 'Объем', 'value': '350 мл'},
+    ],
+    'offers': {
+        '@type': 'Offer',
+        'price': '99.00',
+        'priceCurrency': 'RUB',
+        'availability': 'https://schema.org/OutOfStock',
+        'priceSpecification': {'@type': 'UnitPriceSpecification', 'priceType': 'https://schema.org/StrikethroughPrice', 'price': 129},
+    },
+}
+
+BREADCRUMBS_LD = {
+    '@context': 'https://schema.org',
+    '@type': 'BreadcrumbList',
+    'itemListElement': [
+        {'@type': 'ListItem', 'position': 2, 'name': 'Посуда'},
+        {'@type': 'ListItem', 'position': 1, 'name': 'Главная'},
+        {'@type': 'ListItem', 'position': 3, 'item': {'name': 'Кружки'}},
+    ],
+}
+
+STATE = {
+    'props': {'pageProps': {'product': {
+        'id': 12345,
+        'title': 'Кружка керамическая',
+        'price': {'current': 89.5, 'old': 99},
+        'vendorCode': 5001234,
+        'images': [{'src': 'https://img.fix-price.com/resize/600x600/kruzhka.jpg'}],
+        'inStock': True,
+    }}},
+}
+
+
+def test_json_ld_product():
+    fields = extract_structured_product(page(json_ld(PRODUCT_LD), json_ld(BREADCRUMBS_LD)), PRODUCT_URL)
+
+    assert fields['title'] == 'Кружка керамическая'
+    assert (fields['price'], fields['old_price'], fields['currency']) == (99.0, 129.0, 'RUB')
+    assert fields['in_stock'] is False
+    assert (fields['sku'], fields['barcode']) == ('5001234', '4601234567890')
+    assert fields['images'] == [
+        'https://fix-price.com/upload/kruzhka.jpg',
+        'https://img.fix-price.com/kruzhka-2.jpg',
+    ]
+    assert fields['specs']['brand'] == 'Fix Price'
+    assert fields['specs']['country'] == 'Китай'
+    assert fields['specs']['additional'] == {'объем': '350 мл'}
+    assert fields['categories_path'] == ['Посуда', 'Кружки']
+
+
+def test_hydration_state_product():
+    fields = extract_structured_product(page(next_data(STATE)), PRODUCT_URL)
+
+    assert fields['title'] == 'Кружка керамическая'
+    assert (fields['price'], fields['old_price']) == (89.5, 99.0)
+    assert fields['sku'] == '5001234'
+    assert fields['in_stock'] is True
+    assert fields['images'] == ['https://img.fix-price.com/kruzhka.jpg']
+
+
+def test_hydration_fills_gaps_in_json_ld():
+    without_offer = {key: value for key, value in PRODUCT_LD.items() if key != 'offers'}
+
+    fields = extract_structured_product(page(json_ld(without_offer), next_data(STATE)), PRODUCT_URL)
+
+    # Поля JSON-LD приоритетнее, пробелы - из hydration JSON
+    assert fields['price'] == 89.5
+    assert fields['sku'] == '5001234'
+    assert fields['barcode'] == '4601234567890'
+
+
+def test_parse_product_prefers_structured_data():
+    fields = parse_product(page(json_ld(PRODUCT_LD), body='<h1>Другое название</h1>'), PRODUCT_URL)
+
+    assert fields['parser'] == 'structured'
+    assert fields['title'] == 'Кружка керамическая'
+
+
+def test_parse_product_css_fallback():
+    body = '''
+        <ul class="breadcrumbs"><a href="/">Главная</a><a href="/catalog/dom">Дом</a></ul>
+        <div class="product-info"><h1>Кружка керамическая</h1></div>
+        <div class="product-description">Подходит для посудомоечной машины</div>
+        <span class="price-current">99,90 ₽</span>
+        <span class="price-old">129 ₽</span>
+        <div class="out-of-stock">Нет в наличии</div>
+        <span class="sku">5001234</span>
+        <div class="product-gallery">
+            <img src="/images/placeholder.png">
+            <img data-src="/upload/resize/300x300/kruzhka.jpg">
+        </div>
+        <table class="product-specs">
+            <tr><td>Бренд</td><td>Fix Price</td></tr>
+            <tr><td>Объем</td><td>350 мл</td></tr>
+        </table>
+    '''
+    # Битый JSON-LD не мешает запасному пути
+    fields = parse_product(page('<script type="application/ld+json">{oops</script>', body=body), PRODUCT_URL)
+
+    assert fields['parser'] == 'css'
+    assert fields['title'] == 'Кружка керамическая'
+    assert (fields['price'], fields['old_price']) == (99.9, 129.0)
+    assert fields['in_stock'] is False
+    assert fields['sku'] == '5001234'
+    assert fields['images'] == ['https://fix-price.com/upload/kruzhka.jpg']
+    assert fields['specs']['brand'] == 'Fix Price'
+    assert fields['specs']['additional'] == {'объем': '350 мл'}
+    assert fields['categories_path'] == ['Дом']
+
+
+def test_parse_product_without_title():
+    assert parse_product(page(body='<div class="price-current">99 ₽</div>'), PRODUCT_URL) is None
@@ -0,0 +1,46 @@
+# ============================================
+# Fix-Price ETL Pipeline - Sync Deactivation Tests
+# ============================================
+"""Деактивация пропавших товаров сравнивает товары индекса по ID из URL."""
+
+import asyncio
+from types import SimpleNamespace
+
+from catalog_index import CatalogIndex
+from models import Product
+from sync_engine import SyncEngine
+
+
+class FakeAPIClient:
+    def __init__(self):
+        self.deactivated = []
+
+    async def deactivate_products(self, api_product_ids):
+        self.deactivated.extend(api_product_ids)
+        return api_product_ids
+
+
+def product(pid: int, sku: str) -> Product:
+    return Product(
+        source_id=sku, source_url=f'https://fix-price.com/catalog/dom/product/{pid}-tovar',
+        title=f'Товар {pid}', price=99.0, api_product_id=f'api-{pid}', processed=True
+    )
+
+
+def test_deactivates_only_products_missing_from_crawl(tmp_path):
+    catalog = CatalogIndex(str(tmp_path / 'catalog_index.sqlite')).open()
+    for pid in range(1, 11):
+        catalog.record_product(product(pid, f'SKU-{pid}'))
+
+    api_client = FakeAPIClient()
+    config = SimpleNamespace(SYNC_DEACTIVATE_MAX_PERCENT=20)
+    engine = SyncEngine(config, api_client, catalog)
+
+    # Товары с SKU найдены по URL - пропал только десятый
+    seen_url_ids = {str(pid) for pid in range(1, 10)}
+    deactivated = asyncio.run(engine.deactivate_missing(seen_url_ids))
+
+    assert deactivated == 1
+    assert api_client.deactivated == ['api-10']
+    assert set(catalog.active_products()) == {f'SKU-{pid}' for pid in range(1, 10)}
+    catalog.close()
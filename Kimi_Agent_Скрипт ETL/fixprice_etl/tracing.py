@@ -0,0 +1,253 @@
+# ============================================
+# Fix-Price ETL Pipeline - Product Tracing
+# ============================================
+"""
+Трассировка пути отдельного товара: от обнаружения URL до создания на API.
+
+Метрики (metrics.py) показывают распределения по этапам, а трасса - куда
+ушло время конкретного товара: сколько он ждал в очереди, навигация,
+рендеринг, парсинг, скачивание и загрузка каждого изображения, создание
+товара с повторами.
+
+Файл TRACE_FILE - JSON в формате Chrome trace events, открывается в
+https://ui.perfetto.dev или chrome://tracing. Каждый товар - отдельный
+процесс `product <source_id>`, внутри - дорожки:
+
+    main       discovered, queued, parse_product > navigation, render_wait,
+               scroll, parse; queued, upload_product > create_product > api_products
+    image N    download_image > image_download, upload_image > image_upload
+
+Этапы METRICS.track() попадают в трассу автоматически. Трассируется
+TRACE_SAMPLE_PERCENT товаров (стабильная выборка по хешу ID, как в
+sampling.py); для остальных каждый вызов - одна проверка contextvar,
+поэтому при полном обходе накладные расходы незаметны.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from html_parsing import extract_product_id
+from sampling import ProductSampler
+
+
+# Дорожка по умолчанию внутри трассы товара
+MAIN_LANE = 'main'
+
+
+@dataclass
+class ProductTrace:
+    """Трасса одного товара (процесс в Chrome trace)."""
+    source_id: str
+    pid: int
+    # Конец последнего этапа: от него считается ожидание в очереди
+    last_end: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class TraceContext:
+    """Текущая трасса и дорожка задачи (копируется в дочерние asyncio задачи)."""
+    trace: ProductTrace
+    lane: str = MAIN_LANE
+
+
+_current: ContextVar[Optional[TraceContext]] = ContextVar('trace_context', default=None)
+
+
+class Tracer:
+    """Span-трассировка выборки товаров в Chrome trace events."""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = ''
+        self.max_events = 0
+        self.sampler = ProductSampler(0.0)
+        self.dropped = 0
+        self._events: List[Dict[str, Any]] = []
+        self._traces: Dict[str, ProductTrace] = {}
+        self._lanes: Dict[tuple, int] = {}
+        self._origin = time.monotonic()
+
+    def configure(self, path: str, sample_percent: float, max_events: int, seed: str = ''):
+        """
+        Включает трассировку.
+
+        Args:
+            path: Файл трассы (пусто - трассировка выключена)
+            sample_percent: Процент трассируемых товаров
+            max_events: Лимит событий в памяти (дальше события отбрасываются)
+            seed: Соль выборки
+        """
+        self.enabled = bool(path) and sample_percent > 0
+        self.path = path
+        self.max_events = max_events
+        # Своя соль: трассируемые товары не совпадают с границей PRODUCT_SAMPLE_PERCENT
+        self.sampler = ProductSampler(sample_percent / 100, f"trace:{seed}")
+
+    # ========================================
+    # Product context
+    # ========================================
+
+    def _trace_for(self, url: str) -> Optional[ProductTrace]:
+        """Трасса товара по URL (создается при первом обращении) или None вне выборки."""
+        if not self.enabled or not self.sampler.accepts(url):
+            return None
+        source_id = extract_product_id(url)
+        trace = self._traces.get(source_id)
+        if trace is None:
+            trace = self._traces[source_id] = ProductTrace(source_id, len(self._traces) + 1)
+            self._emit({
+                'name': 'process_name', 'ph': 'M', 'pid': trace.pid,
+                'args': {'name': f"product {source_id}"},
+            })
+        return trace
+
+    def discovered(self, url: str, **args: Any):
+        """Отметка обнаружения URL товара (начало ожидания в очереди)."""
+        trace = self._trace_for(url)
+        if trace is None:
+            return
+        now = time.monotonic()
+        self._instant(TraceContext(trace), 'discovered', now, {'url': url, **args})
+        trace.last_end = now
+
+    @contextmanager
+    def product(self, url: str, name: str, **args: Any) -> Iterator[None]:
+        """
+        Этап товара верхнего уровня (parse_product, upload_product).
+
+        Внутри блока (и в запущенных из него задачах) все span'ы пишутся в
+        трассу этого товара. Время с конца предыдущего этапа - span `queued`.
+        """
+        current = _current.get()
+        trace = current.trace if current else self._trace_for(url)
+        if trace is None:
+            yield
+            return
+
+        context = TraceContext(trace)
+        if trace.last_end is not None and current is None:
+            self.record(context, 'queued', trace.last_end, time.monotonic())
+        token = _current.set(context)
+        try:
+            with self.span(name, **args):
+                yield
+        finally:
+            _current.reset(token)
+            trace.last_end = time.monotonic()
+
+    @contextmanager
+    def lane(self, name: str) -> Iterator[None]:
+        """Отдельная дорожка трассы для параллельной работы (изображения)."""
+        current = _current.get()
+        if current is None:
+            yield
+            return
+        token = _current.set(TraceContext(current.trace, name))
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    # ========================================
+    # Spans
+    # ========================================
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Span в трассе текущего товара (вне трассы - ничего не делает)."""
+        context = _current.get()
+        if context is None:
+            yield
+            return
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            args['error'] = type(e).__name__
+            raise
+        finally:
+            self.record(context, name, started, time.monotonic(), **args)
+
+    def record(self, context: Optional[TraceContext], name: str, started: float, ended: float, **args: Any):
+        """Готовый span с известными началом и концом."""
+        if context is None:
+            return
+        event = {
+            'name': name, 'ph': 'X',
+            'pid': context.trace.pid, 'tid': self._tid(context),
+            'ts': self._ts(started), 'dur': round((ended - started) * 1e6, 1),
+        }
+        if args:
+            event['args'] = {key: str(value) for key, value in args.items()}
+        self._emit(event)
+
+    def record_wait(self, name: str, started: float, ended: float, **args: Any):
+        """Ожидание (слот лимитера, бюджет запросов) в текущей трассе, если заметное."""
+        if ended - started > 0.001:
+            self.record(_current.get(), name, started, ended, **args)
+
+    def record_for(self, url: str, name: str, started: float, ended: float, **args: Any):
+        """Span для товара вне его контекста (общий пакетный запрос)."""
+        trace = self._trace_for(url)
+        if trace is not None:
+            self.record(TraceContext(trace), name, started, ended, **args)
+
+    def instant(self, name: str, **args: Any):
+        """Мгновенное событие в текущей трассе (например, повтор запроса)."""
+        context = _current.get()
+        if context is not None:
+            self._instant(context, name, time.monotonic(), args)
+
+    def _instant(self, context: TraceContext, name: str, at: float, args: Dict[str, Any]):
+        self._emit({
+            'name': name, 'ph': 'i', 's': 't',
+            'pid': context.trace.pid, 'tid': self._tid(context), 'ts': self._ts(at),
+            'args': {key: str(value) for key, value in args.items()},
+        })
+
+    def _tid(self, context: TraceContext) -> int:
+        key = (context.trace.pid, context.lane)
+        tid = self._lanes.get(key)
+        if tid is None:
+            tid = self._lanes[key] = len(self._lanes) + 1
+            self._emit({
+                'name': 'thread_name', 'ph': 'M', 'pid': context.trace.pid, 'tid': tid,
+                'args': {'name': context.lane},
+            })
+        return tid
+
+    def _ts(self, at: float) -> float:
+        return round((at - self._origin) * 1e6, 1)
+
+    def _emit(self, event: Dict[str, Any]):
+        if len(self._events) >= self.max_events:
+            self.dropped += 1
+            return
+        self._events.append(event)
+
+    # ========================================
+    # Export
+    # ========================================
+
+    def write(self):
+        """Записывает трассу в TRACE_FILE."""
+        if not self.enabled:
+            return
+        target = Path(self.path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self._events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        logger.info(f"🧭 Трасса сохранена: {target} ({len(self._traces)} товаров, {len(self._events)} событий)")
+        if self.dropped:
+            logger.warning(f"⚠️ TRACE_MAX_EVENTS: отброшено {self.dropped} событий трассы")
+
+
+# Трассировщик процесса: этапы в разных модулях пишут в него напрямую
+TRACER = Tracer()
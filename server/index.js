@@ -9,7 +9,7 @@ const PORT = process.env.PORT || 3001;
 
 // Middleware
 app.use(cors());
-app.use(express.json());
+app.use(express.json({ limit: '2mb' }));
 
 // YooKassa Configuration
 const YOOKASSA_SHOP_ID = process.env.YOOKASSA_SHOP_ID;
@@ -493,6 +493,52 @@ app.post('/api/v1/products', (req, res) => {
     });
 });
 
+// Bulk create: JSON array or NDJSON (one product per line)
+app.post('/api/v1/products/bulk', express.text({ type: 'application/x-ndjson', limit: '2mb' }), (req, res) => {
+    let products;
+    try {
+        products = typeof req.body === 'string'
+            ? req.body.split('\n').filter(line => line.trim()).map(line => JSON.parse(line))
+            : req.body;
+    } catch (e) {
+        return res.status(400).json({ success: false, message: 'Invalid NDJSON' });
+    }
+    if (!Array.isArray(products)) {
+        return res.status(400).json({ success: false, message: 'Expected an array of products' });
+    }
+
+    console.log(`📦 [API] Bulk create: ${products.length} products`);
+    res.json({
+        success: true,
+        results: products.map((product, index) => ({
+            success: true,
+            id: product.external_id || `new_id_${index}`,
+            external_id: product.external_id
+        }))
+    });
+});
+
+// Batched deactivation of products that disappeared from the source
+app.post('/api/v1/products/deactivate', (req, res) => {
+    const ids = Array.isArray(req.body?.ids) ? req.body.ids : null;
+    if (!ids) {
+        return res.status(400).json({ success: false, message: 'Expected { ids: [...] }' });
+    }
+    console.log(`🗑️ [API] Deactivated ${ids.length} products`);
+    res.json({ success: true, deactivated: ids.length });
+});
+
+app.patch('/api/v1/products/:id', (req, res) => {
+    const fields = req.body;
+    // Partial update from the price refresh mode: only changed fields arrive
+    console.log(`✏️ [API] Product ${req.params.id} updated: ${JSON.stringify(fields)}`);
+    res.json({
+        success: true,
+        id: req.params.id,
+        updated_fields: Object.keys(fields)
+    });
+});
+
 const multer = require('multer');
 const upload = multer();
 